@@ -8,10 +8,14 @@ tokens-per-minute limits. It supports both local (in-process) and remote
 
 Key components:
 - TokenBucket: Core rate-limiting class implementing the token bucket algorithm
+- SharedTokenBucket: TokenBucket whose tokens are shared by local processes
+  through a SQLite file, without a server
 - ModelBuckets: Manages rate limits for a specific language model, containing
   separate buckets for requests and tokens
 - BucketCollection: Manages multiple ModelBuckets instances across different
   language model services
+- AdaptiveRateController: Adjusts bucket refill rates and interview concurrency
+  at runtime from observed latency, timeouts and rate-limit errors
 
 The module also includes a FastAPI server implementation (token_bucket_api) and
 client (token_bucket_client) for distributed rate limiting scenarios where
@@ -26,16 +30,20 @@ from .exceptions import (
 )
 
 from .token_bucket import TokenBucket
+from .shared_token_bucket import SharedTokenBucket
 from .model_buckets import ModelBuckets
 from .token_bucket_client import TokenBucketClient  # Add explicit import for TokenBucketClient
 
 # Import BucketCollection last to avoid circular import issues
 from .bucket_collection import BucketCollection
+from .adaptive_rate_controller import AdaptiveRateController
 
 __all__ = [
     "BucketCollection", 
+    "AdaptiveRateController",
     "ModelBuckets", 
     "TokenBucket",
+    "SharedTokenBucket",
     "TokenBucketClient",
     "BucketError",
     "TokenLimitError",
@@ -0,0 +1,247 @@
+"""
+Adaptive rate control for language model calls.
+
+Static ``rpm``/``tpm`` limits and a fixed ``EDSL_MAX_CONCURRENT_TASKS`` have to be
+tuned by hand for every model, and are either too conservative or trip provider
+rate limits. AdaptiveRateController instead adjusts limits at runtime using
+AIMD (additive increase, multiplicative decrease), the scheme TCP uses for
+congestion control:
+
+- Each successful call nudges the service's bucket refill rates and the global
+  in-flight interview limit up by a fraction of a step, so that, as in TCP's
+  congestion avoidance, they grow by one step per window of calls in flight
+  rather than by one step per call.
+- A timeout or a rate-limit (HTTP 429) error cuts them by a multiplicative factor.
+  Cuts are spaced by a cooldown so that a burst of errors caused by one overload
+  only counts once.
+- Increases are held while the smoothed latency of a service is well above its
+  best observed latency, since rising latency is usually the first sign of a
+  provider queueing requests.
+
+Refill rates never rise above the configured ``rpm``/``tpm`` unless a
+``max_rate_factor`` above 1 is given, so the configured limits act as ceilings.
+"""
+
+from __future__ import annotations
+
+import re
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional, TYPE_CHECKING
+
+from .token_bucket import TokenBucket
+
+if TYPE_CHECKING:
+    from ..language_models import LanguageModel
+    from .bucket_collection import BucketCollection
+    from .model_buckets import ModelBuckets
+
+
+@dataclass
+class _ServiceState:
+    """AIMD state for the buckets shared by one service."""
+
+    model_buckets: Optional["ModelBuckets"]
+    base_requests_rate: Optional[float]
+    base_tokens_rate: Optional[float]
+    rate_factor: float = 1.0
+    latency_ewma: Optional[float] = None
+    best_latency: Optional[float] = None
+    last_decrease: float = float("-inf")
+
+
+class AdaptiveRateController:
+    """AIMD controller for bucket refill rates and interview concurrency.
+
+    Args:
+        bucket_collection: The buckets whose refill rates are adjusted. Only local
+            TokenBuckets are adjusted; remote buckets are left to the bucket server.
+        max_concurrent: Upper bound, and starting value, for the number of
+            interviews in flight.
+        min_concurrent: Lower bound for the number of interviews in flight.
+        increase_step: Fraction of the configured rate added per window of
+            successful calls (i.e., per `concurrency` calls).
+        decrease_factor: Multiplier applied to rates and concurrency on overload.
+        min_rate_factor: Lower bound for the fraction of the configured rate.
+        max_rate_factor: Upper bound for the fraction of the configured rate.
+        latency_tolerance: Increases are held while smoothed latency exceeds this
+            multiple of the best observed latency.
+        cooldown: Minimum number of seconds between two decreases for a service.
+
+    >>> from edsl.buckets import BucketCollection
+    >>> from edsl.language_models import Model
+    >>> m = Model("test", rpm=60, tpm=6000)
+    >>> controller = AdaptiveRateController(BucketCollection.from_models([m]), max_concurrent=100)
+    >>> controller.record_rate_limited(m)
+    >>> controller.concurrency, controller.rate_factor(m)
+    (50, 0.5)
+    >>> controller.bucket_collection[m].requests_bucket.refill_rate
+    0.5
+    >>> for _ in range(50):
+    ...     controller.record_success(m, latency=1.0)
+    >>> controller.concurrency, controller.rate_factor(m)
+    (51, 0.55)
+    """
+
+    LATENCY_SMOOTHING = 0.2
+    # A 429 status in an error message, e.g. "Error code: 429" or "429 Too Many Requests"
+    RATE_LIMIT_MESSAGE = re.compile(
+        r"\b(?:error|status)(?: code)?\W{0,3}429\b|\b429\W{0,3}too many requests"
+    )
+
+    def __init__(
+        self,
+        bucket_collection: Optional["BucketCollection"] = None,
+        max_concurrent: int = 500,
+        min_concurrent: int = 1,
+        increase_step: float = 0.05,
+        decrease_factor: float = 0.5,
+        min_rate_factor: float = 0.05,
+        max_rate_factor: float = 1.0,
+        latency_tolerance: float = 2.0,
+        cooldown: float = 5.0,
+    ):
+        self.bucket_collection = bucket_collection
+        self.max_concurrent = max_concurrent
+        self.min_concurrent = min_concurrent
+        self.increase_step = increase_step
+        self.decrease_factor = decrease_factor
+        self.min_rate_factor = min_rate_factor
+        self.max_rate_factor = max_rate_factor
+        self.latency_tolerance = latency_tolerance
+        self.cooldown = cooldown
+
+        # Fractional in-flight limit, of which `concurrency` is the integer part
+        self._window = float(max_concurrent)
+        self._states: Dict[int, _ServiceState] = {}
+        self._last_concurrency_decrease = float("-inf")
+
+    @property
+    def concurrency(self) -> int:
+        """Current limit on the number of interviews in flight."""
+        return int(self._window)
+
+    @concurrency.setter
+    def concurrency(self, value: int) -> None:
+        self._window = float(value)
+
+    def __repr__(self) -> str:
+        return (
+            f"AdaptiveRateController(concurrency={self.concurrency}, "
+            f"max_concurrent={self.max_concurrent})"
+        )
+
+    @staticmethod
+    def is_rate_limit_error(exception: BaseException) -> bool:
+        """Return True if an exception raised by a model call looks like a 429.
+
+        Service SDKs raise different exception types, so this checks for a 429
+        status code and for the names and messages they commonly use. A 429 in a
+        message only counts next to "error" or "status", so that other numbers in
+        a message (token counts, ids) are not mistaken for one.
+
+        >>> AdaptiveRateController.is_rate_limit_error(Exception("Error code: 429"))
+        True
+        >>> class RateLimitError(Exception): pass
+        >>> AdaptiveRateController.is_rate_limit_error(RateLimitError())
+        True
+        >>> AdaptiveRateController.is_rate_limit_error(ValueError("bad json"))
+        False
+        >>> AdaptiveRateController.is_rate_limit_error(ValueError("prompt has 4290 tokens, id 429"))
+        False
+        """
+        for attr in ("status_code", "status", "code"):
+            if getattr(exception, attr, None) == 429:
+                return True
+        response = getattr(exception, "response", None)
+        if getattr(response, "status_code", None) == 429:
+            return True
+        if "ratelimit" in type(exception).__name__.lower():
+            return True
+        message = str(exception).lower()
+        return "rate limit" in message or bool(AdaptiveRateController.RATE_LIMIT_MESSAGE.search(message))
+
+    def _state(self, model: "LanguageModel") -> _ServiceState:
+        model_buckets = None
+        if self.bucket_collection is not None and model in self.bucket_collection:
+            model_buckets = self.bucket_collection[model]
+        key = id(model_buckets) if model_buckets is not None else id(model)
+        if key not in self._states:
+            rates = [None, None]
+            if model_buckets is not None:
+                for i, bucket in enumerate(
+                    (model_buckets.requests_bucket, model_buckets.tokens_bucket)
+                ):
+                    if isinstance(bucket, TokenBucket):
+                        rates[i] = bucket._old_refill_rate
+            self._states[key] = _ServiceState(model_buckets, *rates)
+        return self._states[key]
+
+    def rate_factor(self, model: "LanguageModel") -> float:
+        """Return the current fraction of the configured rate used for a model."""
+        return self._state(model).rate_factor
+
+    def _apply(self, state: _ServiceState) -> None:
+        if state.model_buckets is None:
+            return
+        for bucket, base_rate in (
+            (state.model_buckets.requests_bucket, state.base_requests_rate),
+            (state.model_buckets.tokens_bucket, state.base_tokens_rate),
+        ):
+            if base_rate is None or base_rate == float("inf"):
+                continue
+            bucket.set_refill_rate(base_rate * state.rate_factor)
+
+    def record_success(self, model: "LanguageModel", latency: float) -> None:
+        """Record a successful call and its latency in seconds."""
+        state = self._state(model)
+        if state.latency_ewma is None:
+            state.latency_ewma = latency
+        else:
+            state.latency_ewma += self.LATENCY_SMOOTHING * (
+                latency - state.latency_ewma
+            )
+        if state.best_latency is None or state.latency_ewma < state.best_latency:
+            state.best_latency = state.latency_ewma
+
+        if state.latency_ewma > self.latency_tolerance * state.best_latency:
+            return
+
+        # One step per window of calls: with `concurrency` calls in flight, that
+        # many successes come back for each round trip
+        window = max(1, self.concurrency)
+        state.rate_factor = min(
+            self.max_rate_factor,
+            round(state.rate_factor + self.increase_step / window, 6),
+        )
+        self._apply(state)
+        self._window = min(self.max_concurrent, self._window + 1 / window)
+
+    def _decrease(self, model: "LanguageModel") -> None:
+        now = time.monotonic()
+        state = self._state(model)
+        if now - state.last_decrease >= self.cooldown:
+            state.last_decrease = now
+            state.rate_factor = max(
+                self.min_rate_factor, state.rate_factor * self.decrease_factor
+            )
+            self._apply(state)
+        if now - self._last_concurrency_decrease >= self.cooldown:
+            self._last_concurrency_decrease = now
+            self.concurrency = max(
+                self.min_concurrent, int(self.concurrency * self.decrease_factor)
+            )
+
+    def record_timeout(self, model: "LanguageModel") -> None:
+        """Record a call that exceeded the API timeout."""
+        self._decrease(model)
+
+    def record_rate_limited(self, model: "LanguageModel") -> None:
+        """Record a call rejected by the provider's rate limits."""
+        self._decrease(model)
+
+
+if __name__ == "__main__":
+    import doctest
+
+    doctest.testmod(optionflags=doctest.ELLIPSIS)
@@ -42,6 +42,8 @@ class BucketCollection(UserDict):
         models_to_services (dict): Maps model names to their service provider names
         services_to_buckets (dict): Maps service names to their ModelBuckets instances
         remote_url (str, optional): URL for remote token bucket server if using distributed mode
+        shared_path (str, optional): Path of the SQLite file through which local processes
+            share buckets, if any (see SharedTokenBucket)
         
     Example:
         >>> from edsl import Model
@@ -85,6 +87,14 @@ class BucketCollection(UserDict):
         else:
             self.remote_url = url
 
+        # Check for a SQLite file through which local processes share buckets
+        path = os.environ.get("EDSL_SHARED_TOKEN_BUCKET_PATH", None)
+
+        if path == "None" or path is None:
+            self.shared_path = None
+        else:
+            self.shared_path = path
+
     @classmethod
     def from_models(
         cls, models_list: List["LanguageModel"], infinity_buckets: bool = False
@@ -191,6 +201,7 @@ class BucketCollection(UserDict):
                     capacity=RPS,
                     refill_rate=RPS,
                     remote_url=self.remote_url,
+                    shared_path=self.shared_path,
                 )
                 
                 # Create token rate limiting bucket
@@ -200,6 +211,7 @@ class BucketCollection(UserDict):
                     capacity=TPS,
                     refill_rate=TPS,
                     remote_url=self.remote_url,
+                    shared_path=self.shared_path,
                 )
                 
                 # Store the buckets for this service
@@ -214,6 +226,24 @@ class BucketCollection(UserDict):
             # Model already exists, just retrieve its existing buckets
             self[model] = self.services_to_buckets[self.models_to_services[model.model]]
 
+    async def aclose(self) -> None:
+        """
+        Return the tokens leased by remote buckets and close their connections.
+
+        Remote buckets (TokenBucketClient) keep a session open to the server for
+        the event loop they are used in; this is called at the end of a job run,
+        in that loop. Local buckets have nothing to close.
+
+        Example:
+            >>> import asyncio
+            >>> bucket_collection = BucketCollection()
+            >>> asyncio.run(bucket_collection.aclose())
+        """
+        for buckets in list(self.services_to_buckets.values()):
+            for bucket in (buckets.requests_bucket, buckets.tokens_bucket):
+                if hasattr(bucket, "aclose"):
+                    await bucket.aclose()
+
     def update_from_key_lookup(self, key_lookup: "KeyLookup") -> None:
         """
         Update bucket rate limits based on information from KeyLookup.
@@ -250,6 +280,7 @@ class BucketCollection(UserDict):
                         capacity=new_rps,
                         refill_rate=new_rps,
                         remote_url=self.remote_url,
+                        shared_path=self.shared_path,
                     )
                     self.services_to_buckets[service].requests_bucket = new_requests_bucket
 
@@ -262,6 +293,7 @@ class BucketCollection(UserDict):
                         capacity=new_tps,
                         refill_rate=new_tps,
                         remote_url=self.remote_url,
+                        shared_path=self.shared_path,
                     )
                     self.services_to_buckets[service].tokens_bucket = new_tokens_bucket
 
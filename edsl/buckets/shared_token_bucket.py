@@ -0,0 +1,192 @@
+"""
+Token buckets shared by the processes of one machine through a SQLite file.
+
+Several worker processes using the same API keys have to share one rate limit.
+TokenBucketClient shares it through a token bucket server, at the cost of an HTTP
+round trip for every request for tokens. A SharedTokenBucket instead keeps the
+state of the bucket (its tokens, the time of its last refill, its capacity and
+refill rate) in a row of a SQLite database in WAL mode. Refilling and taking
+tokens happen in one short write transaction, so they are atomic across processes,
+and cost a local file lock rather than a network hop.
+
+Within a process, callers still wait in the ordered queue of TokenBucket, and only
+the first of them competes with the other processes for tokens. Counters such as
+``num_released`` and the token log stay local to each process, as does turbo mode.
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import time
+from typing import Optional, Union
+
+from ..jobs.decorators import synchronized_class
+from .token_bucket import TokenBucket
+
+
+@synchronized_class
+class SharedTokenBucket(TokenBucket):
+    """
+    Token bucket whose tokens are shared by every process using the same file.
+
+    Created by TokenBucket when it is given a ``shared_path``. The capacity and
+    refill rate of the bucket are those of the process that created or changed it
+    last, so the processes sharing a bucket should configure it the same way.
+
+    >>> import tempfile, asyncio
+    >>> path = os.path.join(tempfile.mkdtemp(), "buckets.db")
+    >>> first = TokenBucket(bucket_name="openai", bucket_type="requests", capacity=10, refill_rate=0.001, shared_path=path)
+    >>> second = TokenBucket(bucket_name="openai", bucket_type="requests", capacity=10, refill_rate=0.001, shared_path=path)
+    >>> type(first).__name__
+    'SharedTokenBucket'
+    >>> asyncio.run(first.get_tokens(7))
+    >>> second.refill()
+    >>> round(second.tokens)
+    3
+    """
+
+    def __init__(
+        self,
+        *,
+        bucket_name: str,
+        bucket_type: str,
+        capacity: Union[int, float],
+        refill_rate: Union[int, float],
+        remote_url: Optional[str] = None,
+        shared_path: Optional[str] = None,
+    ):
+        super().__init__(
+            bucket_name=bucket_name,
+            bucket_type=bucket_type,
+            capacity=capacity,
+            refill_rate=refill_rate,
+        )
+        self.shared_path = shared_path
+        self.bucket_id = f"{bucket_name}_{bucket_type}"
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_pid: Optional[int] = None
+
+        self._connection().execute(
+            "INSERT OR IGNORE INTO token_buckets "
+            "(bucket_id, capacity, refill_rate, tokens, last_refill) VALUES (?, ?, ?, ?, ?)",
+            (self.bucket_id, capacity, refill_rate, capacity, time.time()),
+        )
+        # Apply this process's configuration to a bucket created by another one
+        self._update(capacity=capacity, refill_rate=refill_rate)
+
+    def __repr__(self):
+        return f"SharedTokenBucket(bucket_name={self.bucket_name}, bucket_type='{self.bucket_type}', capacity={self.capacity}, refill_rate={self.refill_rate}, shared_path={self.shared_path!r})"
+
+    def _connection(self) -> sqlite3.Connection:
+        """Return this process's connection to the database, creating it if needed.
+
+        A connection is not shared with child processes, which open their own.
+        """
+        if self._db is None or self._db_pid != os.getpid():
+            db = sqlite3.connect(
+                self.shared_path,
+                timeout=30,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS token_buckets ("
+                "bucket_id TEXT PRIMARY KEY, capacity REAL, refill_rate REAL, "
+                "tokens REAL, last_refill REAL)"
+            )
+            self._db, self._db_pid = db, os.getpid()
+        return self._db
+
+    def _update(
+        self,
+        take: Union[int, float] = 0,
+        add: Union[int, float] = 0,
+        capacity: Optional[Union[int, float]] = None,
+        refill_rate: Optional[Union[int, float]] = None,
+        min_capacity: Union[int, float] = 0,
+    ) -> bool:
+        """Refill the shared bucket and change it, in one transaction.
+
+        Args:
+            take: Tokens to take, if that many are available after the refill
+            add: Tokens to return to the bucket
+            capacity: New capacity of the bucket
+            refill_rate: New refill rate of the bucket, applied after the refill
+            min_capacity: Raise the capacity to at least this value
+
+        Returns:
+            Whether the `take` tokens were taken
+        """
+        db = self._connection()
+        # Wall-clock time, since the monotonic clocks of processes are not comparable
+        now = time.time()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            row = db.execute(
+                "SELECT capacity, refill_rate, tokens, last_refill FROM token_buckets WHERE bucket_id = ?",
+                (self.bucket_id,),
+            ).fetchone()
+            shared_capacity, shared_rate, tokens, last_refill = row
+            tokens = min(shared_capacity, tokens + max(0.0, now - last_refill) * shared_rate)
+            if capacity is not None:
+                shared_capacity = capacity
+            shared_capacity = max(shared_capacity, min_capacity)
+            if refill_rate is not None:
+                shared_rate = refill_rate
+            taken = tokens >= take
+            if taken:
+                tokens -= take
+            tokens = min(shared_capacity, tokens + add)
+            db.execute(
+                "UPDATE token_buckets SET capacity = ?, refill_rate = ?, tokens = ?, last_refill = ? "
+                "WHERE bucket_id = ?",
+                (shared_capacity, shared_rate, tokens, max(now, last_refill), self.bucket_id),
+            )
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+
+        self.tokens = tokens
+        self._old_capacity, self._old_refill_rate = shared_capacity, shared_rate
+        if not self.turbo_mode:
+            self.capacity, self.refill_rate = shared_capacity, shared_rate
+        self.last_refill = time.monotonic()
+        self.log.append((self.last_refill, tokens))
+        return taken
+
+    def refill(self) -> None:
+        """Refill the shared bucket, and read its token level."""
+        self._update()
+
+    def add_tokens(self, tokens: Union[int, float]) -> None:
+        """Return tokens to the shared bucket, up to its capacity."""
+        self.tokens_returned += tokens
+        self._update(add=tokens)
+        self._wake_head()
+
+    def set_refill_rate(self, refill_rate: Union[int, float]) -> None:
+        """Change the refill rate of the shared bucket, for every process using it."""
+        self._update(refill_rate=refill_rate)
+        self._wake_head()
+
+    def _take(self, amount: Union[int, float]) -> bool:
+        if self.turbo_mode:
+            return True
+        # Requests larger than the bucket raise its capacity, as in get_tokens
+        return self._update(take=amount, min_capacity=amount)
+
+    def close(self) -> None:
+        """Close this process's connection to the database."""
+        if self._db is not None and self._db_pid == os.getpid():
+            self._db.close()
+        self._db = None
+
+
+if __name__ == "__main__":
+    import doctest
+
+    doctest.testmod(optionflags=doctest.ELLIPSIS)
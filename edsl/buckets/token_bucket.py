@@ -1,10 +1,42 @@
-from typing import Union, List, Any, Optional
+from typing import Deque, Dict, Union, Optional
+from collections import deque
 import asyncio
 import time
 from threading import RLock
 
 from ..jobs.decorators import synchronized_class
 from .exceptions import TokenLimitError
+from .token_log import TokenLog
+
+
+class _Waiter:
+    """A caller of TokenBucket.get_tokens waiting for its turn.
+
+    A waiter sleeps on its own future, which is resolved from the event loop it
+    belongs to, so a bucket can be shared by callers on several loops.
+    """
+
+    __slots__ = ("amount", "loop", "future")
+
+    def __init__(self, amount: Union[int, float], loop: asyncio.AbstractEventLoop):
+        self.amount = amount
+        self.loop = loop
+        self.future: Optional[asyncio.Future] = None
+
+    def wake(self) -> None:
+        """Resolve the future the waiter is sleeping on, if any."""
+        future = self.future
+        if future is not None and not future.done():
+            try:
+                self.loop.call_soon_threadsafe(_resolve, future)
+            except RuntimeError:
+                # The waiter's loop is closed
+                pass
+
+
+def _resolve(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
 
 
 @synchronized_class
@@ -22,6 +54,8 @@ class TokenBucket:
     - Ability to track usage patterns
     - Visualization of token usage over time
     - Turbo mode for temporarily bypassing rate limits
+    - Callers waiting for tokens are served in order: by priority, then first come,
+      first served, so small requests cannot starve large ones
     
     Typical use cases:
     - Respecting API rate limits (e.g., OpenAI, AWS, etc.)
@@ -50,11 +84,13 @@ class TokenBucket:
         capacity: Union[int, float],
         refill_rate: Union[int, float],
         remote_url: Optional[str] = None,
+        shared_path: Optional[str] = None,
     ):
-        """Factory method to create either a local or remote token bucket.
+        """Factory method to create a local, shared or remote token bucket.
 
-        This method determines whether to create a local TokenBucket instance or
-        a remote TokenBucketClient instance based on the provided parameters.
+        This method determines whether to create a local TokenBucket instance, a
+        SharedTokenBucket shared with other processes through a SQLite file, or a
+        remote TokenBucketClient instance based on the provided parameters.
 
         Args:
             bucket_name: Name of the bucket for identification
@@ -62,9 +98,12 @@ class TokenBucket:
             capacity: Maximum number of tokens the bucket can hold
             refill_rate: Rate at which tokens are refilled (tokens per second)
             remote_url: If provided, creates a remote token bucket client
+            shared_path: If provided, creates a SharedTokenBucket stored in the
+                SQLite file at this path, shared by the processes that use it
 
         Returns:
-            Either a TokenBucket instance (local) or a TokenBucketClient instance (remote)
+            A TokenBucket instance (local), a SharedTokenBucket instance (shared)
+            or a TokenBucketClient instance (remote)
         
         Example:
             >>> # Local bucket
@@ -91,6 +130,12 @@ class TokenBucket:
                 api_base_url=remote_url,
             )
 
+        if shared_path is not None:
+            from .shared_token_bucket import SharedTokenBucket
+
+            # Returning a subclass instance lets Python call its __init__
+            return super(TokenBucket, cls).__new__(SharedTokenBucket)
+
         # Create a local token bucket
         instance = super(TokenBucket, cls).__new__(cls)
         return instance
@@ -103,6 +148,7 @@ class TokenBucket:
         capacity: Union[int, float],
         refill_rate: Union[int, float],
         remote_url: Optional[str] = None,
+        shared_path: Optional[str] = None,
     ):
         """Initialize a new token bucket instance.
         
@@ -114,11 +160,13 @@ class TokenBucket:
             capacity: Maximum number of tokens the bucket can hold
             refill_rate: Rate at which tokens are refilled (tokens per second)
             remote_url: If provided, initialization is skipped (handled by __new__)
+            shared_path: Path of the SQLite file of a SharedTokenBucket (see __new__)
             
         Note:
             - The bucket starts full (tokens = capacity)
             - The target_rate is calculated in tokens per minute
-            - A log of token levels over time is maintained for visualization
+            - A log of token levels over time is maintained for visualization. It is
+              aggregated per second and bounded, so it uses constant memory
             
         Example:
             >>> bucket = TokenBucket(bucket_name="test-init", bucket_type="api", capacity=50, refill_rate=5)
@@ -146,7 +194,7 @@ class TokenBucket:
         self.refill_rate = refill_rate  # Rate at which tokens are refilled
         self._old_refill_rate = refill_rate
         self.last_refill = time.monotonic()  # Last refill time
-        self.log: List[Any] = []
+        self.log = TokenLog()
         self.turbo_mode = False
 
         self.creation_time = time.monotonic()
@@ -155,6 +203,11 @@ class TokenBucket:
         self.num_released = 0
         self.tokens_returned = 0
 
+        # Callers waiting in get_tokens, in order, by priority. Only the first
+        # waiter (the head) sleeps with a timeout, until the refill covers its
+        # request; the others sleep until the waiter ahead of them is served.
+        self._waiters: Dict[int, Deque[_Waiter]] = {}
+
     def turbo_mode_on(self) -> None:
         """Enable turbo mode to bypass rate limiting.
         
@@ -180,6 +233,7 @@ class TokenBucket:
             self.turbo_mode = True
             self.capacity = float("inf")
             self.refill_rate = float("inf")
+            self._wake_head()
 
     def turbo_mode_off(self) -> None:
         """Disable turbo mode and restore normal rate limiting.
@@ -200,6 +254,36 @@ class TokenBucket:
         self.turbo_mode = False
         self.capacity = self._old_capacity
         self.refill_rate = self._old_refill_rate
+        self._wake_head()
+
+    def set_refill_rate(self, refill_rate: Union[int, float]) -> None:
+        """Change the refill rate while the bucket is in use.
+
+        Tokens accrued so far are credited at the previous rate before the new
+        rate takes effect. If turbo mode is on, the new rate is stored and applied
+        when turbo mode is turned off.
+
+        Args:
+            refill_rate: The new number of tokens added per second
+
+        Example:
+            >>> bucket = TokenBucket(bucket_name="api", bucket_type="test", capacity=10, refill_rate=2)
+            >>> bucket.set_refill_rate(1)
+            >>> bucket.refill_rate
+            1
+            >>> bucket.turbo_mode_on()
+            >>> bucket.set_refill_rate(3)
+            >>> bucket.refill_rate
+            inf
+            >>> bucket.turbo_mode_off()
+            >>> bucket.refill_rate
+            3
+        """
+        self.refill()
+        self._old_refill_rate = refill_rate
+        if not self.turbo_mode:
+            self.refill_rate = refill_rate
+            self._wake_head()
 
     def __add__(self, other) -> "TokenBucket":
         """Combine two token buckets to create a more restrictive bucket.
@@ -269,6 +353,7 @@ class TokenBucket:
         self.tokens_returned += tokens
         self.tokens = min(self.capacity, self.tokens + tokens)
         self.log.append((time.monotonic(), self.tokens))
+        self._wake_head()
 
     def refill(self) -> None:
         """Refill the bucket with new tokens based on elapsed time.
@@ -328,25 +413,37 @@ class TokenBucket:
         return (requested_tokens - self.tokens) / self.refill_rate
 
     async def get_tokens(
-        self, amount: Union[int, float] = 1, cheat_bucket_capacity=True
+        self,
+        amount: Union[int, float] = 1,
+        cheat_bucket_capacity=True,
+        priority: int = 0,
     ) -> None:
         """Wait for the specified number of tokens to become available.
         
         This is the primary method for consuming tokens from the bucket. It will block
         asynchronously until the requested tokens are available, then deduct them
         from the bucket.
+
+        Waiting callers are queued by priority, then in arrival order. Only the first
+        caller in the queue sleeps on a timer, until the refill covers its request;
+        when it is served, it wakes the next one. Waiting therefore costs each caller
+        a constant number of wake-ups, however many callers are waiting.
         
         Args:
             amount: The number of tokens to consume
             cheat_bucket_capacity: If True and the requested amount exceeds capacity,
                                   automatically increase the bucket capacity to accommodate
                                   the request. If False, raise a ValueError.
+            priority: Callers with a higher priority are served first. A caller
+                      does not take tokens while one with a higher priority is
+                      waiting for them.
                                   
         Raises:
             ValueError: If amount exceeds capacity and cheat_bucket_capacity is False
             
         Note:
-            - This method blocks asynchronously using asyncio.sleep() if tokens are not available
+            - This method blocks asynchronously if tokens are not available, or if other
+              callers are ahead of it in the queue
             - The bucket is refilled based on elapsed time before checking token availability
             - Usage statistics and token levels are logged for tracking purposes
             
@@ -375,6 +472,32 @@ class TokenBucket:
             ... except TokenLimitError as e:
             ...     print("TokenLimitError raised")
             TokenLimitError raised
+
+            >>> # Example with priorities: the urgent caller goes first
+            >>> bucket = TokenBucket(bucket_name="api", bucket_type="test", capacity=1, refill_rate=20)
+            >>> async def take(name, priority, order):
+            ...     await bucket.get_tokens(1, priority=priority)
+            ...     order.append(name)
+            >>> async def main():
+            ...     order = []
+            ...     await bucket.get_tokens(1)
+            ...     await asyncio.gather(take("bulk", 0, order), take("urgent", 1, order))
+            ...     return order
+            >>> asyncio.run(main())
+            ['urgent', 'bulk']
+
+            >>> # Callers with the same priority are served in arrival order
+            >>> bucket = TokenBucket(bucket_name="api", bucket_type="test", capacity=5, refill_rate=50)
+            >>> async def main():
+            ...     order = []
+            ...     await bucket.get_tokens(5)
+            ...     await asyncio.gather(take("large", 0, order), *(take(i, 0, order) for i in range(3)))
+            ...     return order
+            >>> async def take(name, priority, order):
+            ...     await bucket.get_tokens(4 if name == "large" else 1, priority=priority)
+            ...     order.append(name)
+            >>> asyncio.run(main())
+            ['large', 0, 1, 2]
         """
         self.num_requests += amount
         if amount >= self.capacity:
@@ -385,27 +508,120 @@ class TokenBucket:
                 self.capacity = amount * 1.10
                 self._old_capacity = self.capacity
 
-        # Loop until we have enough tokens
-        while True:
-            self.refill()  # Refill based on elapsed time
-            if self.tokens >= amount:
-                self.tokens -= amount
-                break
-
-            wait_time = self.wait_time(amount)
-            if wait_time > 0:
-                await asyncio.sleep(wait_time)
+        waiter = _Waiter(amount, asyncio.get_running_loop())
+        self._enqueue(waiter, priority)
+        try:
+            while True:
+                taken, timeout = self._take_or_wait(waiter)
+                if taken:
+                    break
+                if timeout == 0:
+                    await asyncio.sleep(0)
+                    continue
+                try:
+                    await asyncio.wait_for(waiter.future, timeout)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self._dequeue(waiter, priority)
 
         self.num_released += amount
         now = time.monotonic()
         self.log.append((now, self.tokens))
         return None
 
+    def take_available(self, max_amount: Union[int, float]) -> Union[int, float]:
+        """Take up to `max_amount` tokens without waiting.
+
+        Takes nothing while callers are waiting in get_tokens, so that they are not
+        overtaken.
+
+        Args:
+            max_amount: The largest number of tokens to take
+
+        Returns:
+            The number of tokens taken
+
+        Example:
+            >>> bucket = TokenBucket(bucket_name="api", bucket_type="test", capacity=10, refill_rate=0.01)
+            >>> bucket.take_available(4)
+            4
+            >>> round(bucket.take_available(100))
+            6
+            >>> round(bucket.take_available(100))
+            0
+        """
+        if self._waiters:
+            return 0
+        self.refill()
+        amount = max(0, min(self.tokens, max_amount))
+        if amount and self._take(amount):
+            self.num_requests += amount
+            self.num_released += amount
+            return amount
+        return 0
+
+    def _head(self) -> Optional[_Waiter]:
+        """Return the waiter served next: the first one with the highest priority."""
+        if not self._waiters:
+            return None
+        return self._waiters[max(self._waiters)][0]
+
+    def _wake_head(self) -> None:
+        """Wake the waiter served next, so it checks the tokens again."""
+        head = self._head()
+        if head is not None:
+            head.wake()
+
+    def _enqueue(self, waiter: _Waiter, priority: int) -> None:
+        self._waiters.setdefault(priority, deque()).append(waiter)
+
+    def _dequeue(self, waiter: _Waiter, priority: int) -> None:
+        """Remove a waiter that was served or cancelled, waking the next one if needed."""
+        was_head = self._head() is waiter
+        queue = self._waiters[priority]
+        if queue[0] is waiter:
+            queue.popleft()
+        else:
+            queue.remove(waiter)
+        if not queue:
+            del self._waiters[priority]
+        if was_head:
+            self._wake_head()
+
+    def _take(self, amount: Union[int, float]) -> bool:
+        """Refill the bucket, then take `amount` tokens if they are available."""
+        self.refill()
+        if self.tokens >= amount:
+            self.tokens -= amount
+            return True
+        return False
+
+    def _take_or_wait(self, waiter: _Waiter) -> tuple[bool, Optional[float]]:
+        """Take the tokens if the waiter is first in line and they are available.
+
+        Otherwise prepare a new future for the waiter to sleep on, and return how
+        long to sleep: until the refill covers the request for the first waiter,
+        or until it is woken (None) for the others.
+        """
+        if self._head() is waiter:
+            if self._take(waiter.amount):
+                return True, None
+            timeout = self.wait_time(waiter.amount)
+            if not timeout > 0:
+                return False, 0
+        else:
+            timeout = None
+        waiter.future = waiter.loop.create_future()
+        return False, timeout
+
     def get_log(self) -> list[tuple]:
         """Return the token level log for analysis or visualization.
         
         Returns:
-            A list of (timestamp, token_level) tuples representing the token history
+            A list of (timestamp, token_level) tuples representing the token history.
+            Within each second, only the first, last, lowest and highest levels are
+            kept, and only the last hour is kept (see TokenLog).
             
         Example:
             >>> bucket = TokenBucket(bucket_name="test", bucket_type="test", capacity=10, refill_rate=1)
@@ -417,7 +633,7 @@ class TokenBucket:
             >>> isinstance(log[0], tuple) and len(log[0]) == 2  # Each entry should be a (timestamp, tokens) tuple
             True
         """
-        return self.log
+        return self.log.to_list()
 
     def visualize(self):
         """Visualize the token bucket usage over time as a line chart.
@@ -88,7 +88,7 @@ async def list_buckets(
 
         # Only include logs if requested
         if include_logs:
-            bucket_info["log"] = bucket.log
+            bucket_info["log"] = bucket.get_log()
 
         result[bucket_id] = bucket_info
 
@@ -170,15 +170,45 @@ async def create_bucket(bucket: TokenBucketCreate):
 
 
 @app.post("/bucket/{bucket_id}/get_tokens")
-async def get_tokens(bucket_id: str, amount: float, cheat_bucket_capacity: bool = True):
+async def get_tokens(
+    bucket_id: str, amount: float, cheat_bucket_capacity: bool = True, priority: int = 0
+):
     if bucket_id not in buckets:
         raise BucketNotFoundError(f"Bucket with ID '{bucket_id}' not found")
 
     bucket = buckets[bucket_id]
-    await bucket.get_tokens(amount, cheat_bucket_capacity)
+    await bucket.get_tokens(amount, cheat_bucket_capacity, priority=priority)
     return {"status": "success"}
 
 
+@app.post("/bucket/{bucket_id}/acquire_batch")
+async def acquire_batch(
+    bucket_id: str,
+    amount: float,
+    max_amount: float,
+    cheat_bucket_capacity: bool = True,
+    priority: int = 0,
+):
+    """Take `amount` tokens, waiting if needed, plus up to `max_amount` in total
+    from the tokens available right away.
+
+    Clients lease the extra tokens to serve later requests without calling the
+    server, and return what they do not use with add_tokens.
+    """
+    if bucket_id not in buckets:
+        raise BucketNotFoundError(f"Bucket with ID '{bucket_id}' not found")
+    if amount != amount or max_amount != max_amount:  # Check for NaN
+        raise InvalidBucketParameterError("Invalid amount specified")
+    if amount < 0 or max_amount == float("inf"):
+        raise InvalidBucketParameterError("Amounts must be finite and not negative")
+
+    bucket = buckets[bucket_id]
+    if amount > 0:
+        await bucket.get_tokens(amount, cheat_bucket_capacity, priority=priority)
+    extra = bucket.take_available(max_amount - amount) if max_amount > amount else 0
+    return {"status": "success", "amount": amount + extra}
+
+
 @app.post("/bucket/{bucket_id}/turbo_mode/{state}")
 async def set_turbo_mode(bucket_id: str, state: bool):
     if bucket_id not in buckets:
@@ -206,7 +236,7 @@ async def get_bucket_status(bucket_id: str):
         "num_requests": bucket.num_requests,
         "num_released": bucket.num_released,
         "tokens_returned": bucket.tokens_returned,
-        "log": bucket.log,
+        "log": bucket.get_log(),
     }
     for k, v in status.items():
         if isinstance(v, float):
@@ -5,11 +5,18 @@ This module provides a client implementation for interacting with a remote token
 bucket server. It implements the same interface as TokenBucket, but delegates
 operations to a remote server, enabling distributed rate limiting across
 multiple processes or machines.
+
+To keep traffic to the server low, the client leases tokens: when it has to ask
+the server for tokens, it also takes a block of the tokens available right away,
+serves later requests from that lease without calling the server, and returns
+what it has not used when the lease expires. Requests go through one keep-alive
+HTTP session per event loop, rather than a new connection per request.
 """
 
 from typing import Union, Optional, Dict, Any
 import asyncio
 import time
+import weakref
 import aiohttp
 
 from .exceptions import BucketError, TokenBucketClientError
@@ -30,6 +37,9 @@ class TokenBucketClient:
     
     Attributes:
         bucket_name (str): Name identifier for the bucket (usually service name)
+        lease_size (float): Tokens the client tries to lease at once
+        lease_seconds (float): Time after which unused leased tokens are returned
+        requests_sent (int): Number of requests sent to the server
         bucket_type (str): Type of bucket ("requests" or "tokens")
         capacity (float): Maximum tokens the bucket can hold
         refill_rate (float): Rate at which tokens are refilled (tokens per second)
@@ -50,6 +60,11 @@ class TokenBucketClient:
         >>> # Now use this client just like a regular TokenBucket
     """
 
+    # Fraction of the bucket's capacity leased at once, by default
+    LEASE_FRACTION = 0.1
+    # Connections kept open to the server, per event loop
+    MAX_CONNECTIONS = 100
+
     def __init__(
         self,
         *,
@@ -58,6 +73,8 @@ class TokenBucketClient:
         capacity: Union[int, float],
         refill_rate: Union[int, float],
         api_base_url: str = "http://localhost:8000",
+        lease_size: Optional[Union[int, float]] = None,
+        lease_seconds: float = 1.0,
     ):
         """
         Initialize a new TokenBucketClient connected to a remote token bucket server.
@@ -73,6 +90,11 @@ class TokenBucketClient:
             refill_rate: Rate at which tokens are added (tokens per second)
             api_base_url: Base URL for the token bucket server API
                          (default: "http://localhost:8000")
+            lease_size: Tokens to lease at once (default: LEASE_FRACTION of the
+                        capacity). 0 disables leasing, so that every request for
+                        tokens goes to the server.
+            lease_seconds: Time after which unused leased tokens are returned to
+                           the server (default: 1.0)
                          
         Raises:
             ValueError: If bucket creation on the server fails
@@ -91,9 +113,26 @@ class TokenBucketClient:
         self.refill_rate = refill_rate
         self.api_base_url = api_base_url
         self.bucket_id = f"{bucket_name}_{bucket_type}"
+        self.lease_seconds = lease_seconds
+        self.requests_sent = 0
+
+        # Tokens taken from the server and not used yet, and when they are returned
+        self._leased = 0.0
+        self._lease_expires = 0.0
+        self._lease_timer: Optional[asyncio.TimerHandle] = None
+        # The task returning an expired lease, kept so that it is not collected
+        # before it is done, and so that aclose can wait for it
+        self._lease_return: Optional[asyncio.Task] = None
+        # aiohttp sessions are bound to an event loop
+        self._sessions: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aiohttp.ClientSession]" = (
+            weakref.WeakKeyDictionary()
+        )
 
         # Initialize the bucket on the server
-        asyncio.run(self._create_bucket())
+        self._run(self._create_bucket())
+        self.lease_size = (
+            self.capacity * self.LEASE_FRACTION if lease_size is None else lease_size
+        )
 
         # Cache some values locally
         self.creation_time = time.monotonic()
@@ -110,29 +149,90 @@ class TokenBucketClient:
         Raises:
             ValueError: If the server returns an error
         """
-        async with aiohttp.ClientSession() as session:
-            # Prepare payload with bucket parameters
-            payload = {
-                "bucket_name": self.bucket_name,
-                "bucket_type": self.bucket_type,
-                "capacity": self.capacity,
-                "refill_rate": self.refill_rate,
-            }
-            
-            # Send request to create/retrieve bucket
-            async with session.post(
-                f"{self.api_base_url}/bucket",
-                json=payload,
-            ) as response:
-                if response.status != 200:
-                    raise TokenBucketClientError(f"Unexpected error: {await response.text()}")
-
-                # Process server response
-                result = await response.json()
-                if result["status"] == "existing":
-                    # Update our local values to match the existing bucket
-                    self.capacity = float(result["bucket"]["capacity"])
-                    self.refill_rate = float(result["bucket"]["refill_rate"])
+        # Prepare payload with bucket parameters
+        payload = {
+            "bucket_name": self.bucket_name,
+            "bucket_type": self.bucket_type,
+            "capacity": self.capacity,
+            "refill_rate": self.refill_rate,
+        }
+
+        # Send request to create/retrieve bucket
+        result = await self._request("POST", "/bucket", "Unexpected error", json=payload)
+        if result["status"] == "existing":
+            # Update our local values to match the existing bucket
+            self.capacity = float(result["bucket"]["capacity"])
+            self.refill_rate = float(result["bucket"]["refill_rate"])
+
+    def _session(self) -> aiohttp.ClientSession:
+        """Return the keep-alive session of the running event loop, creating it if needed."""
+        loop = asyncio.get_running_loop()
+        session = self._sessions.get(loop)
+        if session is None or session.closed:
+            session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.MAX_CONNECTIONS)
+            )
+            self._sessions[loop] = session
+        return session
+
+    async def _request(self, method: str, path: str, error: str, **kwargs) -> Any:
+        """
+        Send a request to the server through the session of the running loop.
+
+        Raises:
+            TokenBucketClientError: If the server returns an error, with `error`
+                as the start of the message
+        """
+        self.requests_sent += 1
+        async with self._session().request(
+            method, f"{self.api_base_url}{path}", **kwargs
+        ) as response:
+            if response.status != 200:
+                raise TokenBucketClientError(f"{error}: {await response.text()}")
+            return await response.json()
+
+    async def aclose(self) -> None:
+        """
+        Return the leased tokens and close the session of the running event loop.
+
+        Sessions of event loops that are still running stay open, so that their
+        connections are reused; a long-running loop should call this when it is
+        done with the client.
+        """
+        loop = asyncio.get_running_loop()
+        pending, self._lease_return = self._lease_return, None
+        if pending is not None and not pending.done() and pending.get_loop() is loop:
+            await pending
+        await self._return_lease()
+        session = self._sessions.pop(loop, None)
+        if session is not None:
+            await session.close()
+
+    def _run(self, coroutine) -> Any:
+        """
+        Run a coroutine from synchronous code.
+
+        With nest_asyncio (which edsl applies), this runs on the event loop that is
+        already running, if any, such as a job's; its session and the leased tokens
+        are left as they are, for `aclose` and the lease timer to deal with. Only a
+        session opened on a loop started for this call is closed afterwards.
+        """
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+
+        async def run():
+            loop = asyncio.get_running_loop()
+            try:
+                return await coroutine
+            finally:
+                if loop is not running:
+                    session = self._sessions.pop(loop, None)
+                    if session is not None:
+                        await session.close()
+
+        return asyncio.run(run())
 
     def turbo_mode_on(self) -> None:
         """
@@ -150,7 +250,7 @@ class TokenBucketClient:
             ...                           capacity=100, refill_rate=10)
             >>> client.turbo_mode_on()  # Now rate limits are bypassed
         """
-        asyncio.run(self._set_turbo_mode(True))
+        self._run(self._set_turbo_mode(True))
         self.turbo_mode = True
 
     def turbo_mode_off(self) -> None:
@@ -170,7 +270,7 @@ class TokenBucketClient:
             >>> # Do some work without rate limiting
             >>> client.turbo_mode_off()  # Restore rate limits
         """
-        asyncio.run(self._set_turbo_mode(False))
+        self._run(self._set_turbo_mode(False))
         self.turbo_mode = False
 
     async def add_tokens(self, amount: Union[int, float]) -> None:
@@ -194,13 +294,12 @@ class TokenBucketClient:
             >>> # Add 50 tokens to the bucket
             >>> asyncio.run(client.add_tokens(50))
         """
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                f"{self.api_base_url}/bucket/{self.bucket_id}/add_tokens",
-                params={"amount": amount},
-            ) as response:
-                if response.status != 200:
-                    raise TokenBucketClientError(f"Failed to add tokens: {await response.text()}")
+        await self._request(
+            "POST",
+            f"/bucket/{self.bucket_id}/add_tokens",
+            "Failed to add tokens",
+            params={"amount": amount},
+        )
 
     async def _set_turbo_mode(self, state: bool) -> None:
         """
@@ -215,17 +314,17 @@ class TokenBucketClient:
         Raises:
             ValueError: If the server returns an error
         """
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                f"{self.api_base_url}/bucket/{self.bucket_id}/turbo_mode/{str(state).lower()}"
-            ) as response:
-                if response.status != 200:
-                    raise TokenBucketClientError(
-                        f"Failed to set turbo mode: {await response.text()}"
-                    )
+        await self._request(
+            "POST",
+            f"/bucket/{self.bucket_id}/turbo_mode/{str(state).lower()}",
+            "Failed to set turbo mode",
+        )
 
     async def get_tokens(
-        self, amount: Union[int, float] = 1, cheat_bucket_capacity: bool = True
+        self,
+        amount: Union[int, float] = 1,
+        cheat_bucket_capacity: bool = True,
+        priority: int = 0,
     ) -> None:
         """
         Request tokens from the token bucket on the server.
@@ -233,11 +332,16 @@ class TokenBucketClient:
         This async method requests tokens from the token bucket on the server.
         It will either return immediately if tokens are available or raise an
         exception if tokens are not available.
+
+        Requests covered by the tokens the client has leased are served without
+        calling the server. Otherwise the client asks the server for the missing
+        tokens, and leases up to `lease_size` tokens more if they are available.
         
         Args:
             amount: Number of tokens to request (default: 1)
             cheat_bucket_capacity: If True, allow exceeding capacity temporarily
                                   (default: True)
+            priority: Callers with a higher priority are served first (default: 0)
             
         Raises:
             ValueError: If the server returns an error, which may indicate
@@ -250,16 +354,49 @@ class TokenBucketClient:
             >>> # Request 20 tokens
             >>> asyncio.run(client.get_tokens(20))
         """
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                f"{self.api_base_url}/bucket/{self.bucket_id}/get_tokens",
-                params={
-                    "amount": amount,
-                    "cheat_bucket_capacity": int(cheat_bucket_capacity),
-                },
-            ) as response:
-                if response.status != 200:
-                    raise TokenBucketClientError(f"Failed to get tokens: {await response.text()}")
+        if self._leased and self._lease_expires <= time.monotonic():
+            await self._return_lease()
+        if self._leased >= amount:
+            self._leased -= amount
+            return
+
+        needed = amount - self._leased
+        self._leased = 0.0
+        result = await self._request(
+            "POST",
+            f"/bucket/{self.bucket_id}/acquire_batch",
+            "Failed to get tokens",
+            params={
+                "amount": needed,
+                "max_amount": max(needed, self.lease_size),
+                "cheat_bucket_capacity": int(cheat_bucket_capacity),
+                "priority": priority,
+            },
+        )
+        extra = float(result["amount"]) - needed
+        if extra > 0:
+            self._leased += extra
+            self._lease_expires = time.monotonic() + self.lease_seconds
+            if self._lease_timer is not None:
+                self._lease_timer.cancel()
+            self._lease_timer = asyncio.get_running_loop().call_later(
+                self.lease_seconds, self._expire_lease
+            )
+
+    def _expire_lease(self) -> None:
+        """Return the leased tokens once the lease has expired."""
+        self._lease_timer = None
+        if self._leased and self._lease_expires <= time.monotonic():
+            self._lease_return = asyncio.ensure_future(self._return_lease())
+
+    async def _return_lease(self) -> None:
+        """Return the tokens leased and not used to the server."""
+        leftover, self._leased = self._leased, 0.0
+        if self._lease_timer is not None:
+            self._lease_timer.cancel()
+            self._lease_timer = None
+        if leftover > 0:
+            await self.add_tokens(leftover)
 
     def get_throughput(self, time_window: Optional[float] = None) -> float:
         """
@@ -284,7 +421,7 @@ class TokenBucketClient:
             >>> print(f"Average throughput: {throughput:.1f} tokens/minute")
         """
         # Get current bucket status from server
-        status = asyncio.run(self._get_status())
+        status = self._run(self._get_status())
         now = time.monotonic()
 
         # Determine start time based on time_window parameter
@@ -319,15 +456,11 @@ class TokenBucketClient:
         Raises:
             ValueError: If the server returns an error
         """
-        async with aiohttp.ClientSession() as session:
-            async with session.get(
-                f"{self.api_base_url}/bucket/{self.bucket_id}/status"
-            ) as response:
-                if response.status != 200:
-                    raise TokenBucketClientError(
-                        f"Failed to get bucket status: {await response.text()}"
-                    )
-                return await response.json()
+        return await self._request(
+            "GET",
+            f"/bucket/{self.bucket_id}/status",
+            "Failed to get bucket status",
+        )
 
     def __add__(self, other: "TokenBucketClient") -> "TokenBucketClient":
         """
@@ -363,7 +496,8 @@ class TokenBucketClient:
         """
         Get the current number of tokens available in the bucket.
         
-        This property retrieves the current token count from the server.
+        This property retrieves the current token count from the server, and
+        adds the tokens this client has leased.
         
         Returns:
             Current number of tokens available in the bucket
@@ -374,8 +508,8 @@ class TokenBucketClient:
             >>> available = client.tokens
             >>> print(f"Available tokens: {available}")
         """
-        status = asyncio.run(self._get_status())
-        return float(status["tokens"])
+        status = self._run(self._get_status())
+        return float(status["tokens"]) + self._leased
 
     def wait_time(self, requested_tokens: Union[float, int]) -> float:
         """
@@ -400,13 +534,17 @@ class TokenBucketClient:
             >>> wait_seconds = client.wait_time(50)
             >>> print(f"Need to wait {wait_seconds:.2f} seconds")
         """
-        # If we have enough tokens, no need to wait
-        if self.tokens >= float(requested_tokens):
+        # If the leased tokens are enough, there is no need to ask the server
+        if self._leased >= float(requested_tokens):
+            return 0.0
+
+        tokens = self.tokens
+        if tokens >= float(requested_tokens):
             return 0.0
             
         try:
             # Calculate time needed to accumulate the required tokens
-            return (requested_tokens - self.tokens) / self.refill_rate
+            return (requested_tokens - tokens) / self.refill_rate
         except Exception as e:
             raise BucketError(f"Error calculating wait time: {e}")
 
@@ -433,7 +571,7 @@ class TokenBucketClient:
             >>> # Now you can display or save the plot
         """
         # Get the bucket history from the server
-        status = asyncio.run(self._get_status())
+        status = self._run(self._get_status())
         times, tokens = zip(*status["log"])
         
         # Normalize times to start at 0
@@ -0,0 +1,82 @@
+"""
+Bounded history of the token level of a TokenBucket.
+
+A bucket records its token level every time tokens are refilled, taken or
+returned, which in a long job is millions of samples. TokenLog keeps them in
+constant memory: samples are aggregated into fixed time slots (one second by
+default), and only the most recent slots are kept.
+
+For each slot, the log keeps the first and last samples and the samples with the
+lowest and highest token levels. Drawn as a line, these four points reach the same
+extremes and the same endpoints as all the samples of the slot, so a chart of the
+log looks the same as a chart of every sample at the resolution of a slot.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import Deque, Iterator, List, Tuple
+
+# (time, tokens)
+Sample = Tuple[float, float]
+
+
+class TokenLog:
+    """
+    Aggregated samples of a token level, in bounded memory.
+
+    Args:
+        resolution: Length of a slot, in seconds
+        max_slots: Number of most recent slots kept
+
+    >>> log = TokenLog(resolution=1.0, max_slots=2)
+    >>> for sample in [(0.1, 5), (0.2, 1), (0.3, 9), (0.4, 4), (0.5, 6)]:
+    ...     log.append(sample)
+    >>> list(log)
+    [(0.1, 5), (0.2, 1), (0.3, 9), (0.5, 6)]
+    >>> log.append((1.5, 3)); log.append((2.5, 2))
+    >>> list(log)
+    [(1.5, 3), (2.5, 2)]
+    """
+
+    def __init__(self, resolution: float = 1.0, max_slots: int = 3600):
+        self.resolution = resolution
+        self.max_slots = max_slots
+        # [slot, first, lowest, highest, last] for each slot, oldest first
+        self._slots: Deque[list] = deque(maxlen=max_slots)
+
+    def __repr__(self) -> str:
+        return f"TokenLog(resolution={self.resolution}, slots={len(self._slots)}/{self.max_slots})"
+
+    def append(self, sample: Sample) -> None:
+        """Record the token level at a time."""
+        slot = int(sample[0] // self.resolution)
+        if self._slots and self._slots[-1][0] == slot:
+            current = self._slots[-1]
+            if sample[1] < current[2][1]:
+                current[2] = sample
+            if sample[1] > current[3][1]:
+                current[3] = sample
+            current[4] = sample
+        else:
+            self._slots.append([slot, sample, sample, sample, sample])
+
+    def __iter__(self) -> Iterator[Sample]:
+        for _, *samples in self._slots:
+            yield from sorted(set(samples), key=lambda sample: sample[0])
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __bool__(self) -> bool:
+        return bool(self._slots)
+
+    def to_list(self) -> List[Sample]:
+        """Return the samples, oldest first."""
+        return list(self)
+
+
+if __name__ == "__main__":
+    import doctest
+
+    doctest.testmod(optionflags=doctest.ELLIPSIS)
@@ -28,10 +28,14 @@ Implementation Notes:
 """
 
 from __future__ import annotations
+import asyncio
+import functools
+import itertools
 import json
 import os
 import warnings
-from typing import Optional, Union, TYPE_CHECKING
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, Union, TYPE_CHECKING
 
 from ..base import Base
 from ..utilities import remove_edsl_version, dict_hash
@@ -41,6 +45,18 @@ from .sql_dict import SQLiteDict
 if TYPE_CHECKING:
     from .cache_entry import CacheEntry
 
+_io_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _get_io_executor() -> ThreadPoolExecutor:
+    """Return the thread pool shared by all caches for database reads and writes."""
+    global _io_executor
+    if _io_executor is None:
+        _io_executor = ThreadPoolExecutor(
+            max_workers=Cache.IO_THREADS, thread_name_prefix="edsl-cache-io"
+        )
+    return _io_executor
+
 
 class Cache(Base):
     """Cache for storing and retrieving language model responses.
@@ -77,6 +93,9 @@ class Cache(Base):
 
     data = {}
 
+    # Threads used by afetch/astore for database-backed caches
+    IO_THREADS = 4
+
     def __init__(
         self,
         *,
@@ -123,6 +142,8 @@ class Cache(Base):
         self.new_entries_to_write_later = {}
         self.coop = None
         self.verbose = verbose
+        # Model calls in progress, by cache key (see await_in_flight)
+        self._in_flight = {}
 
         self.filename = filename
         if filename and data:
@@ -192,19 +213,43 @@ class Cache(Base):
         in the cache for easy iteration.
 
         Returns:
-            zip: An iterator of (key, CacheEntry) tuples
+            An iterator of (key, CacheEntry) tuples
         """
-        return zip(self.keys(), self.values())
+        return iter(self.data.items())
 
     def new_entries_cache(self) -> Cache:
         """Return a new Cache object with the new entries."""
         return Cache(data={**self.new_entries, **self.fetched_data})
 
+    def for_model(self, model: str) -> Cache:
+        """Return a read-only Cache of the entries of `model`, without copying them.
+
+        The returned cache reads this cache's data through a CacheView; for a
+        SQLite-backed cache, only the entries of `model` are read, through an index.
+
+        Examples:
+            >>> from edsl import Cache
+            >>> c = Cache.example()
+            >>> len(c.for_model("gpt-3.5-turbo")), len(c.for_model("gpt-4"))
+            (1, 0)
+        """
+        from .cache_view import CacheView
+
+        return Cache(data=CacheView(self.data, model))
+
     def _perform_checks(self):
-        """Perform checks on the cache."""
+        """Perform checks on the cache.
+
+        A SQLiteDict is not scanned: it checks its schema version when opened and
+        validates each entry when it is read, so opening a large cache stays fast.
+        Neither is a CacheView, whose entries come from a checked cache.
+        """
         from .cache_entry import CacheEntry
+        from .cache_view import CacheView
 
-        if any(not isinstance(value, CacheEntry) for value in self.data.values()):
+        if not isinstance(self.data, (SQLiteDict, CacheView)) and any(
+            not isinstance(value, CacheEntry) for value in self.data.values()
+        ):
             raise CacheError("Not all values are CacheEntry instances")
         if self.method is not None:
             warnings.warn("Argument `method` is deprecated", DeprecationWarning)
@@ -260,6 +305,7 @@ class Cache(Base):
             system_prompt=system_prompt,
             user_prompt=user_prompt,
             iteration=iteration,
+            key_version=self.key_version,
         )
         entry = self.data.get(key, None)
         if entry is not None:
@@ -271,6 +317,41 @@ class Cache(Base):
                 print(f"Cache miss for key: {key}")
         return None if entry is None else entry.output, key
 
+    def contains(
+        self,
+        *,
+        model: str,
+        parameters: dict,
+        system_prompt: str,
+        user_prompt: str,
+        iteration: int,
+    ) -> bool:
+        """Check whether a response for these inputs is cached, without fetching it.
+
+        Unlike `fetch`, this does not record the entry in `fetched_data` or log
+        a hit or miss, so it can be used to probe the cache before a call is made.
+
+        Examples:
+            >>> c = Cache()
+            >>> _ = c.store(model="gpt-3", parameters={}, system_prompt="Hello", user_prompt="Hi",
+            ...             response={"answer": 1}, iteration=1, service="openai")
+            >>> c.contains(model="gpt-3", parameters={}, system_prompt="Hello", user_prompt="Hi", iteration=1)
+            True
+            >>> c.fetched_data
+            {}
+        """
+        from .cache_entry import CacheEntry
+
+        key = CacheEntry.gen_key(
+            model=model,
+            parameters=parameters,
+            system_prompt=system_prompt,
+            user_prompt=user_prompt,
+            iteration=iteration,
+            key_version=self.key_version,
+        )
+        return key in self.data
+
     def store(
         self,
         model: str,
@@ -335,7 +416,7 @@ class Cache(Base):
             service=service,
             validated=validated,
         )
-        key = entry.key
+        key = self.key_for(entry)
         self.new_entries[key] = entry
         if self.immediate_write:
             self.data[key] = entry
@@ -343,47 +424,288 @@ class Cache(Base):
             self.new_entries_to_write_later[key] = entry
         return key
 
+    @property
+    def key_version(self) -> int:
+        """The format of this cache's keys (see CacheEntry.gen_key).
+
+        Caches stored in SQLite record their key version; other caches use version 1.
+        """
+        return getattr(self.data, "key_version", 1)
+
+    def key_for(self, entry: "CacheEntry") -> str:
+        """Return the key of `entry` in this cache's key format."""
+        return entry.versioned_key(self.key_version)
+
+    def migrate_keys(self, key_version: int) -> int:
+        """Rewrite the keys of a SQLite-backed cache in another key format.
+
+        Deferred entries are written first. Keys are shared with the remote cache in
+        version 1, so remote cache sync is only available for version-1 caches.
+
+        Args:
+            key_version: The key format to migrate to, one of CacheEntry.KEY_VERSIONS
+
+        Returns:
+            The number of entries migrated
+
+        Raises:
+            CacheError: If the cache is not stored in SQLite
+
+        Examples:
+            >>> c = Cache(data=SQLiteDict.example())
+            >>> c.store("gpt-3", {}, "Hello", "Hi", {"answer": 1}, 1, "openai") is not None
+            True
+            >>> c.migrate_keys(2)
+            1
+            >>> c.fetch(model="gpt-3", parameters={}, system_prompt="Hello", user_prompt="Hi", iteration=1)[0]
+            '{"answer": 1}'
+        """
+        if not isinstance(self.data, SQLiteDict):
+            raise CacheError("Only caches stored in SQLite can change their key version.")
+        for key, entry in self.new_entries_to_write_later.items():
+            self.data[key] = entry
+        self.new_entries_to_write_later = {}
+        migrated = self.data.migrate_keys(key_version)
+        self.new_entries = {self.key_for(e): e for e in self.new_entries.values()}
+        self.fetched_data = {self.key_for(e): e for e in self.fetched_data.values()}
+        return migrated
+
+    ####################
+    # IN-FLIGHT CALLS
+    ####################
+    def _running_flight(self, key: str) -> Optional[asyncio.Future]:
+        flight = self._in_flight.get(key)
+        if (
+            flight is None
+            or flight.done()
+            # Futures belong to one event loop; jobs run on other threads are not shared
+            or flight.get_loop() is not asyncio.get_running_loop()
+        ):
+            return None
+        return flight
+
+    async def await_in_flight(self, key: str) -> Optional[str]:
+        """Wait for an identical model call already in progress and return its output.
+
+        Model calls that miss the cache register themselves with `start_flight`, so
+        that concurrent callers with the same key share one call instead of each
+        making their own. Returns None if no call with this key is in progress, or if
+        the calls in progress failed, in which case the caller should make the call.
+
+        Examples:
+            >>> import asyncio
+            >>> c = Cache()
+            >>> async def main():
+            ...     flight = c.start_flight("key")
+            ...     waiter = asyncio.ensure_future(c.await_in_flight("key"))
+            ...     await asyncio.sleep(0)
+            ...     c.end_flight("key", flight, '{"answer": 1}')
+            ...     return await waiter
+            >>> asyncio.run(main())
+            '{"answer": 1}'
+            >>> asyncio.run(c.await_in_flight("key")) is None
+            True
+        """
+        while (flight := self._running_flight(key)) is not None:
+            # Shielded so that a cancelled waiter does not cancel the shared call
+            output = await asyncio.shield(flight)
+            if output is not None:
+                return output
+        return None
+
+    def start_flight(self, key: str) -> asyncio.Future:
+        """Register a model call for `key` as in progress. See `await_in_flight`.
+
+        Must be called without awaiting anything after `await_in_flight` returned
+        None, and followed by `end_flight` whatever the outcome of the call.
+        """
+        flight = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = flight
+        return flight
+
+    def end_flight(self, key: str, flight: asyncio.Future, output: Optional[str]) -> None:
+        """Mark a model call as finished, passing its output (None if it failed) to the callers waiting for it."""
+        if self._in_flight.get(key) is flight:
+            del self._in_flight[key]
+        if not flight.done():
+            flight.set_result(output)
+
+    def _blocks_on_io(self) -> bool:
+        """Whether reads and writes of the data store go to a database file."""
+        return isinstance(self.data, SQLiteDict) and not self.data.db_path.endswith(
+            ":memory:"
+        )
+
+    async def _run_io(self, method, **kwargs):
+        if not self._blocks_on_io():
+            return method(**kwargs)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            _get_io_executor(), functools.partial(method, **kwargs)
+        )
+
+    async def afetch(
+        self,
+        *,
+        model: str,
+        parameters: dict,
+        system_prompt: str,
+        user_prompt: str,
+        iteration: int,
+        validated: bool = False,
+    ) -> tuple(Union[None, str], str):
+        """Asynchronous version of `fetch`.
+
+        For a cache stored in a database file, the lookup runs on a thread pool
+        shared by all caches, so the event loop keeps running other interviews
+        while it waits for SQLite. In-memory caches are read directly.
+
+        Examples:
+            >>> import asyncio
+            >>> c = Cache()
+            >>> asyncio.run(c.afetch(model="gpt-3", parameters="default", system_prompt="Hello",
+            ...         user_prompt="Hi", iteration=1))[0] is None
+            True
+        """
+        return await self._run_io(
+            self.fetch,
+            model=model,
+            parameters=parameters,
+            system_prompt=system_prompt,
+            user_prompt=user_prompt,
+            iteration=iteration,
+            validated=validated,
+        )
+
+    async def acontains(
+        self,
+        *,
+        model: str,
+        parameters: dict,
+        system_prompt: str,
+        user_prompt: str,
+        iteration: int,
+    ) -> bool:
+        """Async version of `contains`, run off the event loop for database-backed caches."""
+        return await self._run_io(
+            self.contains,
+            model=model,
+            parameters=parameters,
+            system_prompt=system_prompt,
+            user_prompt=user_prompt,
+            iteration=iteration,
+        )
+
+    async def astore(
+        self,
+        model: str,
+        parameters: str,
+        system_prompt: str,
+        user_prompt: str,
+        response: dict,
+        iteration: int,
+        service: str,
+        validated: bool = False,
+    ) -> str:
+        """Asynchronous version of `store`, writing on the cache I/O thread pool.
+
+        Examples:
+            >>> import asyncio
+            >>> path = SQLiteDict._get_temp_path()
+            >>> c = Cache(data=SQLiteDict(path))
+            >>> key = asyncio.run(c.astore("gpt-3", {}, "Hello", "Hi", {"answer": 1}, 1, "openai"))
+            >>> c.data[key].output
+            '{"answer": 1}'
+            >>> import os; os.unlink(path)
+        """
+        return await self._run_io(
+            self.store,
+            model=model,
+            parameters=parameters,
+            system_prompt=system_prompt,
+            user_prompt=user_prompt,
+            response=response,
+            iteration=iteration,
+            service=service,
+            validated=validated,
+        )
+
     def add_from_dict(
-        self, new_data: dict[str, "CacheEntry"], write_now: Optional[bool] = True
+        self,
+        new_data: dict[str, "CacheEntry"],
+        write_now: Optional[bool] = True,
+        track_new_entries: bool = True,
     ) -> None:
         """
         Add entries to the cache from a dictionary.
 
         :param write_now: Whether to write to the cache immediately (similar to `immediate_write`).
+        :param track_new_entries: Whether to also record the entries in `new_entries`.
         """
         from .cache_entry import CacheEntry
+        from .sql_dict import SQLiteDict
 
+        if isinstance(self.data, SQLiteDict):
+            existing = self.data.get_many(new_data)
+        else:
+            existing = {key: self.data[key] for key in new_data if key in self.data}
         for key, value in new_data.items():
-            if key in self.data:
-                if value != self.data[key]:
+            if key in existing:
+                if value != existing[key]:
                     raise CacheError("Mismatch in values")
             if not isinstance(value, CacheEntry):
                 raise CacheError(f"Wrong type - the observed type is {type(value)}")
 
-        self.new_entries.update(new_data)
+        if track_new_entries:
+            self.new_entries.update(new_data)
         if write_now:
             self.data.update(new_data)
         else:
             self.new_entries_to_write_later.update(new_data)
 
-    def add_from_jsonl(self, filename: str, write_now: Optional[bool] = True) -> None:
+    def add_from_jsonl(
+        self,
+        filename: str,
+        write_now: Optional[bool] = True,
+        batch_size: int = 1000,
+        progress: Optional[Callable[[int], None]] = None,
+        track_new_entries: bool = True,
+    ) -> int:
         """
         Add entries to the cache from a JSONL.
 
+        The file is read and added `batch_size` entries at a time, so only one batch
+        is held in memory when `track_new_entries` is False and the cache is stored
+        in SQLite.
+
         :param write_now: Whether to write to the cache immediately (similar to `immediate_write`).
+        :param batch_size: Number of entries read and added at a time.
+        :param progress: Called with the number of entries added so far after each batch.
+        :param track_new_entries: Whether to also record the entries in `new_entries`.
+        :return: The number of entries read from the file.
         """
         from .cache_entry import CacheEntry
 
+        count = 0
         with open(filename, "a+") as f:
             f.seek(0)
-            lines = f.readlines()
-        new_data = {}
-        for line in lines:
-            d = json.loads(line)
-            key = list(d.keys())[0]
-            value = list(d.values())[0]
-            new_data[key] = CacheEntry(**value)
-        self.add_from_dict(new_data=new_data, write_now=write_now)
+            lines = (line for line in f if line.strip())
+            while batch := list(itertools.islice(lines, batch_size)):
+                new_data = {}
+                for line in batch:
+                    d = json.loads(line)
+                    key = list(d.keys())[0]
+                    value = list(d.values())[0]
+                    new_data[key] = CacheEntry(**value)
+                self.add_from_dict(
+                    new_data=new_data,
+                    write_now=write_now,
+                    track_new_entries=track_new_entries,
+                )
+                count += len(batch)
+                if progress is not None:
+                    progress(count)
+        return count
 
     def add_from_sqlite(self, db_path: str, write_now: Optional[bool] = True):
         """
@@ -426,7 +748,8 @@ class Cache(Base):
         :param db_path: The path to the SQLite database used to store the cache.
 
         * If `db_path` is None, the cache will be stored in memory, as a dictionary.
-        * If `db_path` is provided, the cache will be stored in an SQLite database.
+        * If `db_path` is provided, the cache will be stored in an SQLite database,
+          and the file is streamed into it without holding the entries in memory.
         """
         # if a file doesn't exist at jsonfile, throw an error
         from .sql_dict import SQLiteDict
@@ -441,7 +764,7 @@ class Cache(Base):
             data = SQLiteDict(db_path)
 
         cache = Cache(data=data)
-        cache.add_from_jsonl(jsonlfile)
+        cache.add_from_jsonl(jsonlfile, track_new_entries=db_path is None)
         return cache
 
     def write_sqlite_db(self, db_path: str) -> None:
@@ -453,8 +776,7 @@ class Cache(Base):
         from .sql_dict import SQLiteDict
 
         new_data = SQLiteDict(db_path)
-        for key, value in self.data.items():
-            new_data[key] = value
+        new_data.insert_many(self.data.items(), overwrite=True)
 
     def write(self, filename: Optional[str] = None) -> None:
         """
@@ -469,14 +791,39 @@ class Cache(Base):
         else:
             raise CacheError("Invalid file extension. Must be .jsonl or .db")
 
-    def write_jsonl(self, filename: str) -> None:
+    def write_jsonl(
+        self,
+        filename: str,
+        batch_size: int = 1000,
+        progress: Optional[Callable[[int], None]] = None,
+    ) -> int:
         """
         Write the cache to a JSONL file.
+
+        Entries of a SQLite-backed cache are read `batch_size` at a time, so the
+        whole cache is never held in memory.
+
+        :param batch_size: Number of entries read from the database at a time.
+        :param progress: Called with the number of entries written so far after each batch.
+        :return: The number of entries written.
         """
+        from .sql_dict import SQLiteDict
+
+        if isinstance(self.data, SQLiteDict):
+            items = self.data.items(batch_size=batch_size)
+        else:
+            items = self.data.items()
+        count = 0
         path = os.path.join(os.getcwd(), filename)
         with open(path, "w") as f:
-            for key, value in self.data.items():
+            for key, value in items:
                 f.write(json.dumps({key: value.to_dict()}) + "\n")
+                count += 1
+                if progress is not None and count % batch_size == 0:
+                    progress(count)
+        if progress is not None and count % batch_size:
+            progress(count)
+        return count
 
     def to_scenario_list(self):
         from ..scenarios import ScenarioList, Scenario
@@ -571,17 +918,38 @@ class Cache(Base):
             - Persistence format is determined by the filename extension (.jsonl or .db)
             - SQLAlchemy resources are properly disposed when the context is exited
         """
+        self.flush()
+
+        # Clean up SQLAlchemy resources
+        self.close()
+
+    def flush(self) -> None:
+        """Write deferred entries to the main data store and persist the cache.
+
+        The cache is written to its file only if a filename was provided at
+        initialization.
+
+        Examples:
+            >>> from edsl import Cache
+            >>> c = Cache(immediate_write=False)
+            >>> c.new_entries_to_write_later = dict(Cache.example().data)
+            >>> c.flush()
+            >>> c.keys()
+            ['5513286eb6967abc0511211f0402587d']
+            >>> c.new_entries_to_write_later
+            {}
+        """
         # Write any deferred entries to the main data store
         for key, entry in self.new_entries_to_write_later.items():
             self.data[key] = entry
+        self.new_entries_to_write_later = {}
+        if hasattr(self.data, "flush"):
+            self.data.flush()
 
         # Persist the cache to disk if a filename was provided
         if self.filename:
             self.write(self.filename)
 
-        # Clean up SQLAlchemy resources
-        self.close()
-
     def __hash__(self):
         """Return the hash of the Cache."""
 
@@ -774,6 +1142,144 @@ class Cache(Base):
             f"Cache(data = {repr(self.data)}, immediate_write={self.immediate_write})"
         )
 
+    ####################
+    # MAINTENANCE
+    ####################
+    def _entry_metadata(self):
+        """Yield the key, timestamp, model and size in bytes of every entry."""
+        if isinstance(self.data, SQLiteDict):
+            yield from self.data.entry_metadata()
+        else:
+            for key, entry in self.data.items():
+                yield key, entry.timestamp, entry.model, len(json.dumps(entry.to_dict()))
+
+    def _delete(self, keys: list) -> int:
+        """Delete the entries with the given keys from the data store."""
+        if isinstance(self.data, SQLiteDict):
+            return self.data.delete_many(keys)
+        for key in keys:
+            del self.data[key]
+        return len(keys)
+
+    def purge(
+        self,
+        *,
+        older_than: Optional[float] = None,
+        models: Optional[list[str]] = None,
+    ) -> int:
+        """Delete entries created more than `older_than` seconds ago, or made by `models`.
+
+        Entries matching either condition are deleted.
+
+        Args:
+            older_than: Maximum age of the entries to keep, in seconds
+            models: Names of models whose entries are deleted
+
+        Returns:
+            The number of entries deleted
+
+        Examples:
+            >>> from edsl import CacheEntry
+            >>> old = CacheEntry.example(randomize=True)
+            >>> old.timestamp -= 3600
+            >>> c = Cache(data={old.key: old})
+            >>> new = CacheEntry.example(randomize=True)
+            >>> c.data[new.key] = new
+            >>> c.purge(older_than=60)
+            1
+            >>> c.purge(models=["gpt-3.5-turbo"])
+            1
+            >>> len(c)
+            0
+        """
+        import time
+
+        cutoff = time.time() - older_than if older_than is not None else None
+        models = set(models or [])
+        doomed = [
+            key
+            for key, timestamp, model, _ in self._entry_metadata()
+            if (cutoff is not None and timestamp < cutoff) or model in models
+        ]
+        return self._delete(doomed)
+
+    def evict(
+        self,
+        *,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+    ) -> int:
+        """Delete the oldest entries until the cache is within the given bounds.
+
+        Args:
+            max_entries: Maximum number of entries to keep
+            max_bytes: Maximum total size of the stored entries to keep, in bytes
+
+        Returns:
+            The number of entries deleted
+
+        Examples:
+            >>> from edsl import CacheEntry
+            >>> entries = [CacheEntry.example(randomize=True) for _ in range(3)]
+            >>> for i, entry in enumerate(entries):
+            ...     entry.timestamp += i
+            >>> c = Cache(data={entry.key: entry for entry in entries})
+            >>> c.evict(max_entries=1)
+            2
+            >>> list(c.data.values()) == [entries[2]]
+            True
+        """
+        if isinstance(self.data, SQLiteDict):
+            newest_first = self.data.sizes_newest_first()
+        else:
+            newest_first = (
+                (key, size)
+                for key, _, _, size in sorted(
+                    self._entry_metadata(), key=lambda item: item[1], reverse=True
+                )
+            )
+        kept_entries = kept_bytes = 0
+        full = False
+        doomed = []
+        # Keep the newest entries up to the first one that does not fit, so that
+        # no entry is kept while a newer one is deleted
+        for key, size in newest_first:
+            full = full or (
+                (max_entries is not None and kept_entries >= max_entries)
+                or (max_bytes is not None and kept_bytes + size > max_bytes)
+            )
+            if full:
+                doomed.append(key)
+            else:
+                kept_entries += 1
+                kept_bytes += size
+        return self._delete(doomed)
+
+    def vacuum(self) -> Optional[tuple[int, int]]:
+        """Compact the database file of a SQLite-backed cache after entries were deleted.
+
+        Returns:
+            The size of the database file in bytes before and after compaction, or
+            None if the cache is not stored in SQLite
+        """
+        if not isinstance(self.data, SQLiteDict):
+            return None
+        return self.data.vacuum()
+
+    def compress(self, method: Optional[str] = "zlib", dictionary: bool = False) -> tuple[int, int]:
+        """Store the entries of a SQLite-backed cache compressed.
+
+        See `SQLiteDict.compress`.
+
+        Returns:
+            The size of the database file in bytes before and after compression
+        """
+        if not isinstance(self.data, SQLiteDict):
+            from .exceptions import CacheError
+
+            raise CacheError("Only caches stored in SQLite can be compressed.")
+        return self.data.compress(method, dictionary=dictionary)
+
     ####################
     # EXAMPLES
     ####################
@@ -820,8 +1326,14 @@ class Cache(Base):
     def subset(self, keys: list[str]) -> Cache:
         """
         Return a subset of the Cache with the specified keys.
+
+        Only the entries with those keys are read, so the cost depends on the
+        number of keys, not on the size of the cache.
         """
-        new_data = {k: v for k, v in self.data.items() if k in keys}
+        if isinstance(self.data, SQLiteDict):
+            new_data = self.data.get_many(keys)
+        else:
+            new_data = {k: self.data[k] for k in keys if k in self.data}
         return Cache(data=new_data)
 
     def view(self) -> None:
@@ -0,0 +1,184 @@
+"""
+Digest-based synchronization of cache keys.
+
+Finding which entries two caches are missing by sending every key costs network
+bytes and CPU in proportion to the size of the caches, even when nothing changed.
+Instead, the client and server compare digests of the keys under a prefix, starting
+with the whole key space. Only the prefixes whose digests differ are split, one
+character at a time, and only the keys under the small prefixes that still differ
+are exchanged. When the caches are equal, the sync is one request with one digest;
+otherwise its cost grows with the number of differing entries, not with the caches.
+
+The server side is any object with the methods of `LocalCacheSyncServer`, which is a
+stand-in server over a local Cache, used for testing and for syncing two local caches.
+"""
+
+from __future__ import annotations
+
+import bisect
+import hashlib
+from typing import Dict, Iterable, List, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .cache import Cache
+    from .cache_entry import CacheEntry
+
+# (number of keys, digest of the keys) for a range of keys
+RangeDigest = Tuple[int, str]
+
+
+class KeyDigestIndex:
+    """
+    Sorted cache keys, with digests of the keys that share a prefix.
+
+    >>> index = KeyDigestIndex(["a1", "a2", "b1"])
+    >>> index.range("a")
+    ['a1', 'a2']
+    >>> {c: count for c, (count, _) in index.children("").items()}
+    {'a': 2, 'b': 1}
+    """
+
+    def __init__(self, keys: Iterable[str]):
+        self.keys = sorted(keys)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def range(self, prefix: str) -> List[str]:
+        """Return the keys starting with `prefix`, in order."""
+        start = bisect.bisect_left(self.keys, prefix)
+        end = bisect.bisect_left(self.keys, prefix + "\U0010ffff", start)
+        return self.keys[start:end]
+
+    def children(self, prefix: str) -> Dict[str, RangeDigest]:
+        """
+        Return the digest of the keys under `prefix`, grouped by their next character.
+
+        A key equal to `prefix` is grouped under the empty string.
+        """
+        groups: Dict[str, List[str]] = {}
+        for key in self.range(prefix):
+            groups.setdefault(key[len(prefix) : len(prefix) + 1], []).append(key)
+        return {char: _digest(keys) for char, keys in groups.items()}
+
+
+def _digest(keys: List[str]) -> RangeDigest:
+    return len(keys), hashlib.blake2b("\n".join(keys).encode(), digest_size=16).hexdigest()
+
+
+def digest_difference(index: KeyDigestIndex, server, leaf_size: int = 64) -> dict:
+    """
+    Find the entries the client is missing and the keys the server is missing.
+
+    Args:
+        index: The client's keys
+        server: The server, with the methods of `LocalCacheSyncServer`
+        leaf_size: Prefixes with at most this many keys on either side are
+            compared key by key instead of being split further
+
+    Returns:
+        A dict with the server's entries missing from the client under
+        "client_missing_cacheentries", and the client's keys missing from the
+        server under "server_missing_cacheentry_keys"
+
+    >>> from edsl.caching import Cache, CacheEntry
+    >>> shared, extra = CacheEntry.example(randomize=True), CacheEntry.example(randomize=True)
+    >>> server = LocalCacheSyncServer(Cache(data={shared.key: shared, extra.key: extra}))
+    >>> diff = digest_difference(KeyDigestIndex([shared.key, "abc"]), server)
+    >>> [e.key for e in diff["client_missing_cacheentries"]] == [extra.key]
+    True
+    >>> diff["server_missing_cacheentry_keys"]
+    ['abc']
+    """
+    leaves: List[str] = []
+    pending = [""]
+    while pending:
+        remote = server.cache_digest_children(pending)
+        split = []
+        for prefix in pending:
+            local_children = index.children(prefix)
+            remote_children = remote.get(prefix, {})
+            differing = [
+                char
+                for char in local_children.keys() | remote_children.keys()
+                if local_children.get(char) != remote_children.get(char)
+            ]
+            if "" in differing:
+                # a key equal to the prefix differs: compare the whole prefix
+                leaves.append(prefix)
+                continue
+            for char in differing:
+                size = max(
+                    local_children.get(char, (0, ""))[0],
+                    remote_children.get(char, (0, ""))[0],
+                )
+                (leaves if size <= leaf_size else split).append(prefix + char)
+        pending = split
+
+    if not leaves:
+        return {"client_missing_cacheentries": [], "server_missing_cacheentry_keys": []}
+    return server.cache_range_difference({prefix: index.range(prefix) for prefix in leaves})
+
+
+class LocalCacheSyncServer:
+    """
+    Stand-in sync server over a local Cache.
+
+    Counts the requests it receives and the keys sent to it, so that the cost
+    of a sync can be measured.
+
+    >>> from edsl.caching import Cache
+    >>> server = LocalCacheSyncServer(Cache())
+    >>> server.cache_digest_children([""])
+    {'': {}}
+    """
+
+    def __init__(self, cache: "Cache"):
+        self.cache = cache
+        self.requests = 0
+        self.keys_received = 0
+        self._index = None
+
+    @property
+    def index(self) -> KeyDigestIndex:
+        if self._index is None:
+            self._index = KeyDigestIndex(self.cache.keys())
+        return self._index
+
+    def cache_digest_children(self, prefixes: List[str]) -> Dict[str, Dict[str, RangeDigest]]:
+        """Return the digests of the keys under each prefix, by next character."""
+        self.requests += 1
+        return {prefix: self.index.children(prefix) for prefix in prefixes}
+
+    def cache_range_difference(self, ranges: Dict[str, List[str]]) -> dict:
+        """Compare the client's keys under each prefix with the server's keys.
+
+        Args:
+            ranges: The client's keys, by prefix
+        """
+        self.requests += 1
+        client_missing, server_missing = [], []
+        for prefix, client_keys in ranges.items():
+            self.keys_received += len(client_keys)
+            client_keys = set(client_keys)
+            server_keys = self.index.range(prefix)
+            client_missing.extend(
+                self.cache.data[key] for key in server_keys if key not in client_keys
+            )
+            server_missing.extend(sorted(client_keys.difference(server_keys)))
+        return {
+            "client_missing_cacheentries": client_missing,
+            "server_missing_cacheentry_keys": server_missing,
+        }
+
+    def cache_create_many(self, entries: List["CacheEntry"]) -> None:
+        """Add entries to the server's cache."""
+        self.requests += 1
+        self.cache.add_from_dict({entry.key: entry for entry in entries})
+        self._index = None
+
+
+if __name__ == "__main__":
+    import doctest
+
+    doctest.testmod(optionflags=doctest.ELLIPSIS)
@@ -18,6 +18,25 @@ from ..base import RepresentationMixin
 from .exceptions import CacheError
 
 
+class CacheParameters(dict):
+    """
+    Model parameters whose canonical JSON is computed once, for cache keys.
+
+    Language models pass their parameters to the cache as a CacheParameters, and
+    keep reusing it while their parameters do not change, so the parameters are
+    not serialized again for every fetch and store. Treat it as read-only: the
+    canonical JSON is not updated if it is modified.
+
+    >>> p = CacheParameters({"temperature": 0.5, "max_tokens": 10})
+    >>> p.canonical_json
+    '{"max_tokens": 10, "temperature": 0.5}'
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.canonical_json = json.dumps(self, sort_keys=True)
+
+
 class CacheEntry(RepresentationMixin):
     """
     Represents a single cached language model response with associated metadata.
@@ -41,8 +60,13 @@ class CacheEntry(RepresentationMixin):
     Class Attributes:
         key_fields (List[str]): Fields used to generate the unique hash key
         all_fields (List[str]): All fields stored in the cache entry
+        KEY_VERSIONS (tuple): Supported key formats. Version 1 is the MD5 of the
+            concatenated key fields, shared with the remote cache; version 2 is a
+            BLAKE2b hash of the length-prefixed key fields, which is faster and
+            cannot confuse a boundary between two fields
     """
 
+    KEY_VERSIONS = (1, 2)
     key_fields = ["model", "parameters", "system_prompt", "user_prompt", "iteration"]
     all_fields = key_fields + ["timestamp", "output", "service", "validated"]
 
@@ -112,32 +136,65 @@ class CacheEntry(RepresentationMixin):
         system_prompt: str,
         user_prompt: str,
         iteration: int,
+        key_version: int = 1,
     ) -> str:
         """
         Generates a unique key hash for the cache entry based on input parameters.
 
-        This method creates a deterministic hash key by concatenating the model name,
+        This method creates a deterministic hash key from the model name,
         parameters (sorted to ensure consistency), system prompt, user prompt, and
-        iteration number. The hash enables efficient lookup of cache entries with
-        identical inputs.
+        iteration number. The fields are fed to the hash one at a time rather than
+        concatenated first, so long prompts are not copied. The hash enables
+        efficient lookup of cache entries with identical inputs.
 
         Args:
             model: The language model identifier
-            parameters: Dictionary of model parameters (will be sorted for consistency)
+            parameters: Dictionary of model parameters (will be sorted for consistency).
+                If it is a CacheParameters, its precomputed canonical JSON is used.
             system_prompt: The system prompt provided to the model
             user_prompt: The user prompt provided to the model
             iteration: Iteration number for this combination of inputs
+            key_version: Key format, one of KEY_VERSIONS (default: 1)
 
         Returns:
-            A hex-encoded MD5 hash string that uniquely identifies this combination
+            A 32-character hex hash string that uniquely identifies this combination
             of inputs
 
+        Raises:
+            CacheError: If the key version is not supported
+
         Note:
             - The hash treats single and double quotes as equivalent
             - Parameters are sorted to ensure consistent hashing regardless of order
+
+        >>> fields = dict(model="gpt-4o", parameters={"temperature": 0.5},
+        ...     system_prompt="You are a helpful agent.", user_prompt="Hello", iteration=1)
+        >>> CacheEntry.gen_key(**fields) == CacheEntry.gen_key(
+        ...     **{**fields, "parameters": CacheParameters({"temperature": 0.5})})
+        True
+        >>> CacheEntry.gen_key(**fields) != CacheEntry.gen_key(**fields, key_version=2)
+        True
         """
-        long_key = f"{model}{json.dumps(parameters, sort_keys=True)}{system_prompt}{user_prompt}{iteration}"
-        return hashlib.md5(long_key.encode()).hexdigest()
+        parameters_json = getattr(parameters, "canonical_json", None)
+        if parameters_json is None:
+            parameters_json = json.dumps(parameters, sort_keys=True)
+        # Prompts may be Prompt objects; str() matches how they were formatted into keys
+        parts = (str(model), parameters_json, str(system_prompt), str(user_prompt), str(iteration))
+        if key_version == 1:
+            h = hashlib.md5()
+            for part in parts:
+                h.update(part.encode())
+        elif key_version == 2:
+            h = hashlib.blake2b(digest_size=16, person=b"edsl-cache-key")
+            for part in parts:
+                data = part.encode()
+                h.update(len(data).to_bytes(8, "little"))
+                h.update(data)
+        else:
+            raise CacheError(
+                f"Unknown cache key version {key_version}; supported versions are {cls.KEY_VERSIONS}."
+            )
+        return h.hexdigest()
 
     @property
     def key(self) -> str:
@@ -151,8 +208,20 @@ class CacheEntry(RepresentationMixin):
         Returns:
             A hex-encoded MD5 hash string that uniquely identifies this cache entry
         """
+        return self.versioned_key(1)
+
+    def versioned_key(self, key_version: int) -> str:
+        """
+        Returns the hash key of this cache entry in the given key format.
+
+        Args:
+            key_version: Key format, one of KEY_VERSIONS
+
+        >>> CacheEntry.example().versioned_key(1) == CacheEntry.example().key
+        True
+        """
         d = {k: value for k, value in self.__dict__.items() if k in self.key_fields}
-        return self.gen_key(**d)
+        return self.gen_key(**d, key_version=key_version)
 
     def to_dict(self, add_edsl_version: bool = True) -> Dict[str, Any]:
         """
@@ -76,7 +76,17 @@ class CacheHandler:
 
         from .sql_dict import SQLiteDict
 
-        cache = Cache(data=SQLiteDict(self.CACHE_PATH))
+        memory_entries = int(CONFIG.get("EDSL_CACHE_MEMORY_ENTRIES"))
+        memory_bytes = int(CONFIG.get("EDSL_CACHE_MEMORY_BYTES"))
+        # Zero entries disables the memory tier; zero bytes only lifts the byte cap
+        cache = Cache(
+            data=SQLiteDict(
+                self.CACHE_PATH,
+                max_unwritten_entries=int(CONFIG.get("EDSL_CACHE_MAX_UNWRITTEN_ENTRIES")),
+                memory_entries=memory_entries,
+                memory_bytes=(memory_bytes or None) if memory_entries > 0 else None,
+            )
+        )
         return cache
 
     def from_old_sqlite_cache(
@@ -0,0 +1,85 @@
+"""
+Read-only views of the entries of one model in a cache.
+
+Building a new Cache with the entries of one model copies each of them, which for a
+large cache means reading and decoding the whole database. A CacheView instead reads
+the underlying storage on demand: for a SQLiteDict, through the index on the model
+column, so only the entries of that model are ever read.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import Iterator, Optional, Tuple, Union, TYPE_CHECKING
+
+from .sql_dict import SQLiteDict
+
+if TYPE_CHECKING:
+    from .cache_entry import CacheEntry
+
+
+class CacheView(Mapping):
+    """
+    Read-only mapping of the entries of `model` in a cache's data.
+
+    Args:
+        data: The data of a Cache: a dict or a SQLiteDict
+        model: The model whose entries are visible
+
+    >>> from edsl.caching import CacheEntry
+    >>> entry = CacheEntry.example()
+    >>> view = CacheView({entry.key: entry}, "gpt-3.5-turbo")
+    >>> list(view) == [entry.key], len(CacheView({entry.key: entry}, "gpt-4"))
+    (True, 0)
+    """
+
+    def __init__(self, data: Union[dict, SQLiteDict], model: str):
+        self._data = data
+        self.model = model
+
+    @property
+    def key_version(self) -> int:
+        """The key format of the underlying data, so lookups use the same keys."""
+        return getattr(self._data, "key_version", 1)
+
+    def __repr__(self) -> str:
+        return f"CacheView(model={self.model!r}, data={type(self._data).__name__})"
+
+    def __getitem__(self, key: str) -> "CacheEntry":
+        entry = self._data.get(key)
+        if entry is None or entry.model != self.model:
+            raise KeyError(key)
+        return entry
+
+    def __iter__(self) -> Iterator[str]:
+        if isinstance(self._data, SQLiteDict):
+            return self._data.keys_for_model(self.model)
+        return (key for key, entry in self._data.items() if entry.model == self.model)
+
+    def __len__(self) -> int:
+        if isinstance(self._data, SQLiteDict):
+            return self._data.count(self.model)
+        return sum(1 for _ in self)
+
+    def items(self) -> Iterator[Tuple[str, "CacheEntry"]]:
+        if isinstance(self._data, SQLiteDict):
+            return self._data.items(model=self.model)
+        return (
+            (key, entry) for key, entry in self._data.items() if entry.model == self.model
+        )
+
+    def values(self) -> Iterator["CacheEntry"]:
+        return (entry for _, entry in self.items())
+
+    def _read_only(self, *args, **kwargs) -> None:
+        from .exceptions import CacheError
+
+        raise CacheError("Cache views are read-only.")
+
+    __setitem__ = __delitem__ = update = _read_only
+
+
+if __name__ == "__main__":
+    import doctest
+
+    doctest.testmod(optionflags=doctest.ELLIPSIS)
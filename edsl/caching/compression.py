@@ -0,0 +1,182 @@
+"""
+Compression of cache entries stored in SQLite.
+
+Cache entries are JSON documents dominated by prompt text, and most of that text
+(system prompts, instructions, parameters) repeats from one entry to the next. An
+EntryCodec compresses each serialized entry on its own, so entries can still be read
+one at a time, optionally with a dictionary trained on existing entries that holds
+the shared text. With a dictionary, even short entries compress well, because the
+text they share with other entries does not have to be stored again.
+
+Compressed values start with a one-byte tag naming the method, so a database can
+hold a mix of plain JSON text (older entries) and compressed entries, and any of
+them can be read back.
+
+zlib is always available. zstd needs the optional ``zstandard`` package.
+"""
+
+from __future__ import annotations
+
+import json
+import zlib
+from collections import Counter
+from typing import Iterable, Optional
+
+COMPRESSION_METHODS = ("zlib", "zstd")
+
+_ZLIB = b"\x01"
+_ZLIB_DICT = b"\x02"
+_ZSTD = b"\x03"
+_ZSTD_DICT = b"\x04"
+
+# zlib only uses the last 32 KB of a preset dictionary
+ZLIB_MAX_DICTIONARY_SIZE = 32 * 1024
+
+
+def _zstandard():
+    try:
+        import zstandard
+    except ImportError as e:
+        raise ImportError(
+            "zstandard is required to use zstd compression for the cache. Install it with: pip install zstandard"
+        ) from e
+    return zstandard
+
+
+class EntryCodec:
+    """
+    Compresses and decompresses serialized cache entries.
+
+    Args:
+        method: "zlib" or "zstd", used to compress. Any supported method can be
+            decompressed.
+        dictionary: Optional dictionary shared by the entries of a cache, from
+            `train_dictionary`.
+        level: Compression level.
+
+    >>> codec = EntryCodec("zlib")
+    >>> value = codec.encode('{"system_prompt": "You are a helpful agent."}')
+    >>> value[:1], codec.decode(value)
+    (b'\\x01', '{"system_prompt": "You are a helpful agent."}')
+    """
+
+    def __init__(self, method: str = "zlib", dictionary: Optional[bytes] = None, level: int = 6):
+        if method not in COMPRESSION_METHODS:
+            from .exceptions import CacheValueError
+
+            raise CacheValueError(
+                f"Unknown compression method {method!r}; choose one of {COMPRESSION_METHODS}."
+            )
+        self.method = method
+        self.dictionary = dictionary
+        self.level = level
+        self._zstd_compressor = None
+        self._zstd_decompressor = None
+
+    def __repr__(self) -> str:
+        size = len(self.dictionary) if self.dictionary else 0
+        return f"EntryCodec(method={self.method!r}, dictionary_size={size})"
+
+    def _zstd(self):
+        if self._zstd_compressor is None:
+            zstandard = _zstandard()
+            dictionary = (
+                zstandard.ZstdCompressionDict(self.dictionary)
+                if self.dictionary
+                else None
+            )
+            self._zstd_compressor = zstandard.ZstdCompressor(level=self.level, dict_data=dictionary)
+            self._zstd_decompressor = zstandard.ZstdDecompressor(dict_data=dictionary)
+        return self._zstd_compressor, self._zstd_decompressor
+
+    def encode(self, value: str) -> bytes:
+        """Compress a serialized entry."""
+        data = value.encode()
+        if self.method == "zstd":
+            tag = _ZSTD_DICT if self.dictionary else _ZSTD
+            return tag + self._zstd()[0].compress(data)
+        if self.dictionary:
+            compressor = zlib.compressobj(self.level, zdict=self.dictionary)
+            return _ZLIB_DICT + compressor.compress(data) + compressor.flush()
+        return _ZLIB + zlib.compress(data, self.level)
+
+    def decode(self, value: bytes) -> str:
+        """Decompress a value written by `encode`, whatever method it was written with.
+
+        Raises:
+            CacheValueError: If the value is not a compressed entry, or needs a
+                dictionary this codec does not have
+        """
+        from .exceptions import CacheValueError
+
+        tag, data = value[:1], value[1:]
+        if tag in (_ZLIB_DICT, _ZSTD_DICT) and not self.dictionary:
+            raise CacheValueError("The cache entry was compressed with a dictionary that is missing.")
+        try:
+            if tag == _ZLIB:
+                return zlib.decompress(data).decode()
+            if tag == _ZLIB_DICT:
+                decompressor = zlib.decompressobj(zdict=self.dictionary)
+                return (decompressor.decompress(data) + decompressor.flush()).decode()
+        except zlib.error as e:
+            raise CacheValueError(f"The cache entry could not be decompressed: {e}") from e
+        if tag in (_ZSTD, _ZSTD_DICT):
+            zstandard = _zstandard()
+            try:
+                if tag == _ZSTD and self.dictionary:
+                    return zstandard.ZstdDecompressor().decompress(data).decode()
+                return self._zstd()[1].decompress(data).decode()
+            except zstandard.ZstdError as e:
+                raise CacheValueError(f"The cache entry could not be decompressed: {e}") from e
+        raise CacheValueError(f"Unknown cache entry compression tag {tag!r}.")
+
+
+def train_dictionary(
+    samples: Iterable[str], method: str = "zlib", size: int = ZLIB_MAX_DICTIONARY_SIZE
+) -> bytes:
+    """
+    Build a compression dictionary from serialized entries.
+
+    For zstd, zstandard's dictionary trainer is used. For zlib, the dictionary is
+    made of the field values that repeat across the samples (system prompts,
+    parameters, models), most frequent last, since zlib finds matches near the
+    end of the dictionary most cheaply.
+
+    >>> from edsl.caching import CacheEntry
+    >>> samples = [json.dumps(CacheEntry.example(randomize=True).to_dict()) for _ in range(5)]
+    >>> dictionary = train_dictionary(samples)
+    >>> codec, plain = EntryCodec("zlib", dictionary), EntryCodec("zlib")
+    >>> len(codec.encode(samples[0])) < len(plain.encode(samples[0]))
+    True
+    """
+    samples = list(samples)
+    if method == "zstd":
+        zstandard = _zstandard()
+        return zstandard.train_dictionary(size, [s.encode() for s in samples]).as_bytes()
+
+    size = min(size, ZLIB_MAX_DICTIONARY_SIZE)
+    counts: Counter = Counter()
+    for sample in samples:
+        entry = json.loads(sample)
+        counts[json.dumps({k: None for k in entry})] += 1
+        for field, value in entry.items():
+            if field in ("timestamp", "output"):
+                continue
+            counts[json.dumps(value)] += 1
+    pieces = []
+    total = 0
+    for text, count in counts.most_common():
+        if count < 2 and len(samples) > 1:
+            break
+        piece = text.encode()
+        if total + len(piece) > size:
+            continue
+        pieces.append(piece)
+        total += len(piece)
+    return b"".join(reversed(pieces))
+
+
+if __name__ == "__main__":
+    import doctest
+
+    doctest.testmod(optionflags=doctest.ELLIPSIS)
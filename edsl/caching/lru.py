@@ -0,0 +1,123 @@
+"""
+A bounded, in-memory tier of decoded cache entries.
+
+Reading an entry from a SQLiteDict means a database query and a JSON decode.
+An LRUEntryCache keeps the most recently used CacheEntry objects in memory, so that
+entries read or written again (reruns of a survey, the same prompts across
+interviews) are served without touching the database. It is bounded by a number of
+entries, a number of bytes (measured as the size of the serialized entries), or
+both; the least recently used entries are evicted first.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .cache_entry import CacheEntry
+
+
+class LRUEntryCache:
+    """
+    Least-recently-used store of CacheEntry objects with hit, miss and eviction counters.
+
+    Args:
+        max_entries: Maximum number of entries held, or None for no limit on the count.
+        max_bytes: Maximum total serialized size of the entries held, or None for no
+            limit on the size.
+
+    >>> from edsl.caching import CacheEntry
+    >>> lru = LRUEntryCache(max_entries=2)
+    >>> lru.put("a", CacheEntry.example(), 100)
+    >>> lru.put("b", CacheEntry.example(), 100)
+    >>> lru.get("a") == CacheEntry.example()
+    True
+    >>> lru.put("c", CacheEntry.example(), 100)
+    >>> lru.get("b") is None
+    True
+    >>> lru.stats()
+    {'entries': 2, 'bytes': 200, 'hits': 1, 'misses': 1, 'evictions': 1}
+    """
+
+    def __init__(self, max_entries: Optional[int] = None, max_bytes: Optional[int] = None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bytes = 0
+        self._entries: "OrderedDict[str, Tuple[CacheEntry, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return (
+            f"LRUEntryCache(max_entries={self.max_entries}, max_bytes={self.max_bytes})"
+        )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def get(self, key: str) -> Optional["CacheEntry"]:
+        """Return the entry for `key`, marking it most recently used, or None."""
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return item[0]
+
+    def put(self, key: str, entry: "CacheEntry", size: int) -> None:
+        """Add or replace the entry for `key`, evicting old entries to stay in bounds.
+
+        Args:
+            size: Size of the serialized entry, in bytes.
+        """
+        with self._lock:
+            if key in self._entries:
+                self.bytes -= self._entries.pop(key)[1]
+            if self.max_bytes is not None and size > self.max_bytes:
+                return
+            self._entries[key] = (entry, size)
+            self.bytes += size
+            while (
+                self.max_entries is not None and len(self._entries) > self.max_entries
+            ) or (self.max_bytes is not None and self.bytes > self.max_bytes):
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.bytes -= evicted_size
+                self.evictions += 1
+
+    def discard(self, key: str) -> None:
+        """Remove the entry for `key`, if held."""
+        with self._lock:
+            item = self._entries.pop(key, None)
+            if item is not None:
+                self.bytes -= item[1]
+
+    def clear(self) -> None:
+        """Remove every entry. The counters are kept."""
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Return the number and size of the entries held, and the hit, miss and eviction counts."""
+        return {
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+if __name__ == "__main__":
+    import doctest
+
+    doctest.testmod(optionflags=doctest.ELLIPSIS)
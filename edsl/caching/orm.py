@@ -6,7 +6,7 @@ in a SQL database. It provides a simple key-value schema that allows
 for efficient storage and retrieval of cached data.
 """
 
-from sqlalchemy import Column, String
+from sqlalchemy import Column, Float, String
 from sqlalchemy.ext.declarative import declarative_base
 
 Base = declarative_base()
@@ -24,7 +24,31 @@ class Data(Base):
         __tablename__ (str): Name of the database table ("data")
         key (Column): Primary key column for storing lookup keys
         value (Column): Column for storing serialized data values
+        model (Column): Indexed column holding the model of the entry, so that
+            the entries of one model can be queried without reading the others
+        timestamp (Column): Indexed column holding the creation time of the entry,
+            so that entries can be read from newest to oldest
     """
     __tablename__ = "data"
     key = Column(String, primary_key=True)
     value = Column(String)
+    model = Column(String, index=True)
+    timestamp = Column(Float, index=True)
+
+
+class Meta(Base):
+    """
+    SQLAlchemy ORM model for metadata about a cache database.
+
+    Holds a few key-value rows, such as the schema version of the ``data``
+    table, so that a database can be checked when it is opened without
+    reading its entries.
+
+    Attributes:
+        __tablename__ (str): Name of the database table ("meta")
+        key (Column): Primary key column holding the name of the setting
+        value (Column): Column holding the value of the setting
+    """
+    __tablename__ = "meta"
+    key = Column(String, primary_key=True)
+    value = Column(String)
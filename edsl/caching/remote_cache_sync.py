@@ -59,6 +59,10 @@ class RemoteCacheSync(AbstractContextManager):
     Handles bidirectional synchronization:
     - Downloads missing entries from remote to local cache
     - Uploads new local entries to remote cache
+
+    With a `sync_server` (see cache_digest), the caches are compared by digests
+    of key ranges, so only the keys of the ranges that differ are exchanged.
+    Otherwise every local key is sent to Coop.
     """
 
     def __init__(
@@ -68,6 +72,7 @@ class RemoteCacheSync(AbstractContextManager):
         output_func: Callable,
         remote_cache: bool = True,
         remote_cache_description: str = "",
+        sync_server=None,
     ):
         """
         Initializes a RemoteCacheSync object.
@@ -77,6 +82,7 @@ class RemoteCacheSync(AbstractContextManager):
         :param output_func: Function for outputting messages
         :param remote_cache: Whether to enable remote cache synchronization
         :param remote_cache_description: Description for remote cache entries
+        :param sync_server: Server implementing the digest sync protocol, used instead of Coop
 
         """
         self.coop = coop
@@ -84,12 +90,20 @@ class RemoteCacheSync(AbstractContextManager):
         self._output = output_func
         self.remote_cache_enabled = remote_cache
         self.remote_cache_description = remote_cache_description
-        self.initial_cache_keys = []
+        self.sync_server = sync_server
+        self.initial_cache_keys = set()
 
     def __enter__(self) -> "RemoteCacheSync":
+        if self.remote_cache_enabled and self.cache.key_version != 1:
+            # The remote cache is keyed with version-1 keys
+            self._output(
+                f"Remote cache sync skipped: the local cache uses key version "
+                f"{self.cache.key_version}, and the remote cache uses version 1."
+            )
+            self.remote_cache_enabled = False
         if self.remote_cache_enabled:
             self._sync_from_remote()
-            self.initial_cache_keys = list(self.cache.keys())
+            self.initial_cache_keys = set(self.cache.keys())
         return self
 
     def __exit__(self, exc_type, exc_value, traceback):
@@ -99,7 +113,12 @@ class RemoteCacheSync(AbstractContextManager):
 
     def _get_cache_difference(self) -> CacheDifference:
         """Retrieves differences between local and remote caches."""
-        diff = self.coop.legacy_remote_cache_get_diff(self.cache.keys())
+        if self.sync_server is not None:
+            from .cache_digest import KeyDigestIndex, digest_difference
+
+            diff = digest_difference(KeyDigestIndex(self.cache.keys()), self.sync_server)
+        else:
+            diff = self.coop.legacy_remote_cache_get_diff(self.cache.keys())
         return CacheDifference(
             client_missing_entries=diff.get("client_missing_cacheentries", []),
             server_missing_keys=diff.get("server_missing_cacheentry_keys", []),
@@ -135,13 +154,14 @@ class RemoteCacheSync(AbstractContextManager):
             ]
         )
 
-        # Get newly added entries since sync started
+        # Get newly added entries since sync started, except those already listed
+        new_keys = (
+            set(self.cache.keys())
+            - self.initial_cache_keys
+            - set(diff.server_missing_keys)
+        )
         new_entries = CacheEntriesList(
-            [
-                entry
-                for entry in self.cache.values()
-                if entry.key not in self.initial_cache_keys
-            ]
+            [entry for key in new_keys if (entry := self.cache.data.get(key)) is not None]
         )
 
         return server_missing_entries + new_entries
@@ -152,7 +172,9 @@ class RemoteCacheSync(AbstractContextManager):
         entries_to_upload: CacheEntriesList = self._get_entries_to_upload(diff)
         upload_count = len(entries_to_upload)
 
-        if upload_count > 0:
+        if upload_count > 0 and self.sync_server is not None:
+            self.sync_server.cache_create_many(list(entries_to_upload))
+        elif upload_count > 0:
             pass
             # self._output(
             #     f"Updating remote cache with {upload_count:,} new "
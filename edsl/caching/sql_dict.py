@@ -8,8 +8,9 @@ making it a drop-in replacement for regular dictionaries but with database persi
 """
 
 from __future__ import annotations
+import itertools
 import json
-from typing import Any, Generator, Optional, Union, Dict, TypeVar
+from typing import Any, Generator, Iterable, Optional, Union, Dict, TypeVar
 
 from ..config import CONFIG
 from .cache_entry import CacheEntry
@@ -31,10 +32,25 @@ class SQLiteDict:
     program invocations, with keys being the hash of the cache entry's content and
     values being the CacheEntry objects themselves.
     
+    Opening a database takes the same time whatever its size: instead of reading
+    every entry, the schema version recorded in its ``meta`` table is checked, and
+    each entry is validated when it is read.
+    
+    Optionally, an LRUEntryCache of decoded entries sits in front of the database,
+    so that entries used again are returned without a query.
+    
+    The model of each entry is stored in an indexed column, so that the entries of
+    one model (see `items`, `count` and CacheView) are queried without reading the rest.
+    So is its timestamp, so that entries are read by age (see `sizes_newest_first`).
+    
     Attributes:
         db_path (str): Path to the SQLite database file
         engine: SQLAlchemy engine instance for database access
         Session: SQLAlchemy sessionmaker for creating database sessions
+        SCHEMA_VERSION (int): Version of the ``data`` table layout written by this class
+        key_version (int): Format of the keys in the database (see CacheEntry.gen_key);
+            databases use version 1 until they are migrated with `migrate_keys`
+        memory (LRUEntryCache, optional): In-memory tier of recently used entries
         
     Example:
         >>> temp_db_path = SQLiteDict._get_temp_path()
@@ -47,7 +63,15 @@ class SQLiteDict:
         >>> import os; os.unlink(temp_db_path)  # Clean up temp file
     """
 
-    def __init__(self, db_path: Optional[str] = None):
+    SCHEMA_VERSION = 3
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        max_unwritten_entries: int = 0,
+        memory_entries: int = 0,
+        memory_bytes: Optional[int] = None,
+    ):
         """
         Initializes a SQLiteDict with the specified database path.
         
@@ -58,9 +82,19 @@ class SQLiteDict:
         Args:
             db_path: Path to the SQLite database file. If None, uses the path
                     from CONFIG.get("EDSL_DATABASE_PATH")
+            max_unwritten_entries: If greater than 0, new entries are written in
+                    batches by a background WriteBehindWriter, and at most this
+                    many entries are held in memory before being written. If 0
+                    (default), every entry is written when it is set. In-memory
+                    databases are always written directly.
+            memory_entries: If greater than 0, the most recently used entries, up to
+                    this many, are kept decoded in memory (default: 0, no memory tier)
+            memory_bytes: If given, the entries kept in memory are also limited to
+                    this many bytes of serialized data
                     
         Raises:
             Exception: If there is an error initializing the database connection
+            CacheError: If the database was written with a newer schema version
             
         Example:
             >>> temp_db_path = SQLiteDict._get_temp_path()
@@ -82,12 +116,357 @@ class SQLiteDict:
             self.engine = create_engine(self.db_path, echo=False, future=True)
             Base.metadata.create_all(self.engine)
             self.Session = sessionmaker(bind=self.engine)
+            self._check_schema()
         except SQLAlchemyError as e:
             from .exceptions import CacheError
             raise CacheError(
                 f"""Database initialization error: {e}. The attempted DB path was {db_path}"""
             ) from e
 
+        self._writer = None
+        file_path = self.db_path[len("sqlite:///"):]
+        if max_unwritten_entries > 0 and file_path not in ("", ":memory:"):
+            from .write_behind import WriteBehindWriter
+
+            self._writer = WriteBehindWriter(file_path, max_pending=max_unwritten_entries)
+
+        self.memory = None
+        if memory_entries > 0 or memory_bytes is not None:
+            from .lru import LRUEntryCache
+
+            self.memory = LRUEntryCache(
+                max_entries=memory_entries or None, max_bytes=memory_bytes
+            )
+
+    def _check_schema(self) -> None:
+        """
+        Checks the schema and key versions recorded in the database.
+
+        Databases written before the schema version was recorded hold the same
+        layout as version 1. Databases older than the current version are upgraded
+        (see `_upgrade_schema`).
+
+        >>> d = SQLiteDict.example()
+        >>> d.schema_version, d.key_version
+        (3, 1)
+        """
+        from .exceptions import CacheError
+        from .orm import Meta
+
+        with self.Session() as db:
+            row = db.get(Meta, "schema_version")
+            version = int(row.value) if row is not None else 1
+        if version > self.SCHEMA_VERSION:
+            raise CacheError(
+                f"The cache at {self.db_path} has schema version {version}, but this "
+                f"version of edsl reads up to version {self.SCHEMA_VERSION}. Please upgrade edsl."
+            )
+        if row is None or version < self.SCHEMA_VERSION:
+            self._upgrade_schema()
+        with self.Session() as db:
+            row = db.get(Meta, "key_version")
+            self.key_version = int(row.value) if row is not None else 1
+            self._load_codec(db)
+        if self.key_version not in CacheEntry.KEY_VERSIONS:
+            raise CacheError(
+                f"The cache at {self.db_path} uses key version {self.key_version}, which "
+                f"this version of edsl does not support. Please upgrade edsl."
+            )
+
+    def _upgrade_schema(self) -> None:
+        """
+        Brings the ``data`` table up to the current schema version.
+
+        Version 2 adds the indexed ``model`` column, and version 3 the indexed
+        ``timestamp`` column. Existing rows are left without them, and are indexed
+        the first time entries are queried by model or by age (see
+        `_index_columns`), so that opening an old database stays fast.
+        """
+        from sqlalchemy import text
+
+        with self.engine.begin() as conn:
+            columns = [row[1] for row in conn.execute(text("PRAGMA table_info(data)"))]
+            if "model" not in columns:
+                conn.execute(text("ALTER TABLE data ADD COLUMN model VARCHAR"))
+            if "timestamp" not in columns:
+                conn.execute(text("ALTER TABLE data ADD COLUMN timestamp FLOAT"))
+            conn.execute(text("CREATE INDEX IF NOT EXISTS ix_data_model ON data (model)"))
+            conn.execute(
+                text("CREATE INDEX IF NOT EXISTS ix_data_timestamp ON data (timestamp)")
+            )
+            conn.execute(
+                text("INSERT OR REPLACE INTO meta (key, value) VALUES ('schema_version', :value)"),
+                {"value": str(self.SCHEMA_VERSION)},
+            )
+
+    def _index_columns(self, batch_size: int = 1000) -> int:
+        """
+        Fills in the ``model`` and ``timestamp`` columns of rows written without them.
+
+        Such rows come from databases written before schema version 3, or by older
+        versions of edsl. Rows that cannot be decoded are left as they are.
+
+        Returns:
+            The number of rows indexed
+        """
+        from sqlalchemy import text
+        from .exceptions import CacheError
+
+        indexed, last_key = 0, ""
+        with self.engine.begin() as conn:
+            while batch := conn.execute(
+                text(
+                    "SELECT key, value FROM data "
+                    "WHERE (model IS NULL OR timestamp IS NULL) AND key > :last "
+                    "ORDER BY key LIMIT :n"
+                ),
+                {"last": last_key, "n": batch_size},
+            ).fetchall():
+                last_key = batch[-1][0]
+                updates = []
+                for key, value in batch:
+                    try:
+                        entry = self._decode(key, value)
+                    except CacheError:
+                        continue
+                    updates.append(
+                        {"key": key, "model": entry.model, "timestamp": entry.timestamp}
+                    )
+                if updates:
+                    conn.execute(
+                        text(
+                            "UPDATE data SET model = :model, timestamp = :timestamp "
+                            "WHERE key = :key"
+                        ),
+                        updates,
+                    )
+                indexed += len(updates)
+        return indexed
+
+    def _rewrite_rows(self, transform, meta: Dict[str, str], batch_size: int) -> int:
+        """
+        Copies every row through `transform` into a new table that replaces ``data``.
+
+        The rows are copied in batches, without loading the whole database into
+        memory, and the new table replaces the old one in the same transaction as
+        the `meta` updates, so an interrupted rewrite leaves the database unchanged.
+
+        Args:
+            transform: Function of (key, stored value) returning the new (key, stored value)
+            meta: Settings to record in the ``meta`` table
+            batch_size: Number of entries read and written at a time
+
+        Returns:
+            The number of entries rewritten
+        """
+        from sqlalchemy import text
+
+        self.flush()
+        if self.memory is not None:
+            self.memory.clear()
+        rewritten = 0
+        with self.engine.begin() as conn:
+            conn.execute(text("DROP TABLE IF EXISTS data_migrated"))
+            conn.execute(
+                text(
+                    "CREATE TABLE data_migrated "
+                    "(key VARCHAR NOT NULL, value VARCHAR, model VARCHAR, "
+                    "timestamp FLOAT, PRIMARY KEY (key))"
+                )
+            )
+            rows = conn.execute(text("SELECT key, value, model, timestamp FROM data"))
+            while batch := rows.fetchmany(batch_size):
+                conn.execute(
+                    text(
+                        "INSERT OR REPLACE INTO data_migrated (key, value, model, timestamp) "
+                        "VALUES (:key, :value, :model, :timestamp)"
+                    ),
+                    [
+                        dict(
+                            zip(("key", "value"), transform(key, value)),
+                            model=model,
+                            timestamp=timestamp,
+                        )
+                        for key, value, model, timestamp in batch
+                    ],
+                )
+                rewritten += len(batch)
+            conn.execute(text("DROP TABLE data"))
+            conn.execute(text("ALTER TABLE data_migrated RENAME TO data"))
+            conn.execute(text("CREATE INDEX ix_data_model ON data (model)"))
+            conn.execute(text("CREATE INDEX ix_data_timestamp ON data (timestamp)"))
+            for name, value in meta.items():
+                conn.execute(
+                    text("INSERT OR REPLACE INTO meta (key, value) VALUES (:key, :value)"),
+                    {"key": name, "value": value},
+                )
+        return rewritten
+
+    def migrate_keys(self, key_version: int, batch_size: int = 1000) -> int:
+        """
+        Rewrites every entry under its key in another key format.
+
+        The migration happens in one transaction, so an interrupted migration
+        leaves the database unchanged.
+
+        Args:
+            key_version: The key format to migrate to, one of CacheEntry.KEY_VERSIONS
+            batch_size: Number of entries read and written at a time
+
+        Returns:
+            The number of entries migrated
+
+        >>> d = SQLiteDict.example()
+        >>> d[CacheEntry.example().key] = CacheEntry.example()
+        >>> d.migrate_keys(2)
+        1
+        >>> d.key_version, list(d.keys()) == [CacheEntry.example().versioned_key(2)]
+        (2, True)
+        """
+        if key_version not in CacheEntry.KEY_VERSIONS:
+            from .exceptions import CacheError
+            raise CacheError(
+                f"Unknown cache key version {key_version}; supported versions are {CacheEntry.KEY_VERSIONS}."
+            )
+        migrated = self._rewrite_rows(
+            lambda key, value: (self._decode(key, value).versioned_key(key_version), value),
+            {"key_version": str(key_version)},
+            batch_size,
+        )
+        self.key_version = key_version
+        return migrated
+
+    def compress(
+        self,
+        method: Optional[str] = "zlib",
+        dictionary: bool = False,
+        sample_size: int = 1000,
+        batch_size: int = 1000,
+    ) -> tuple[int, int]:
+        """
+        Rewrites every entry compressed with `method`, and compacts the file.
+
+        The method (and dictionary) are recorded in the database, so entries
+        written later are compressed the same way. Entries are decompressed
+        transparently when read.
+
+        Other SQLiteDicts already open on the same file keep the settings they
+        read when they were opened. They pick up the new ones the first time an
+        entry fails to decompress, so they can still read every entry, but until
+        then they write new entries with the old settings. If the file is
+        compressed with a new dictionary while others are writing to it, reopen
+        them.
+
+        Args:
+            method: "zlib", "zstd" (needs the zstandard package), or None to store
+                entries as plain JSON again
+            dictionary: Whether to train a dictionary on a sample of the entries
+                and compress every entry with it
+            sample_size: Number of entries the dictionary is trained on
+            batch_size: Number of entries read and written at a time
+
+        Returns:
+            The size of the database file in bytes before and after compression
+
+        >>> d = SQLiteDict.example()
+        >>> d["foo"] = CacheEntry.example()
+        >>> _ = d.compress("zlib", dictionary=True)
+        >>> d.compression, d["foo"] == CacheEntry.example()
+        ('zlib', True)
+        """
+        import base64
+        from sqlalchemy import text
+        from .compression import EntryCodec, train_dictionary
+
+        self.flush()
+        before = self.file_size()
+        trained = None
+        if method is not None and dictionary:
+            with self.engine.connect() as conn:
+                rows = conn.execute(
+                    text("SELECT key, value FROM data ORDER BY RANDOM() LIMIT :n"),
+                    {"n": sample_size},
+                ).fetchall()
+            trained = train_dictionary(
+                [self._value_json(key, value) for key, value in rows], method
+            ) or None
+        codec = EntryCodec(method, trained) if method is not None else None
+        self._rewrite_rows(
+            lambda key, value: (key, self._encode(self._value_json(key, value), codec)),
+            {
+                "compression": method or "",
+                "compression_dictionary": base64.b64encode(trained).decode() if trained else "",
+            },
+            batch_size,
+        )
+        self._codec = codec
+        return before, self.vacuum()[1]
+
+    @property
+    def compression(self) -> Optional[str]:
+        """The method new entries are compressed with, or None if they are stored as JSON."""
+        return self._codec.method if self._codec is not None else None
+
+    def _load_codec(self, db) -> None:
+        """Sets up compression from the settings recorded in the ``meta`` table."""
+        import base64
+        from .compression import EntryCodec
+        from .orm import Meta
+
+        method = db.get(Meta, "compression")
+        dictionary = db.get(Meta, "compression_dictionary")
+        dictionary = base64.b64decode(dictionary.value) if dictionary and dictionary.value else None
+        self._codec = EntryCodec(method.value, dictionary) if method and method.value else None
+
+    @staticmethod
+    def _encode(value_json: str, codec=None) -> Union[str, bytes]:
+        """Returns a serialized entry as stored: compressed bytes with a codec, JSON text otherwise."""
+        return codec.encode(value_json) if codec is not None else value_json
+
+    def _value_json(self, key: str, value: Union[str, bytes]) -> str:
+        """Returns the JSON text of a stored value, decompressing it if needed."""
+        if isinstance(value, str):
+            return value
+        from .compression import EntryCodec
+        from .exceptions import CacheValueError
+
+        codec = self._codec or EntryCodec()
+        try:
+            return codec.decode(value)
+        except CacheValueError:
+            # Another SQLiteDict may have compressed the file since this one read
+            # the settings, so read them again before giving up on the entry
+            with self.Session() as db:
+                self._load_codec(db)
+            reloaded = self._codec or EntryCodec()
+            if (reloaded.method, reloaded.dictionary) == (codec.method, codec.dictionary):
+                raise
+            return reloaded.decode(value)
+
+    @property
+    def schema_version(self) -> int:
+        """The schema version recorded in the database."""
+        from .orm import Meta
+
+        with self.Session() as db:
+            return int(db.get(Meta, "schema_version").value)
+
+    def _decode(self, key: str, value: Union[str, bytes]) -> CacheEntry:
+        """
+        Deserializes a stored value, checking that it is a valid CacheEntry.
+
+        Raises:
+            CacheValueError: If the stored value is not a serialized CacheEntry
+        """
+        from .exceptions import CacheError, CacheValueError
+
+        try:
+            return CacheEntry.from_dict(json.loads(self._value_json(key, value)))
+        except (ValueError, TypeError, KeyError, AttributeError, CacheError) as e:
+            raise CacheValueError(
+                f"The cache entry for key '{key}' is not a valid CacheEntry: {e}"
+            ) from e
+
     @classmethod
     def _get_temp_path(cls) -> str:
         """
@@ -126,10 +505,18 @@ class SQLiteDict:
         if not isinstance(value, CacheEntry):
             from .exceptions import CacheValueError
             raise CacheValueError(f"Value must be a CacheEntry object (got {type(value)}).")
+        stored = self._encode(json.dumps(value.to_dict()), self._codec)
+        if self.memory is not None:
+            self.memory.put(key, value, len(stored))
+        if self._writer is not None:
+            self._writer.put(key, stored, value.model, value.timestamp)
+            return
         with self.Session() as db:
             from .orm import Data
 
-            db.merge(Data(key=key, value=json.dumps(value.to_dict())))
+            db.merge(
+                Data(key=key, value=stored, model=value.model, timestamp=value.timestamp)
+            )
             db.commit()
 
     def __getitem__(self, key: str) -> CacheEntry:
@@ -154,15 +541,34 @@ class SQLiteDict:
             >>> d["foo"] = CacheEntry.example()
             >>> d["foo"] == CacheEntry.example()
             True
+
+            With a memory tier, entries used again are returned from memory:
+
+            >>> d = SQLiteDict("sqlite:///:memory:", memory_entries=10)
+            >>> d["foo"] = CacheEntry.example()
+            >>> d["foo"] == CacheEntry.example()
+            True
+            >>> d.memory.stats()["hits"]
+            1
         """
-        with self.Session() as db:
-            from .orm import Data
+        if self.memory is not None:
+            entry = self.memory.get(key)
+            if entry is not None:
+                return entry
+        value = self._writer.get(key) if self._writer is not None else None
+        if value is None:
+            with self.Session() as db:
+                from .orm import Data
 
-            value = db.query(Data).filter_by(key=key).first()
-            if not value:
-                from .exceptions import CacheKeyError
-                raise CacheKeyError(f"Key '{key}' not found.")
-            return CacheEntry.from_dict(json.loads(value.value))
+                row = db.query(Data).filter_by(key=key).first()
+                if not row:
+                    from .exceptions import CacheKeyError
+                    raise CacheKeyError(f"Key '{key}' not found.")
+                value = row.value
+        entry = self._decode(key, value)
+        if self.memory is not None:
+            self.memory.put(key, entry, len(value))
+        return entry
 
     def get(self, key: str, default: Optional[Any] = None) -> Union[CacheEntry, Any]:
         """
@@ -241,43 +647,156 @@ class SQLiteDict:
             raise CacheValueError(
                 f"new_d must be a dict or SQLiteDict object (got {type(new_d)})"
             )
-        current_batch = 0
+        self.flush()
+        self.insert_many(new_d.items(), overwrite=overwrite, batch_size=max_batch_size)
+
+    def insert_many(
+        self,
+        items: Iterable[tuple[str, CacheEntry]],
+        overwrite: bool = False,
+        batch_size: int = 1000,
+    ) -> int:
+        """
+        Writes (key, entry) pairs from an iterable, one transaction per batch.
+
+        Each batch is written with a single ``executemany`` statement, and only one
+        batch is held in memory at a time, so `items` can be a generator over a
+        file or another database of any size.
+
+        Args:
+            items: The (key, entry) pairs to write
+            overwrite: If True, replaces existing entries; if False, keeps them
+            batch_size: Number of entries written per transaction
+
+        Returns:
+            The number of pairs read from `items`
+
+        >>> d = SQLiteDict.example()
+        >>> d.insert_many((str(i), CacheEntry.example()) for i in range(5))
+        5
+        >>> len(d)
+        5
+        """
+        from sqlalchemy import text
+
+        self.flush()
+        statement = text(
+            f"INSERT OR {'REPLACE' if overwrite else 'IGNORE'} INTO data "
+            "(key, value, model, timestamp) VALUES (:key, :value, :model, :timestamp)"
+        )
+        count = 0
+        items = iter(items)
+        while batch := list(itertools.islice(items, batch_size)):
+            with self.engine.begin() as conn:
+                conn.execute(
+                    statement,
+                    [
+                        {
+                            "key": key,
+                            "value": self._encode(json.dumps(value.to_dict()), self._codec),
+                            "model": value.model,
+                            "timestamp": value.timestamp,
+                        }
+                        for key, value in batch
+                    ],
+                )
+            if self.memory is not None:
+                for key, _ in batch:
+                    self.memory.discard(key)
+            count += len(batch)
+        return count
+
+    def get_many(self, keys: Iterable[str], batch_size: int = 500) -> Dict[str, CacheEntry]:
+        """
+        Returns the entries for the keys that are present, using one query per batch of keys.
+
+        >>> d = SQLiteDict.example()
+        >>> d["foo"] = CacheEntry.example()
+        >>> list(d.get_many(["foo", "bar"]))
+        ['foo']
+        """
+        self.flush()
+        keys = list(keys)
+        found = {}
         with self.Session() as db:
-            for key, value in new_d.items():
-                if current_batch == max_batch_size:
-                    db.commit()
-                    current_batch = 0
-                current_batch += 1
-                # Only merge if key doesn't exist or overwrite is True
-                if (key in self and overwrite) or key not in self:
-                    db.merge(Data(key=key, value=json.dumps(value.to_dict())))
-            db.commit()
+            for start in range(0, len(keys), batch_size):
+                for instance in db.query(Data).filter(
+                    Data.key.in_(keys[start : start + batch_size])
+                ):
+                    found[instance.key] = self._decode(instance.key, instance.value)
+        return found
 
-    def values(self) -> Generator[CacheEntry, None, None]:
+    def values(
+        self, batch_size: int = 1000, model: Optional[str] = None
+    ) -> Generator[CacheEntry, None, None]:
         """
         Returns a generator that yields the values in the cache.
 
+        Rows are read `batch_size` at a time, so the whole database is never held
+        in memory. If `model` is given, only the entries of that model are read,
+        using the index on the model column.
+
         >>> d = SQLiteDict.example()
         >>> d["foo"] = CacheEntry.example()
         >>> list(d.values()) == [CacheEntry.example()]
         True
         """
         with self.Session() as db:
-            for instance in db.query(Data).all():
-                yield CacheEntry.from_dict(json.loads(instance.value))
+            for instance in self._query(db, model).yield_per(batch_size):
+                yield self._decode(instance.key, instance.value)
 
-    def items(self) -> Generator[tuple[str, CacheEntry], None, None]:
+    def items(
+        self, batch_size: int = 1000, model: Optional[str] = None
+    ) -> Generator[tuple[str, CacheEntry], None, None]:
         """
         Returns a generator that yields the items in the cache.
 
+        Rows are read `batch_size` at a time, so the whole database is never held
+        in memory. If `model` is given, only the entries of that model are read,
+        using the index on the model column.
+
         >>> d = SQLiteDict.example()
         >>> d["foo"] = CacheEntry.example()
         >>> list(d.items()) == [("foo", CacheEntry.example())]
         True
         """
         with self.Session() as db:
-            for instance in db.query(Data).all():
-                yield (instance.key, CacheEntry.from_dict(json.loads(instance.value)))
+            for instance in self._query(db, model).yield_per(batch_size):
+                yield (instance.key, self._decode(instance.key, instance.value))
+
+    def _query(self, db, model: Optional[str] = None, *columns):
+        """Returns a query over the rows of `model` (all rows if None), after flushing."""
+        self.flush()
+        query = db.query(*columns) if columns else db.query(Data)
+        if model is None:
+            return query
+        self._index_columns()
+        return query.filter(Data.model == model)
+
+    def keys_for_model(self, model: str, batch_size: int = 1000) -> Generator[str, None, None]:
+        """
+        Returns a generator that yields the keys of the entries of `model`.
+
+        >>> d = SQLiteDict.example()
+        >>> d["foo"] = CacheEntry.example()
+        >>> list(d.keys_for_model("gpt-3.5-turbo")), list(d.keys_for_model("gpt-4"))
+        (['foo'], [])
+        """
+        with self.Session() as db:
+            for (key,) in self._query(db, model, Data.key).yield_per(batch_size):
+                yield key
+
+    def count(self, model: Optional[str] = None) -> int:
+        """
+        Returns the number of entries, or the number of entries of `model`.
+
+        >>> d = SQLiteDict.example()
+        >>> d["foo"] = CacheEntry.example()
+        >>> d.count(), d.count("gpt-3.5-turbo"), d.count("gpt-4")
+        (1, 1, 0)
+        """
+        with self.Session() as db:
+            return self._query(db, model).count()
 
     def to_dict(self):
         """
@@ -300,6 +819,9 @@ class SQLiteDict:
         >>> d.get("foo", "missing")
         'missing'
         """
+        self.flush()
+        if self.memory is not None:
+            self.memory.discard(key)
         with self.Session() as db:
             instance = db.query(Data).filter_by(key=key).one_or_none()
             if instance:
@@ -320,6 +842,10 @@ class SQLiteDict:
         >>> "bar" in d
         False
         """
+        if self.memory is not None and key in self.memory:
+            return True
+        if self._writer is not None and self._writer.get(key) is not None:
+            return True
         with self.Session() as db:
             return db.query(Data).filter_by(key=key).first() is not None
 
@@ -332,9 +858,10 @@ class SQLiteDict:
         >>> list(iter(d)) == ["foo"]
         True
         """
+        self.flush()
         with self.Session() as db:
-            for instance in db.query(Data).all():
-                yield instance.key
+            for (key,) in db.query(Data.key).yield_per(1000):
+                yield key
 
     def __len__(self) -> int:
         """
@@ -347,6 +874,7 @@ class SQLiteDict:
         >>> len(d)
         1
         """
+        self.flush()
         with self.Session() as db:
             return db.query(Data).count()
 
@@ -361,15 +889,127 @@ class SQLiteDict:
         """
         return self.__iter__()
 
+    def entry_metadata(self, batch_size: int = 1000) -> Generator[tuple[str, int, str, int], None, None]:
+        """
+        Yields the key, timestamp, model and stored size in bytes of every entry.
+
+        Rows are read `batch_size` at a time, so the whole database is never held
+        in memory.
+
+        >>> d = SQLiteDict.example()
+        >>> d["foo"] = CacheEntry.example()
+        >>> [(key, model) for key, _, model, _ in d.entry_metadata()]
+        [('foo', 'gpt-3.5-turbo')]
+        """
+        self.flush()
+        with self.Session() as db:
+            for instance in db.query(Data).yield_per(batch_size):
+                entry = self._decode(instance.key, instance.value)
+                yield instance.key, entry.timestamp, entry.model, len(instance.value)
+
+    def sizes_newest_first(
+        self, batch_size: int = 1000
+    ) -> Generator[tuple[str, int], None, None]:
+        """
+        Yields the key and stored size in bytes of every entry, newest first.
+
+        The entries are read in order of the indexed timestamp column, without
+        decoding them.
+
+        >>> d = SQLiteDict.example()
+        >>> old, new = CacheEntry.example(), CacheEntry.example(randomize=True)
+        >>> new.timestamp = old.timestamp + 1
+        >>> d.update({"old": old, "new": new})
+        >>> [key for key, _ in d.sizes_newest_first()]
+        ['new', 'old']
+        """
+        from sqlalchemy import text
+
+        self.flush()
+        self._index_columns()
+        with self.engine.connect() as conn:
+            rows = conn.execute(
+                text("SELECT key, length(value) FROM data ORDER BY timestamp DESC, key")
+            )
+            while batch := rows.fetchmany(batch_size):
+                yield from batch
+
+    def delete_many(self, keys: list[str], batch_size: int = 500) -> int:
+        """
+        Deletes the entries with the given keys, ignoring keys that are not present.
+
+        Returns:
+            The number of entries deleted
+
+        >>> d = SQLiteDict.example()
+        >>> d.update({"foo": CacheEntry.example(), "bar": CacheEntry.example()})
+        >>> d.delete_many(["foo", "baz"]), list(d.keys())
+        (1, ['bar'])
+        """
+        self.flush()
+        deleted = 0
+        with self.Session() as db:
+            for start in range(0, len(keys), batch_size):
+                batch = keys[start : start + batch_size]
+                deleted += (
+                    db.query(Data)
+                    .filter(Data.key.in_(batch))
+                    .delete(synchronize_session=False)
+                )
+                if self.memory is not None:
+                    for key in batch:
+                        self.memory.discard(key)
+            db.commit()
+        return deleted
+
+    def file_size(self) -> int:
+        """Returns the size in bytes of the database file and its write-ahead log (0 for in-memory databases)."""
+        import os
+
+        path = self.db_path[len("sqlite:///"):]
+        return sum(
+            os.path.getsize(p) for p in (path, f"{path}-wal") if os.path.isfile(p)
+        )
+
+    def vacuum(self) -> tuple[int, int]:
+        """
+        Rebuilds the database file to release the space left by deleted entries.
+
+        Returns:
+            The size of the database file in bytes before and after compaction
+        """
+        self.flush()
+        before = self.file_size()
+        with self.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)")
+            conn.exec_driver_sql("VACUUM")
+        return before, self.file_size()
+
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}(db_path={self.db_path!r})"
         
+    def flush(self) -> None:
+        """
+        Writes any entries the background writer still holds to the database.
+
+        >>> d = SQLiteDict(SQLiteDict._get_temp_path(), max_unwritten_entries=100)
+        >>> d["foo"] = CacheEntry.example()
+        >>> d.flush()
+        >>> d._writer.get("foo") is None and "foo" in d
+        True
+        >>> d.close()
+        """
+        if getattr(self, "_writer", None) is not None:
+            self._writer.flush()
+
     def close(self):
         """Close database connections and clean up resources.
         
-        This method properly disposes of the SQLAlchemy engine,
-        closing all connections in the pool to prevent memory leaks.
+        This method writes any unwritten entries, then properly disposes of the
+        SQLAlchemy engine, closing all connections in the pool to prevent memory leaks.
         """
+        if getattr(self, "_writer", None) is not None:
+            self._writer.close()
         if hasattr(self, 'engine') and self.engine:
             self.engine.dispose()
             
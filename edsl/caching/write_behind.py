@@ -0,0 +1,218 @@
+"""
+Batched, background writing of cache entries to SQLite.
+
+Writing each new cache entry in its own transaction means one fsync per model call,
+and the writes happen on the event loop. A WriteBehindWriter instead collects
+entries in memory and writes them from a background thread, many entries per
+transaction (``executemany`` on a connection in WAL mode).
+
+Entries that have been handed to the writer but are not on disk yet are still
+visible through `get`, so readers see their own writes. At most `max_pending`
+entries are held in memory: once that many are waiting, new writes block until
+the background thread has caught up. This bounds how many entries a crash can
+lose. `flush` (called when a job finishes, when a Cache is used as a context
+manager, and at interpreter exit) waits until everything written so far is on disk.
+"""
+
+from __future__ import annotations
+
+import atexit
+import sqlite3
+import threading
+import weakref
+from typing import Dict, Optional, Tuple
+
+_writers: "weakref.WeakSet[WriteBehindWriter]" = weakref.WeakSet()
+
+
+@atexit.register
+def _close_writers() -> None:
+    for writer in list(_writers):
+        writer.close()
+
+
+class WriteBehindWriter:
+    """
+    Writes key/value/model/timestamp rows to the ``data`` table of a SQLite file in batches.
+
+    Args:
+        path: Path of the SQLite file. The ``data`` table must exist.
+        max_pending: Maximum number of entries held in memory before writes block.
+        flush_interval: Seconds the background thread waits for more entries before
+            writing a batch that is not full.
+
+    >>> import os, sqlite3, tempfile
+    >>> path = os.path.join(tempfile.mkdtemp(), "cache.db")
+    >>> with sqlite3.connect(path) as conn:
+    ...     _ = conn.execute("CREATE TABLE data (key TEXT PRIMARY KEY, value TEXT, model TEXT, timestamp REAL)")
+    >>> writer = WriteBehindWriter(path)
+    >>> writer.put("a", "1")
+    >>> writer.get("a")
+    '1'
+    >>> writer.flush()
+    >>> writer.get("a") is None
+    True
+    >>> with sqlite3.connect(path) as conn:
+    ...     conn.execute("SELECT value FROM data WHERE key = 'a'").fetchone()
+    ('1',)
+    >>> writer.close()
+    """
+
+    def __init__(self, path: str, max_pending: int = 1000, flush_interval: float = 0.5):
+        self.path = path
+        self.max_pending = max(1, max_pending)
+        self.flush_interval = flush_interval
+        self.batches_written = 0
+
+        # (value, model, timestamp) by key
+        self._pending: Dict[str, Tuple[str, Optional[str], Optional[float]]] = {}
+        # The batch being written stays readable until it is committed
+        self._writing: Dict[str, Tuple[str, Optional[str], Optional[float]]] = {}
+        # Sequence numbers of the last entry put, written and asked to be flushed
+        self._put_seq = 0
+        self._batch_seq = 0
+        self._written_seq = 0
+        self._flush_seq = 0
+        self._error: Optional[BaseException] = None
+        self._closed = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(
+            target=self._run, name="edsl-cache-writer", daemon=True
+        )
+        self._thread.start()
+        _writers.add(self)
+
+    def __repr__(self) -> str:
+        return (
+            f"WriteBehindWriter(path={self.path!r}, max_pending={self.max_pending}, "
+            f"batches_written={self.batches_written})"
+        )
+
+    def _raise_error(self) -> None:
+        if self._error is not None:
+            from .exceptions import CacheError
+
+            error, self._error = self._error, None
+            raise CacheError(f"Writing cache entries to {self.path} failed: {error}") from error
+
+    def _raise_if_stopped(self) -> None:
+        """Raise if the background thread has stopped, so queued rows would never be written."""
+        if not self._thread.is_alive():
+            from .exceptions import CacheError
+
+            raise CacheError(
+                f"The writer thread for {self.path} has stopped; cache entries queued for it are not written."
+            )
+
+    def put(
+        self,
+        key: str,
+        value: str,
+        model: Optional[str] = None,
+        timestamp: Optional[float] = None,
+    ) -> None:
+        """Queue a row for writing, waiting first if `max_pending` rows are queued."""
+        with self._cond:
+            self._raise_error()
+            if self._closed:
+                from .exceptions import CacheError
+
+                raise CacheError(f"The writer for {self.path} is closed.")
+            self._raise_if_stopped()
+            while (
+                len(self._pending) + len(self._writing) >= self.max_pending
+                and key not in self._pending
+            ):
+                self._cond.notify_all()
+                self._cond.wait()
+                self._raise_error()
+                self._raise_if_stopped()
+            self._pending[key] = (value, model, timestamp)
+            self._put_seq += 1
+            if len(self._pending) == 1 or len(self._pending) >= self.max_pending:
+                self._cond.notify_all()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the value queued for `key`, or None if nothing is waiting to be written."""
+        with self._cond:
+            row = self._pending.get(key) or self._writing.get(key)
+            return row[0] if row is not None else None
+
+    def flush(self) -> None:
+        """Wait until every row queued so far has been written."""
+        with self._cond:
+            self._flush_seq = self._put_seq
+            self._cond.notify_all()
+            while self._written_seq < self._flush_seq and self._thread.is_alive():
+                self._cond.wait()
+            self._raise_error()
+            if not self._closed:
+                self._raise_if_stopped()
+
+    def close(self) -> None:
+        """Write the remaining rows and stop the background thread."""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join()
+        self._raise_error()
+
+    def _next_batch(self) -> Optional[Dict[str, Tuple[str, Optional[str]]]]:
+        """Wait until a batch is due, then take it. Returns None once closed and empty."""
+        with self._cond:
+            while not self._pending and not self._closed:
+                self._cond.wait()
+            if not self._pending:
+                return None
+            if not self._due():
+                # Give concurrent writers a moment to add to the batch
+                self._cond.wait(self.flush_interval)
+            batch, self._pending = self._pending, {}
+            self._writing = batch
+            self._batch_seq = self._put_seq
+            self._cond.notify_all()
+            return batch
+
+    def _due(self) -> bool:
+        return (
+            self._closed
+            or len(self._pending) >= self.max_pending
+            or self._written_seq < self._flush_seq
+        )
+
+    def _run(self) -> None:
+        conn = None
+        try:
+            conn = sqlite3.connect(self.path)
+            conn.execute("PRAGMA journal_mode=WAL")
+            while (batch := self._next_batch()) is not None:
+                try:
+                    with conn:
+                        conn.executemany(
+                            "INSERT OR REPLACE INTO data (key, value, model, timestamp) "
+                            "VALUES (?, ?, ?, ?)",
+                            ((key, *row) for key, row in batch.items()),
+                        )
+                    self.batches_written += 1
+                except Exception as e:
+                    self._error = e
+                with self._cond:
+                    self._writing = {}
+                    self._written_seq = self._batch_seq
+                    self._cond.notify_all()
+        except Exception as e:
+            # The database could not be opened (e.g. it is locked)
+            self._error = e
+        finally:
+            if conn is not None:
+                conn.close()
+            with self._cond:
+                self._cond.notify_all()
+
+
+if __name__ == "__main__":
+    import doctest
+
+    doctest.testmod(optionflags=doctest.ELLIPSIS)
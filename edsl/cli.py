@@ -119,6 +119,151 @@ def generate_html_report(
             console.print(f"[yellow]Could not open browser: {e}[/yellow]")
             console.print(f"[yellow]Report is available at: {report_path}[/yellow]")
 
+# Create the cache app
+cache_app = typer.Typer(help="Manage the local EDSL cache")
+app.add_typer(cache_app, name="cache")
+
+_DURATION_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
+_SIZE_UNITS = {"": 1, "B": 1, "KB": 1024, "MB": 1024**2, "GB": 1024**3, "TB": 1024**4}
+
+
+def _parse_duration(value: str) -> float:
+    """Parse a duration such as '90s', '12h' or '30d' into seconds."""
+    value = value.strip().lower()
+    if value and value[-1] in _DURATION_UNITS:
+        return float(value[:-1]) * _DURATION_UNITS[value[-1]]
+    return float(value)
+
+
+def _parse_size(value: str) -> int:
+    """Parse a size such as '500MB' or '2GB' into bytes."""
+    value = value.strip().upper()
+    number = value.rstrip("KMGTB")
+    return int(float(number) * _SIZE_UNITS[value[len(number):]])
+
+
+def _open_cache(path: Optional[str]):
+    from .caching import Cache
+    from .caching.sql_dict import SQLiteDict
+    from .config import CONFIG
+
+    return Cache(data=SQLiteDict(path or CONFIG.get("EDSL_DATABASE_PATH")))
+
+
+_path_option = typer.Option(
+    None, "--path", "-p", help="Cache database (default: EDSL_DATABASE_PATH)"
+)
+
+
+@cache_app.command("stats")
+def cache_stats(path: Optional[str] = _path_option):
+    """Show the number of entries and file size of the cache."""
+    cache = _open_cache(path)
+    console.print(f"[bold cyan]Cache:[/bold cyan] {cache.data.db_path}")
+    console.print(f"[bold cyan]Entries:[/bold cyan] {len(cache):,}")
+    console.print(f"[bold cyan]File size:[/bold cyan] {cache.data.file_size():,} bytes")
+
+
+@cache_app.command("purge")
+def cache_purge(
+    older_than: Optional[str] = typer.Option(
+        None, "--older-than", help="Delete entries older than this, e.g. 30d or 12h"
+    ),
+    models: Optional[list[str]] = typer.Option(
+        None, "--model", "-m", help="Delete the entries of this model (repeatable)"
+    ),
+    vacuum: bool = typer.Option(True, "--vacuum/--no-vacuum", help="Compact the file afterwards"),
+    path: Optional[str] = _path_option,
+):
+    """Delete expired entries and the entries of retired models."""
+    if older_than is None and not models:
+        console.print("[yellow]Nothing to purge: pass --older-than and/or --model.[/yellow]")
+        raise typer.Exit(code=1)
+    cache = _open_cache(path)
+    deleted = cache.purge(
+        older_than=_parse_duration(older_than) if older_than else None, models=models
+    )
+    console.print(f"[green]Deleted {deleted:,} entries.[/green]")
+    if vacuum and deleted:
+        cache_vacuum(path)
+
+
+@cache_app.command("evict")
+def cache_evict(
+    max_entries: Optional[int] = typer.Option(
+        None, "--max-entries", help="Keep at most this many entries"
+    ),
+    max_size: Optional[str] = typer.Option(
+        None, "--max-size", help="Keep at most this much entry data, e.g. 2GB"
+    ),
+    vacuum: bool = typer.Option(True, "--vacuum/--no-vacuum", help="Compact the file afterwards"),
+    path: Optional[str] = _path_option,
+):
+    """Delete the oldest entries until the cache is within the given size."""
+    if max_entries is None and max_size is None:
+        console.print("[yellow]Nothing to evict: pass --max-entries and/or --max-size.[/yellow]")
+        raise typer.Exit(code=1)
+    cache = _open_cache(path)
+    deleted = cache.evict(
+        max_entries=max_entries,
+        max_bytes=_parse_size(max_size) if max_size else None,
+    )
+    console.print(f"[green]Deleted {deleted:,} entries.[/green]")
+    if vacuum and deleted:
+        cache_vacuum(path)
+
+
+@cache_app.command("vacuum")
+def cache_vacuum(path: Optional[str] = _path_option):
+    """Compact the cache file to release the space of deleted entries."""
+    before, after = _open_cache(path).vacuum()
+    console.print(f"[green]Compacted the cache from {before:,} to {after:,} bytes.[/green]")
+
+
+@cache_app.command("export")
+def cache_export(
+    filename: str = typer.Argument(..., help="JSONL file to write"),
+    path: Optional[str] = _path_option,
+):
+    """Write every entry of the cache to a JSONL file."""
+    with console.status("Exporting...") as status:
+        count = _open_cache(path).write_jsonl(
+            filename, progress=lambda n: status.update(f"Exported {n:,} entries...")
+        )
+    console.print(f"[green]Exported {count:,} entries to {filename}.[/green]")
+
+
+@cache_app.command("import")
+def cache_import(
+    filename: str = typer.Argument(..., help="JSONL file to read"),
+    path: Optional[str] = _path_option,
+):
+    """Add the entries of a JSONL file to the cache."""
+    with console.status("Importing...") as status:
+        count = _open_cache(path).add_from_jsonl(
+            filename,
+            progress=lambda n: status.update(f"Imported {n:,} entries..."),
+            track_new_entries=False,
+        )
+    console.print(f"[green]Imported {count:,} entries from {filename}.[/green]")
+
+
+@cache_app.command("compress")
+def cache_compress(
+    method: str = typer.Option("zlib", "--method", help="zlib, zstd, or none to store plain JSON"),
+    dictionary: bool = typer.Option(
+        False, "--dictionary/--no-dictionary", help="Train a dictionary shared by all entries"
+    ),
+    path: Optional[str] = _path_option,
+):
+    """Rewrite every entry compressed, and compress the entries written later."""
+    cache = _open_cache(path)
+    before, after = cache.compress(
+        None if method == "none" else method, dictionary=dictionary
+    )
+    console.print(f"[green]Compressed the cache from {before:,} to {after:,} bytes.[/green]")
+
+
 @app.callback()
 def callback():
     """
@@ -50,6 +50,18 @@ CONFIG_MAP = {
         "default": f"sqlite:///{os.path.join(platformdirs.user_cache_dir('edsl'), 'lm_model_calls.db')}",
         "info": "This config var determines the path to the cache file.",
     },
+    "EDSL_CACHE_MAX_UNWRITTEN_ENTRIES": {
+        "default": "1000",
+        "info": "This config var determines how many new cache entries can be held in memory before they are written to the cache file, in batches, by a background thread (0 writes each entry as it is made).",
+    },
+    "EDSL_CACHE_MEMORY_ENTRIES": {
+        "default": "10000",
+        "info": "This config var determines how many recently used cache entries are kept in memory in front of the cache file (0 disables the in-memory tier).",
+    },
+    "EDSL_CACHE_MEMORY_BYTES": {
+        "default": "67108864",
+        "info": "This config var caps the size, in bytes of serialized entries, of the cache entries kept in memory in front of the cache file (0 for no cap beyond EDSL_CACHE_MEMORY_ENTRIES).",
+    },
     "EDSL_DEFAULT_MODEL": {
         "default": "gpt-4o",
         "info": "This config var holds the default model that will be used if a model is not explicitly passed.",
@@ -94,6 +106,10 @@ CONFIG_MAP = {
         "default": "None",
         "info": "This config var holds the URL of the remote token bucket server.",
     },
+    "EDSL_SHARED_TOKEN_BUCKET_PATH": {
+        "default": "None",
+        "info": "This config var holds the path of a SQLite file through which the token buckets of local processes are shared.",
+    },
     "EDSL_SQLLIST_MEMORY_THRESHOLD": {
         "default": "10",  # Change to a very low threshold (10 bytes) to test SQLite offloading
         "info": "This config var determines the memory threshold in bytes before SQLList offloads data to SQLite.",
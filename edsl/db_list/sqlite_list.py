@@ -33,7 +33,8 @@ class SQLiteList(MutableSequence, ABC):
         # Close the file handle immediately; SQLite only needs the path
         tmpfile.close()
 
-        self.conn = sqlite3.connect(self.db_path)
+        # The list may be handed to another thread, e.g. a job started with Jobs.start()
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
         self._create_table_if_not_exists()
 
         # Initialize with data if provided
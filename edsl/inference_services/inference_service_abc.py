@@ -1,6 +1,10 @@
 from abc import abstractmethod, ABC
 import re
 from datetime import datetime, timedelta
+from typing import Any, List, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ..language_models import LanguageModel
 
 
 class InferenceServiceABC(ABC):
@@ -59,6 +63,46 @@ class InferenceServiceABC(ABC):
         """
         pass
 
+    # Services with a provider batch API set this to True and implement
+    # async_submit_batch and async_poll_batch (used by Jobs.run(batch_mode=True))
+    supports_batch = False
+    # Seconds to wait between two polls of a submitted batch
+    batch_poll_interval = 30
+
+    @classmethod
+    async def async_submit_batch(
+        cls, model: "LanguageModel", requests: List[dict]
+    ) -> str:
+        """
+        Submits model calls to the service's batch endpoint and returns a batch id.
+
+        Each request holds the keyword arguments that would otherwise be passed to
+        `model.async_execute_model_call` (user_prompt, system_prompt, files_list and,
+        for test models, question_name).
+        """
+        from .exceptions import InferenceServiceNotImplementedError
+
+        raise InferenceServiceNotImplementedError(
+            f"Service '{cls._inference_service_}' does not support batch execution."
+        )
+
+    @classmethod
+    async def async_poll_batch(
+        cls, model: "LanguageModel", batch_id: str
+    ) -> Optional[List[Any]]:
+        """
+        Returns None while the batch is running, and the responses once it is done.
+
+        Responses are in request order. Each one is either the raw response that
+        `model.async_execute_model_call` would have returned, or an exception for a
+        request that failed.
+        """
+        from .exceptions import InferenceServiceNotImplementedError
+
+        raise InferenceServiceNotImplementedError(
+            f"Service '{cls._inference_service_}' does not support batch execution."
+        )
+
     @staticmethod
     def to_class_name(s):
         """
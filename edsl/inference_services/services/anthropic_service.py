@@ -23,6 +23,9 @@ class AnthropicService(InferenceServiceABC):
 
     available_models_url = "https://docs.anthropic.com/en/docs/about-claude/models"
 
+    # Calls are sent to the Message Batches API
+    supports_batch = True
+
     @classmethod
     def get_model_list(cls, api_key: str = None):
         import requests
@@ -38,6 +41,59 @@ class AnthropicService(InferenceServiceABC):
     def available(cls):
         return cls.get_model_list()
 
+    @classmethod
+    async def async_submit_batch(
+        cls, model: "LanguageModel", requests: List[dict]
+    ) -> str:
+        """Starts a message batch with one request per model call."""
+        client = AsyncAnthropic(api_key=model.api_token)
+        batch = await client.messages.batches.create(
+            requests=[
+                {"custom_id": str(i), "params": model._request_params(**request)}
+                for i, request in enumerate(requests)
+            ]
+        )
+        return batch.id
+
+    @classmethod
+    async def async_poll_batch(
+        cls, model: "LanguageModel", batch_id: str
+    ) -> Optional[List[Any]]:
+        """Returns None while the batch runs, then the responses from its results."""
+        from ..exceptions import InferenceServiceError
+
+        client = AsyncAnthropic(api_key=model.api_token)
+        batch = await client.messages.batches.retrieve(batch_id)
+        if batch.processing_status != "ended":
+            return None
+
+        responses = {}
+        async for entry in await client.messages.batches.results(batch_id):
+            if entry.result.type == "succeeded":
+                responses[entry.custom_id] = entry.result.message.model_dump()
+            else:
+                error = getattr(entry.result, "error", None)
+                responses[entry.custom_id] = InferenceServiceError(
+                    f"Anthropic batch request {entry.result.type}: {error}"
+                )
+        counts = batch.request_counts
+        total = (
+            counts.succeeded
+            + counts.errored
+            + counts.canceled
+            + counts.expired
+            + counts.processing
+        )
+        return [
+            responses.get(
+                str(i),
+                InferenceServiceError(
+                    f"Request {i} is missing from Anthropic batch {batch_id}."
+                ),
+            )
+            for i in range(total)
+        ]
+
     @classmethod
     def create_model(
         cls, model_name: str = "claude-3-opus-20240229", model_class_name=None
@@ -69,14 +125,13 @@ class AnthropicService(InferenceServiceABC):
                 "top_logprobs": 3,
             }
 
-            async def async_execute_model_call(
+            def _request_params(
                 self,
                 user_prompt: str,
                 system_prompt: str = "",
                 files_list: Optional[List["Files"]] = None,
             ) -> dict[str, Any]:
-                """Calls the Anthropic API and returns the API response."""
-
+                """Returns the parameters of a messages request."""
                 messages = [
                     {
                         "role": "user",
@@ -96,16 +151,26 @@ class AnthropicService(InferenceServiceABC):
                                 },
                             }
                         )
-                # breakpoint()
+                return {
+                    "model": model_name,
+                    "max_tokens": self.max_tokens,
+                    "temperature": self.temperature,
+                    "system": system_prompt,  # note that the Anthropic API uses "system" parameter rather than put it in the message
+                    "messages": messages,
+                }
+
+            async def async_execute_model_call(
+                self,
+                user_prompt: str,
+                system_prompt: str = "",
+                files_list: Optional[List["Files"]] = None,
+            ) -> dict[str, Any]:
+                """Calls the Anthropic API and returns the API response."""
                 client = AsyncAnthropic(api_key=self.api_token)
 
                 try:
                     response = await client.messages.create(
-                        model=model_name,
-                        max_tokens=self.max_tokens,
-                        temperature=self.temperature,
-                        system=system_prompt,  # note that the Anthropic API uses "system" parameter rather than put it in the message
-                        messages=messages,
+                        **self._request_params(user_prompt, system_prompt, files_list)
                     )
                 except Exception as e:
                     return {"message": str(e)}
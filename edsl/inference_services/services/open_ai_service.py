@@ -1,5 +1,6 @@
 from __future__ import annotations
 from typing import Any, List, Optional, Dict, NewType, TYPE_CHECKING
+import json
 import os
 
 import openai
@@ -38,11 +39,20 @@ class OpenAIService(InferenceServiceABC):
 
     available_models_url = "https://platform.openai.com/docs/models/gp"
 
+    # Calls are sent to the Batch API as a JSONL file of chat completion requests
+    supports_batch = True
+    _batch_endpoint = "/v1/chat/completions"
+    # Statuses of a batch that has not finished yet
+    _batch_running_statuses = ("validating", "in_progress", "finalizing", "cancelling")
+
     def __init_subclass__(cls, **kwargs):
         super().__init_subclass__(**kwargs)
         # so subclasses that use the OpenAI api key have to create their own instances of the clients
         cls._sync_client_instances = {}
         cls._async_client_instances = {}
+        # OpenAI-compatible services do not necessarily have the Batch API
+        if "supports_batch" not in cls.__dict__:
+            cls.supports_batch = False
 
     @classmethod
     def sync_client(cls, api_key):
@@ -111,6 +121,74 @@ class OpenAIService(InferenceServiceABC):
                 raise
         return cls._models_list_cache
 
+    @classmethod
+    async def async_submit_batch(
+        cls, model: "LanguageModel", requests: List[dict]
+    ) -> str:
+        """Uploads the requests as a batch input file and starts a batch."""
+        client = model.async_client()
+        lines = [
+            json.dumps(
+                {
+                    "custom_id": str(i),
+                    "method": "POST",
+                    "url": cls._batch_endpoint,
+                    "body": model._request_params(**request),
+                }
+            )
+            for i, request in enumerate(requests)
+        ]
+        batch_file = await client.files.create(
+            file=("edsl_batch.jsonl", "\n".join(lines).encode()), purpose="batch"
+        )
+        batch = await client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint=cls._batch_endpoint,
+            completion_window="24h",
+        )
+        return batch.id
+
+    @classmethod
+    async def async_poll_batch(
+        cls, model: "LanguageModel", batch_id: str
+    ) -> Optional[List[Any]]:
+        """Returns None while the batch runs, then the responses from its output files."""
+        from ..exceptions import InferenceServiceError
+
+        client = model.async_client()
+        batch = await client.batches.retrieve(batch_id)
+        if batch.status in cls._batch_running_statuses:
+            return None
+        if batch.status != "completed":
+            raise InferenceServiceError(
+                f"OpenAI batch {batch_id} ended with status '{batch.status}'."
+            )
+
+        responses = {}
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if file_id is None:
+                continue
+            content = await client.files.content(file_id)
+            for line in content.text.splitlines():
+                if not line.strip():
+                    continue
+                row = json.loads(line)
+                response = row.get("response") or {}
+                if row.get("error") is None and response.get("status_code") == 200:
+                    responses[row["custom_id"]] = response["body"]
+                else:
+                    error = row.get("error") or response.get("body", {}).get("error")
+                    responses[row["custom_id"]] = InferenceServiceError(
+                        f"OpenAI batch request failed: {error}"
+                    )
+        return [
+            responses.get(
+                str(i),
+                InferenceServiceError(f"Request {i} is missing from OpenAI batch {batch_id}."),
+            )
+            for i in range(batch.request_counts.total)
+        ]
+
     @classmethod
     def create_model(cls, model_name, model_class_name=None) -> 'LanguageModel':
         if model_class_name is None:
@@ -182,16 +260,13 @@ class OpenAIService(InferenceServiceABC):
                         "tpm": int(headers["x-ratelimit-limit-tokens"]),
                     }
 
-            async def async_execute_model_call(
+            def _request_params(
                 self,
                 user_prompt: str,
                 system_prompt: str = "",
                 files_list: Optional[List["Files"]] = None,
-                invigilator: Optional[
-                    "InvigilatorAI"
-                ] = None,  # TBD - can eventually be used for function-calling
             ) -> dict[str, Any]:
-                """Calls the OpenAI API and returns the API response."""
+                """Returns the parameters of a chat completion request."""
                 if files_list:
                     content = [{"type": "text", "text": user_prompt}]
                     for file_entry in files_list:
@@ -205,7 +280,6 @@ class OpenAIService(InferenceServiceABC):
                         )
                 else:
                     content = user_prompt
-                client = self.async_client()
 
                 messages = [
                     {"role": "system", "content": system_prompt},
@@ -233,6 +307,20 @@ class OpenAIService(InferenceServiceABC):
                     params.pop("max_tokens")
                     params["max_completion_tokens"] = self.max_tokens
                     params["temperature"] = 1
+                return params
+
+            async def async_execute_model_call(
+                self,
+                user_prompt: str,
+                system_prompt: str = "",
+                files_list: Optional[List["Files"]] = None,
+                invigilator: Optional[
+                    "InvigilatorAI"
+                ] = None,  # TBD - can eventually be used for function-calling
+            ) -> dict[str, Any]:
+                """Calls the OpenAI API and returns the API response."""
+                client = self.async_client()
+                params = self._request_params(user_prompt, system_prompt, files_list)
                 try:
                     response = await client.chat.completions.create(**params)
                 except Exception as e:
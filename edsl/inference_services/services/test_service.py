@@ -1,6 +1,7 @@
 from typing import Any, List, Optional, TYPE_CHECKING
 import asyncio
 import random
+from uuid import uuid4
 
 from ..inference_service_abc import InferenceServiceABC
 
@@ -34,10 +35,37 @@ class TestService(InferenceServiceABC):
     output_token_name = "completion_tokens"
     available_models_url = None
 
+    # Local stand-in for a provider batch API: a batch is run in the background
+    # and polled like a remote one
+    supports_batch = True
+    batch_poll_interval = 0.01
+    _batches = {}
+
     @classmethod
     def available(cls) -> list[str]:
         return ["test"]
 
+    @classmethod
+    async def async_submit_batch(
+        cls, model: "LanguageModel", requests: List[dict]
+    ) -> str:
+        batch_id = str(uuid4())
+        cls._batches[batch_id] = asyncio.ensure_future(
+            asyncio.gather(
+                *(model.async_execute_model_call(**request) for request in requests),
+                return_exceptions=True,
+            )
+        )
+        return batch_id
+
+    @classmethod
+    async def async_poll_batch(
+        cls, model: "LanguageModel", batch_id: str
+    ) -> Optional[List[Any]]:
+        if not cls._batches[batch_id].done():
+            return None
+        return cls._batches.pop(batch_id).result()
+
     @classmethod
     def create_model(cls, model_name, model_class_name=None) -> "LanguageModel":
         # Removed unused variable
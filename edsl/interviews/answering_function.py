@@ -1,10 +1,12 @@
 import asyncio
 import copy
 import weakref
-from typing import TYPE_CHECKING, Any, Callable, Union
+from typing import TYPE_CHECKING, Any, Callable, Optional, Union
 
 if TYPE_CHECKING:
     from ..invigilators.invigilator_base import InvigilatorBase
+    from ..buckets import AdaptiveRateController
+    from ..jobs.model_call_batcher import ModelCallBatcher
     from ..key_management import KeyLookup
     from ..questions import QuestionBase
     from .interview import Interview
@@ -161,10 +163,18 @@ class SkipHandler:
 class AnswerQuestionFunctionConstructor:
     """Constructs a function that answers a question and records the answer."""
 
-    def __init__(self, interview: "Interview", key_lookup: "KeyLookup"):
+    def __init__(
+        self,
+        interview: "Interview",
+        key_lookup: "KeyLookup",
+        rate_controller: Optional["AdaptiveRateController"] = None,
+        model_call_batcher: Optional["ModelCallBatcher"] = None,
+    ):
         # Store a weak reference to the interview
         self._interview_ref = weakref.ref(interview)
         self.key_lookup = key_lookup
+        self.rate_controller = rate_controller
+        self.model_call_batcher = model_call_batcher
 
         # Store configuration settings that won't change during lifecycle
         self._raise_validation_errors = getattr(
@@ -173,10 +183,15 @@ class AnswerQuestionFunctionConstructor:
         self._stop_on_exception = getattr(interview, "stop_on_exception", False)
 
         self.had_language_model_no_response_error: bool = False
+        # Invigilators built before their question is answered (see invigilator_for)
+        self._invigilators: dict = {}
 
         # Initialize fetch invigilator with the interview - this should use weakref internally
         self.invigilator_fetcher = FetchInvigilator(
-            interview, key_lookup=self.key_lookup
+            interview,
+            key_lookup=self.key_lookup,
+            rate_controller=self.rate_controller,
+            model_call_batcher=self.model_call_batcher,
         )
 
         # In our test environment, we might not be able to create the SkipHandler
@@ -251,6 +266,42 @@ class AnswerQuestionFunctionConstructor:
     def __call__(self):
         return self.answer_question_and_record_task
 
+    def invigilator_for(self, question: "QuestionBase") -> "InvigilatorBase":
+        """Return the invigilator that will answer the question.
+
+        The cache probe and the token estimate of a question use the invigilator
+        that then answers it, so its prompts are only rendered once.
+        """
+        if question.question_name not in self._invigilators:
+            self._invigilators[question.question_name] = self.invigilator_fetcher(
+                question
+            )
+        return self._invigilators[question.question_name]
+
+    def _is_skipped(self, question: "QuestionBase") -> bool:
+        """Whether the question is skipped, by a rule or by an earlier answer."""
+        if self._skip_flags.get(question.question_name, False):
+            return True
+        return bool(self.skip_handler and self.skip_handler.should_skip(question))
+
+    async def probe_cache(self, question: "QuestionBase") -> bool:
+        """Return whether the question will be answered without a model call.
+
+        Called before the task takes any rate-limit capacity, so that answers in
+        the cache, and questions that are skipped, are not held up by rate limits.
+        Any error is left for the answering function to handle and record, so the
+        probe just reports a miss.
+        """
+        interview = self._interview_ref()
+        if interview is None:
+            return False
+        try:
+            if self._is_skipped(question):
+                return True
+            return await self.invigilator_for(question).async_is_cached()
+        except Exception:
+            return False
+
     async def answer_question_and_record_task(
         self,
         *,
@@ -278,8 +329,10 @@ class AnswerQuestionFunctionConstructor:
             # Get a reference to the interview (may be None if it's been garbage collected)
             interview = self._interview_ref()
 
-            # Get the invigilator for this question
-            invigilator = self.invigilator_fetcher(question)
+            # Get the invigilator for this question; retries get a fresh one
+            invigilator = self._invigilators.pop(
+                question.question_name, None
+            ) or self.invigilator_fetcher(question)
 
             # Check if interview still exists
             if interview is None:
@@ -289,14 +342,7 @@ class AnswerQuestionFunctionConstructor:
                     failure_reason="Interview has been garbage collected."
                 )
 
-            # Check if question should be skipped - use cached skip_flags if available
-            skip_flags = getattr(self, "_skip_flags", None) or interview.skip_flags
-            if skip_flags.get(question.question_name, False):
-                return invigilator.get_failed_task_result(
-                    failure_reason="Question skipped."
-                )
-
-            if self.skip_handler and self.skip_handler.should_skip(question):
+            if self._is_skipped(question):
                 return invigilator.get_failed_task_result(
                     failure_reason="Question skipped."
                 )
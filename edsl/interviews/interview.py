@@ -16,7 +16,6 @@ the individual API calls to language models, with support for caching and distri
 from __future__ import annotations
 
 import asyncio
-import copy
 from dataclasses import dataclass
 from typing import TYPE_CHECKING, Any, Generator, List, Optional, Type
 
@@ -112,6 +111,7 @@ class Interview:
         cache: Optional["Cache"] = None,
         skip_retry: bool = False,
         raise_validation_errors: bool = True,
+        component_hashes: Optional[dict] = None,
     ):
         """Initialize a new Interview instance.
 
@@ -125,6 +125,9 @@ class Interview:
             cache: Optional cache for storing and retrieving model responses
             skip_retry: Whether to skip retrying failed questions
             raise_validation_errors: Whether to raise exceptions for validation errors
+            component_hashes: Optional precomputed hashes of the agent, survey, scenario
+                and model, used to compute `initial_hash` without serializing them.
+                The survey hash is that of the survey before it is drawn.
 
         The initialization process sets up the interview state including:
         1. Creating the task manager for handling question execution
@@ -148,7 +151,8 @@ class Interview:
             {'q0': 0, 'q1': 1, 'q2': 2}
         """
         self.agent = agent
-        self.survey = copy.deepcopy(survey)  # why do we need to deepcopy the survey?
+        # Shares the survey, copying only the questions the interview modifies
+        self.survey = survey._copy_for_interview()
         self.scenario = scenario
         self.model = model
         self.iteration = iteration
@@ -177,7 +181,36 @@ class Interview:
         self.failed_questions = []
 
         self.indices = indices
-        self.initial_hash = hash(self)
+        if component_hashes is None:
+            component_hashes = self.hash_components(agent, survey, scenario, model)
+        self.component_hashes = component_hashes
+        # Stored in Result.interview_hash. Built from the component hashes (of the
+        # survey before it is drawn), so it does not equal hash(self), which
+        # serializes the whole interview: hashes persisted by edsl versions that
+        # used hash(self) do not match the ones computed now.
+        self.initial_hash = dict_hash(
+            {**component_hashes, "iteration": iteration, "indices": indices}
+        )
+
+    @staticmethod
+    def hash_components(
+        agent: Agent, survey: Survey, scenario: Scenario, model: "LanguageModel"
+    ) -> dict:
+        """Return the content hashes that identify an interview's components.
+
+        Computing these means serializing every component, so callers creating many
+        interviews from the same objects should compute them once and pass them in.
+
+        >>> i = Interview.example()
+        >>> sorted(Interview.hash_components(i.agent, i.survey, i.scenario, i.model))
+        ['agent', 'model', 'scenario', 'survey']
+        """
+        return {
+            "agent": hash(agent),
+            "survey": hash(survey),
+            "scenario": hash(scenario),
+            "model": hash(model),
+        }
 
     @property
     def cache(self) -> "Cache":
@@ -444,18 +477,37 @@ class Interview:
         else:
             model_buckets = None
 
-        if model_buckets is None or hasattr(self.agent, "answer_question_directly"):
+        # Calls sent to a batch API are not subject to the regular rate limits
+        model_call_batcher = run_config.environment.model_call_batcher
+        if (
+            model_buckets is None
+            or hasattr(self.agent, "answer_question_directly")
+            or (
+                model_call_batcher is not None
+                and model_call_batcher.supports(self.model)
+            )
+        ):
             ModelBuckets = get_model_buckets()
             model_buckets = ModelBuckets.infinity_bucket()
 
         self.skip_flags = {q.question_name: False for q in self.survey.questions}
 
+        answer_function_constructor = AnswerQuestionFunctionConstructor(
+            self,
+            key_lookup=run_config.environment.key_lookup,
+            rate_controller=run_config.environment.rate_controller,
+            model_call_batcher=run_config.environment.model_call_batcher,
+        )
         self.tasks = self.task_manager.build_question_tasks(
-            answer_func=AnswerQuestionFunctionConstructor(
-                self, key_lookup=run_config.environment.key_lookup
-            )(),
-            token_estimator=RequestTokenEstimator(self),
+            answer_func=answer_function_constructor(),
+            token_estimator=RequestTokenEstimator(
+                self, fetch_invigilator=answer_function_constructor.invigilator_for
+            ),
             model_buckets=model_buckets,
+            priority=run_config.parameters.priority,
+            cancel_event=run_config.environment.cancel_event,
+            # Answers in the cache skip rate limiting
+            cache_probe=answer_function_constructor.probe_cache,
         )
 
         ## This is the key part---it creates a task for each question,
@@ -466,6 +518,8 @@ class Interview:
             interview=self,
             current_answers=self.answers,
             key_lookup=run_config.environment.key_lookup,
+            rate_controller=run_config.environment.rate_controller,
+            model_call_batcher=run_config.environment.model_call_batcher,
         )
         self.invigilators = [fetcher(question) for question in self.survey.questions]
         await asyncio.gather(
@@ -629,6 +683,7 @@ class Interview:
             cache=self.running_config.cache,
             skip_retry=self.running_config.skip_retry,
             indices=self.indices,
+            component_hashes=self.component_hashes,
         )
 
     @classmethod
@@ -27,7 +27,13 @@ class InterviewTaskManager:
         self.survey_dag = None
 
     def build_question_tasks(
-        self, answer_func, token_estimator, model_buckets
+        self,
+        answer_func,
+        token_estimator,
+        model_buckets,
+        priority: int = 0,
+        cancel_event=None,
+        cache_probe=None,
     ) -> list[asyncio.Task]:
         """Create tasks for all questions with proper dependencies."""
         tasks: list[asyncio.Task] = []
@@ -39,6 +45,9 @@ class InterviewTaskManager:
                 answer_func=answer_func,
                 token_estimator=token_estimator,
                 model_buckets=model_buckets,
+                priority=priority,
+                cancel_event=cancel_event,
+                cache_probe=cache_probe,
             )
             tasks.append(task)
         return tasks
@@ -59,6 +68,9 @@ class InterviewTaskManager:
         answer_func,
         token_estimator,
         model_buckets,
+        priority: int = 0,
+        cancel_event=None,
+        cache_probe=None,
     ) -> asyncio.Task:
         """Create a single question task with its dependencies."""
         from ..tasks import QuestionTaskCreator
@@ -69,6 +81,9 @@ class InterviewTaskManager:
             token_estimator=token_estimator,
             model_buckets=model_buckets,
             iteration=self.iteration,
+            priority=priority,
+            cancel_event=cancel_event,
+            cache_probe=cache_probe,
         )
 
         for dependency in dependencies:
@@ -100,13 +100,21 @@ def estimate_tokens(model_name, width, height):
 class RequestTokenEstimator:
     """Estimate the number of tokens that will be required to run the focal task."""
 
-    def __init__(self, interview):
+    def __init__(self, interview, fetch_invigilator=None):
+        """
+        Args:
+            interview: The interview whose questions are estimated
+            fetch_invigilator: Function returning the invigilator of a question, to
+                share it (and its rendered prompts) with the answering function
+        """
         self.interview = interview
+        self.fetch_invigilator = fetch_invigilator
 
     def __call__(self, question) -> float:
         """Estimate the number of tokens that will be required to run the focal task."""
 
-        invigilator = FetchInvigilator(self.interview)(question=question)
+        fetch_invigilator = self.fetch_invigilator or FetchInvigilator(self.interview)
+        invigilator = fetch_invigilator(question=question)
 
         # TODO: There should be a way to get a more accurate estimate.
         combined_text = ""
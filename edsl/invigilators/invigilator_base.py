@@ -113,6 +113,10 @@ class InvigilatorBase(ABC):
         self.survey = survey
         self.raise_validation_errors = raise_validation_errors
         self.key_lookup = key_lookup
+        # Set by FetchInvigilator when the job runs with adaptive rate control
+        # or in batch mode
+        self.rate_controller = None
+        self.model_call_batcher = None
 
         # Initialize prompt plan (default or custom)
         if prompt_plan is None:
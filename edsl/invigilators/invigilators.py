@@ -191,6 +191,13 @@ class InvigilatorBase(ABC):
             "system_prompt": Prompt("NA"),
         }
 
+    async def async_is_cached(self) -> bool:
+        """Return whether the answer can be given from the cache, without a model call.
+
+        Invigilators that do not call a model never use the cache.
+        """
+        return False
+
     @abstractmethod
     async def async_answer_question(self):
         """Asnwer a question."""
@@ -270,9 +277,14 @@ class InvigilatorBase(ABC):
 class InvigilatorAI(InvigilatorBase):
     """An invigilator that uses an AI model to answer questions."""
 
+    # Prompts rendered by get_prompts, shared by the cache probe and the model call
+    _prompts: Optional[Dict[PromptType, "Prompt"]] = None
+
     def get_prompts(self) -> Dict[PromptType, "Prompt"]:
-        """Return the prompts used."""
-        return self.prompt_constructor.get_prompts()
+        """Return the prompts used, rendering them once per invigilator."""
+        if self._prompts is None:
+            self._prompts = self.prompt_constructor.get_prompts()
+        return self._prompts
 
     def get_captured_variables(self) -> dict:
         """Get the captured variables."""
@@ -301,6 +313,19 @@ class InvigilatorAI(InvigilatorBase):
 
         return await self.model.async_get_response(**params)
 
+    async def async_is_cached(self) -> bool:
+        """Return whether the model response for this question is in the cache."""
+        if self.cache is None:
+            return False
+        prompts = self.get_prompts()
+        return await self.model.async_is_cached(
+            user_prompt=prompts["user_prompt"].text,
+            system_prompt=prompts["system_prompt"].text,
+            cache=self.cache,
+            iteration=self.iteration,
+            files_list=prompts.get("files_list"),
+        )
+
     def store_response(self, agent_response_dict: AgentResponseDict) -> None:
         """Store the response in the invigilator, in case it is needed later because of validation failure."""
         self.raw_model_response = agent_response_dict.model_outputs.response
@@ -7,6 +7,7 @@ and management of concurrent language model API calls.
 
 from .jobs import Jobs
 from .jobs import RunConfig, RunParameters, RunEnvironment  # noqa: F401
+from .job_handle import JobHandle  # noqa: F401
 from .remote_inference import JobsRemoteInferenceHandler  # noqa: F401
 from .jobs_runner_status import JobsRunnerStatusBase  # noqa: F401
 from .exceptions import (
@@ -40,5 +41,6 @@ __all__ = [
     "JobsRunnerStatusBase",
     "RunConfig",
     "RunParameters",
-    "RunEnvironment"
+    "RunEnvironment",
+    "JobHandle"
 ]
@@ -5,22 +5,27 @@ This module provides functionality to run multiple interviews in parallel
 with controlled concurrency, supporting both error handling and result collection.
 """
 
+from collections import Counter, deque
 from collections.abc import AsyncGenerator, AsyncIterator
 from contextlib import asynccontextmanager
-from typing import List, Generator, Tuple, TYPE_CHECKING, AsyncIterator
+from typing import Collection, Dict, Iterable, List, Generator, Optional, Set, Tuple, TYPE_CHECKING, AsyncIterator
 from dataclasses import dataclass
 import asyncio
+import math
 from ..data_transfer_models import EDSLResultObjectInput
 
 from ..results import Result
 from ..interviews import Interview
+from ..tasks import TaskStatus
 from ..config import Config
 from .data_structures import RunConfig
+from .exceptions import JobsValueError
 
 config = Config()
 
 if TYPE_CHECKING:
     from ..jobs import Jobs
+    from ..buckets import ModelBuckets
 
 @dataclass
 class InterviewBatch:
@@ -52,18 +57,124 @@ class AsyncInterviewRunner:
     """
 
     MAX_CONCURRENT = int(config.EDSL_MAX_CONCURRENT_TASKS)
+    # Seconds of request-bucket throughput a model may have queued up in flight
+    # under the per_model scheduler
+    ADMISSION_HORIZON = 30
+    # Seconds between checks for cancellation while waiting on interviews
+    CANCEL_POLL_INTERVAL = 0.05
+    # Queue of the per_model scheduler for interviews whose calls go to a batch API
+    BATCH_KEY = "batch"
 
-    def __init__(self, jobs: "Jobs", run_config: RunConfig):
+    def __init__(
+        self,
+        jobs: "Jobs",
+        run_config: RunConfig,
+        skip_indices: Optional[Collection[int]] = None,
+    ):
         """
         Initialize the AsyncInterviewRunner.
 
         Args:
             jobs: The Jobs object that generates interviews
             run_config: Configuration for running the interviews
+            skip_indices: Positions of interviews that are already done (e.g.,
+                recorded in a checkpoint) and should not be run again
         """
         self.jobs = jobs
         self.run_config = run_config
+        self.skip_indices = skip_indices or ()
         self._initialized = asyncio.Event()
+        # Interviews of the tasks that are still running
+        self._interviews: Dict[asyncio.Task, Interview] = {}
+
+    def _concurrency_limit(self) -> int:
+        """Current maximum number of interviews in flight.
+
+        This is MAX_CONCURRENT, unless an adaptive rate controller is lowering it
+        in response to timeouts and rate-limit errors. Interviews whose calls go to
+        a batch API are not counted against it (see `_limit_for`).
+        """
+        rate_controller = self.run_config.environment.rate_controller
+        if rate_controller is None:
+            return self.MAX_CONCURRENT
+        return min(self.MAX_CONCURRENT, rate_controller.concurrency)
+
+    def _batched(self, interview: Interview) -> bool:
+        """Whether the interview's model calls go to a batch API (see ModelCallBatcher)."""
+        model_call_batcher = self.run_config.environment.model_call_batcher
+        return (
+            model_call_batcher is not None
+            and not hasattr(interview.agent, "answer_question_directly")
+            and model_call_batcher.supports(interview.model)
+        )
+
+    def _limit_for(self, batched: bool) -> int:
+        """Maximum number of interviews in flight of one kind.
+
+        Batched interviews only wait on the batcher, so as many are admitted as fit
+        in one batch. The others are subject to `_concurrency_limit()`.
+        """
+        if batched:
+            return self.run_config.environment.model_call_batcher.max_batch_size
+        return self._concurrency_limit()
+
+    def _window_full(self, in_flight: Counter) -> bool:
+        """Whether the interviews in flight, counted by `_batched`, have reached a limit."""
+        return any(
+            count >= self._limit_for(batched)
+            for batched, count in in_flight.items()
+            if count
+        )
+
+    def _cancelled(self) -> bool:
+        """Whether the job is being cancelled (see RunEnvironment.cancel_event)."""
+        cancel_event = self.run_config.environment.cancel_event
+        return cancel_event is not None and cancel_event.is_set()
+
+    def _start(self, interview: Interview, idx: int) -> asyncio.Task:
+        """Start running an interview in its own task."""
+        task = asyncio.create_task(self._run_single_interview(interview, idx))
+        self._interviews[task] = interview
+        task.add_done_callback(self._interviews.pop)
+        return task
+
+    async def _wait(
+        self,
+        tasks: Iterable[asyncio.Task],
+        timeout: Optional[float] = None,
+        return_when: str = asyncio.FIRST_COMPLETED,
+    ) -> Tuple[Set[asyncio.Task], Set[asyncio.Task]]:
+        """`asyncio.wait` that also returns in time to notice a cancellation."""
+        if self.run_config.environment.cancel_event is not None:
+            timeout = min(timeout or math.inf, self.CANCEL_POLL_INTERVAL)
+        return await asyncio.wait(tasks, timeout=timeout, return_when=return_when)
+
+    @staticmethod
+    def _call_in_progress(interview: Interview) -> bool:
+        """Whether any of the interview's questions is waiting on a model call."""
+        return any(
+            task_creator.task_status == TaskStatus.API_CALL_IN_PROGRESS
+            for task_creator in interview.task_manager.task_creators.values()
+        )
+
+    async def _drain(self, tasks: Iterable[asyncio.Task]) -> None:
+        """Wait for the model calls in progress, then cancel the remaining interviews.
+
+        Once the job is cancelled, questions no longer start new calls, so the calls
+        already made are the only work left. Letting them finish stores their
+        responses in the cache. Interviews that complete in the meantime keep their
+        results; the others are cancelled.
+        """
+        tasks = set(tasks)
+        while any(
+            self._call_in_progress(self._interviews[task])
+            for task in tasks
+            if task in self._interviews
+        ):
+            await asyncio.wait(tasks, timeout=self.CANCEL_POLL_INTERVAL)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
 
     @asynccontextmanager
     async def _manage_tasks(self, tasks: List[asyncio.Task]) -> AsyncIterator[None]:
@@ -83,7 +194,6 @@ class AsyncInterviewRunner:
         interview processing lifecycle.
         """
         self._initialized.set()
-        self._current_idx = 0
         interview_generator = self._expand_interviews()
         
         try:
@@ -109,7 +219,6 @@ class AsyncInterviewRunner:
             
         finally:
             # Cleanup code to help garbage collection
-            self._current_idx = 0
             self._initialized.clear()
             # Clear the generator to avoid references
             if 'interview_generator' in locals():
@@ -121,6 +230,9 @@ class AsyncInterviewRunner:
         """Execute a single interview with error handling."""
         try:
             await interview.async_conduct_interview(self.run_config)
+            if self._cancelled() and any(task.cancelled() for task in interview.tasks):
+                # Cut short by a cancellation; only complete interviews are returned
+                return None
             # Create result and explicitly break reference to interview
             result = Result.from_interview(interview)
             # Update the status
@@ -140,16 +252,22 @@ class AsyncInterviewRunner:
         self, chunk: List[Tuple[int, Interview]]
     ) -> AsyncIterator[List[Tuple[Result, Interview, int]]]:
         """Process a chunk of interviews concurrently."""
-        tasks = [
-            asyncio.create_task(self._run_single_interview(interview, idx))
-            for idx, interview in chunk
-        ]
+        tasks = [self._start(interview, idx) for idx, interview in chunk]
                 
         async with self._manage_tasks(tasks):
-            results = await asyncio.gather(
-                *tasks,
-                return_exceptions=not self.run_config.parameters.stop_on_exception
-            )
+            pending = set(tasks)
+            while pending:
+                done, pending = await self._wait(
+                    pending, return_when=asyncio.FIRST_EXCEPTION
+                )
+                if self.run_config.parameters.stop_on_exception:
+                    for task in done:
+                        if not task.cancelled() and task.exception() is not None:
+                            raise task.exception()
+                if pending and self._cancelled():
+                    await self._drain(pending)
+                    pending = set()
+            results = [task.result() for task in tasks if not task.cancelled()]
             # Filter out None results and yield a new list to avoid keeping the original tuple references
             valid_results = []
             for r in results:
@@ -169,15 +287,238 @@ class AsyncInterviewRunner:
                 del tup
             del valid_results
 
-    def _expand_interviews(self) -> Generator["Interview", None, None]:
+    async def _sliding_window_processor(
+        self,
+    ) -> AsyncGenerator[tuple[Result, Interview, int], None]:
+        """Keep up to `_limit_for` interviews in flight, refilling as each finishes.
+
+        Unlike the chunked processor, a slow interview only occupies its own slot:
+        a new interview is pulled from the generator the moment any other one
+        completes. Results are yielded in completion order.
+        """
+        self._initialized.set()
+        interview_generator = self._expand_interviews()
+        in_flight = set()
+        batched = {}
+        in_flight_per_kind = Counter()
+
+        def refill() -> None:
+            while not self._cancelled() and not self._window_full(in_flight_per_kind):
+                try:
+                    idx, interview = next(interview_generator)
+                except StopIteration:
+                    return
+                task = self._start(interview, idx)
+                in_flight.add(task)
+                batched[task] = self._batched(interview)
+                in_flight_per_kind[batched[task]] += 1
+
+        try:
+            refill()
+            while in_flight:
+                done, in_flight = await self._wait(in_flight)
+                for task in done:
+                    in_flight_per_kind[batched.pop(task)] -= 1
+                if self._cancelled():
+                    await self._drain(in_flight)
+                    done, in_flight = done | in_flight, set()
+                # Start replacements before handing results to the consumer
+                refill()
+                for task in done:
+                    if task.cancelled():
+                        continue
+                    result_tuple = task.result()
+                    if result_tuple is not None:
+                        yield result_tuple
+        finally:
+            for task in in_flight:
+                if not task.done():
+                    task.cancel()
+            self._initialized.clear()
+
+    def _model_buckets_for(self, interview: Interview) -> Optional["ModelBuckets"]:
+        """Return the rate-limit buckets the interview will draw from, if any."""
+        bucket_collection = self.run_config.environment.bucket_collection
+        if (
+            bucket_collection is None
+            or hasattr(interview.agent, "answer_question_directly")
+            or self._batched(interview)
+        ):
+            return None
+        return bucket_collection.get(interview.model)
+
+    def _admission_cap(self, model_buckets: Optional["ModelBuckets"]) -> int:
+        """Maximum number of in-flight interviews for one model's buckets.
+
+        This is the number of requests the bucket can serve within
+        ADMISSION_HORIZON seconds, bounded by MAX_CONCURRENT.
+
+        >>> from unittest.mock import MagicMock
+        >>> from edsl.buckets import ModelBuckets
+        >>> runner = AsyncInterviewRunner(MagicMock(), MagicMock())
+        >>> buckets = ModelBuckets.infinity_bucket()
+        >>> runner._admission_cap(buckets) == runner.MAX_CONCURRENT
+        True
+        >>> buckets.requests_bucket.refill_rate = 0.5
+        >>> runner._admission_cap(buckets)
+        15
+        """
+        if model_buckets is None:
+            return self.MAX_CONCURRENT
+        rate = model_buckets.requests_bucket.refill_rate
+        if math.isinf(rate):
+            return self.MAX_CONCURRENT
+        return max(1, min(self.MAX_CONCURRENT, math.ceil(rate * self.ADMISSION_HORIZON)))
+
+    @staticmethod
+    def _bucket_wait(model_buckets: Optional["ModelBuckets"]) -> float:
+        """Seconds until the model's request bucket can serve one more request."""
+        from ..buckets import TokenBucket
+
+        if model_buckets is None:
+            return 0
+        bucket = model_buckets.requests_bucket
+        # Only probe local buckets; a remote bucket would cost a round trip
+        if not isinstance(bucket, TokenBucket):
+            return 0
+        bucket.refill()
+        return bucket.wait_time(min(1, bucket.capacity))
+
+    async def _per_model_processor(
+        self,
+    ) -> AsyncGenerator[tuple[Result, Interview, int], None]:
+        """Admit interviews from a separate ready queue per model's buckets.
+
+        Interviews are sorted into one queue per ModelBuckets (i.e., per service
+        rate limit). Queues are served round-robin, and a queue is only admitted
+        into the window while its model has fewer than `_admission_cap` interviews
+        in flight and its request bucket has capacity. A tightly rate-limited model
+        therefore cannot fill the window with interviews that would just block in
+        `TokenBucket.get_tokens`, and the remaining slots go to models that can
+        make progress. Interviews whose calls go to a batch API have a queue of
+        their own, admitted up to the batcher's batch size outside of the window.
+        Results are yielded in completion order.
+
+        Interviews are read ahead of admission until MAX_CONCURRENT of them are
+        queued for models that can take more, so that the interviews of a blocked
+        model do not stop the generator from reaching other models. Each queue
+        holds at most MAX_CONCURRENT interviews, which bounds the read-ahead.
+        """
+        self._initialized.set()
+        interview_generator = self._expand_interviews()
+        queues = {}
+        buckets = {}
+        in_flight_per_key = Counter()
+        tasks = {}
+        exhausted = False
+
+        def cap_for(key) -> int:
+            if key == self.BATCH_KEY:
+                return self._limit_for(batched=True)
+            # Recomputed each time, as refill rates can change at runtime
+            return self._admission_cap(buckets[key])
+
+        def lookahead() -> int:
+            """Interviews queued for models that have room for more in flight."""
+            return sum(
+                len(queue)
+                for key, queue in queues.items()
+                if in_flight_per_key[key] < cap_for(key)
+            )
+
+        def pull() -> None:
+            nonlocal exhausted
+            while (
+                not exhausted
+                and lookahead() < self.MAX_CONCURRENT
+                and all(len(queue) < self.MAX_CONCURRENT for queue in queues.values())
+            ):
+                try:
+                    idx, interview = next(interview_generator)
+                except StopIteration:
+                    exhausted = True
+                    return
+                if self._batched(interview):
+                    model_buckets, key = None, self.BATCH_KEY
+                else:
+                    model_buckets = self._model_buckets_for(interview)
+                    key = id(model_buckets)
+                if key not in queues:
+                    queues[key] = deque()
+                    buckets[key] = model_buckets
+                queues[key].append((idx, interview))
+
+        def admit() -> Optional[float]:
+            """Start as many interviews as allowed; return seconds until a retry helps."""
+            retry_in = None
+            progress = not self._cancelled()
+            if progress:
+                # Finished interviews may have unblocked models with queued interviews
+                pull()
+            limit = self._concurrency_limit()
+            while progress:
+                progress = False
+                for key in list(queues):
+                    if (
+                        key != self.BATCH_KEY
+                        and len(tasks) - in_flight_per_key[self.BATCH_KEY] >= limit
+                    ):
+                        continue
+                    if not queues[key] or in_flight_per_key[key] >= cap_for(key):
+                        continue
+                    wait = self._bucket_wait(buckets[key])
+                    if wait > 0 and in_flight_per_key[key] > 0:
+                        retry_in = wait if retry_in is None else min(retry_in, wait)
+                        continue
+                    idx, interview = queues[key].popleft()
+                    task = self._start(interview, idx)
+                    tasks[task] = key
+                    in_flight_per_key[key] += 1
+                    progress = True
+                    pull()
+            return retry_in
+
+        try:
+            pull()
+            while tasks or any(queues.values()):
+                if self._cancelled():
+                    # Leave the queued interviews unstarted
+                    await self._drain(tasks)
+                    done = set(tasks)
+                    tasks.clear()
+                    queues.clear()
+                else:
+                    retry_in = admit()
+                    if not tasks:
+                        continue
+                    done, _ = await self._wait(tasks.keys(), timeout=retry_in)
+                    for task in done:
+                        in_flight_per_key[tasks.pop(task)] -= 1
+                    # Start replacements before handing results to the consumer
+                    admit()
+                for task in done:
+                    if task.cancelled():
+                        continue
+                    result_tuple = task.result()
+                    if result_tuple is not None:
+                        yield result_tuple
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+            self._initialized.clear()
+
+    def _expand_interviews(self) -> Generator[Tuple[int, "Interview"], None, None]:
         """
         Create multiple copies of each interview based on the run configuration.
 
         This method expands interviews for repeated runs and ensures each has
-        the proper cache configuration.
+        the proper cache configuration. Positions in `skip_indices` are skipped
+        without creating their interview copies.
 
         Yields:
-            Interview objects ready to be conducted
+            Tuples of (idx, Interview) ready to be conducted, where idx is the
+            position of the interview in the job
 
         Examples:
             >>> from unittest.mock import MagicMock
@@ -191,30 +532,38 @@ class AsyncInterviewRunner:
             >>> interviews = list(runner._expand_interviews())
             >>> len(interviews)
             2
+            >>> runner.skip_indices = {0}
+            >>> [idx for idx, _ in runner._expand_interviews()]
+            [1]
         """
+        idx = 0
         for interview in self.jobs.generate_interviews():
             for iteration in range(self.run_config.parameters.n):
-                if iteration > 0:
-                    yield interview.duplicate(
+                if idx in self.skip_indices:
+                    pass
+                elif iteration > 0:
+                    yield idx, interview.duplicate(
                         iteration=iteration, cache=self.run_config.environment.cache
                     )
                 else:
                     interview.cache = self.run_config.environment.cache
-                    yield interview
+                    yield idx, interview
+                idx += 1
 
     def _get_next_chunk(
         self,
-        gen: Generator[Interview, None, None]
+        gen: Generator[Tuple[int, Interview], None, None]
     ) -> List[Tuple[int, Interview]]:
-        """Take interviews from the generator up to MAX_CONCURRENT."""
+        """Take interviews from the generator until one kind reaches `_limit_for`."""
         chunk = []
-        while len(chunk) < self.MAX_CONCURRENT:
+        in_flight_per_kind = Counter()
+        while not self._cancelled() and not self._window_full(in_flight_per_kind):
             try:
-                interview = next(gen)
-                chunk.append((self._current_idx, interview))
-                self._current_idx += 1
+                idx, interview = next(gen)
             except StopIteration:
                 break
+            chunk.append((idx, interview))
+            in_flight_per_kind[self._batched(interview)] += 1
         return chunk
 
     async def run(self) -> AsyncGenerator[tuple[Result, Interview, int], None]:
@@ -232,6 +581,21 @@ class AsyncInterviewRunner:
         Raises:
             Exception: If stop_on_exception is True and any interview fails
         """
+        scheduler = self.run_config.parameters.scheduler
+        processors = {
+            "sliding_window": self._sliding_window_processor,
+            "per_model": self._per_model_processor,
+        }
+        if scheduler in processors:
+            async for result_tuple in processors[scheduler]():
+                yield result_tuple
+            return
+        if scheduler != "chunked":
+            raise JobsValueError(
+                f"Unknown scheduler '{scheduler}'. "
+                "Use 'chunked', 'sliding_window' or 'per_model'."
+            )
+
         async with self._interview_batch_processor() as processor:
             async for result_tuple in processor:
                 # For each result tuple in the processor
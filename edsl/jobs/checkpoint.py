@@ -0,0 +1,116 @@
+"""
+Durable progress journal for resuming interrupted jobs.
+
+With ``Jobs.run(checkpoint="job.ckpt")``, every finished interview is appended to
+the checkpoint file as soon as its Result is collected. If the process dies, running
+the same job again with the same checkpoint file skips the interviews recorded there
+without building them, and returns Results in the same order as an uninterrupted
+run.
+
+The file is JSON Lines. The first line identifies the job (its hash and ``n``) so
+that a checkpoint is never applied to a different job; each following line holds
+one interview position and its serialized Result. Lines are flushed as they are
+written, so a crash loses at most the interview being written. A partly written
+last line is ignored on resume.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from typing import Dict, TYPE_CHECKING
+
+from .exceptions import JobsValueError
+
+if TYPE_CHECKING:
+    from ..results import Result
+    from .jobs import Jobs
+
+
+class JobCheckpoint:
+    """
+    Append-only journal of the interviews a job has completed.
+
+    >>> import os, tempfile
+    >>> from edsl.jobs import Jobs
+    >>> from edsl.results import Result
+    >>> path = os.path.join(tempfile.mkdtemp(), "job.ckpt")
+    >>> with JobCheckpoint(path, Jobs.example()) as checkpoint:
+    ...     checkpoint.record(3, Result.example())
+    >>> sorted(JobCheckpoint(path, Jobs.example()).completed)
+    [3]
+    """
+
+    def __init__(self, path: str, jobs: "Jobs"):
+        self.path = path
+        self.header = {"job_hash": hash(jobs), "n": jobs.run_config.parameters.n}
+        self.completed: Dict[int, dict] = self._load()
+        self._file = open(self.path, "a", encoding="utf-8")
+        if os.path.getsize(self.path) == 0:
+            self._write(self.header)
+
+    def _load(self) -> Dict[int, dict]:
+        if not os.path.exists(self.path):
+            return {}
+        completed = {}
+        valid_size = 0
+        with open(self.path, "rb") as f:
+            for line_number, line in enumerate(f):
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError("incomplete line")
+                    entry = json.loads(line)
+                except ValueError:
+                    # The last line is incomplete if the process died while writing it
+                    break
+                if line_number == 0:
+                    if entry != self.header:
+                        raise JobsValueError(
+                            f"Checkpoint '{self.path}' was written by a different job "
+                            f"(or with a different n). Use a new checkpoint file."
+                        )
+                else:
+                    completed[entry["idx"]] = entry["result"]
+                valid_size += len(line)
+        if valid_size < os.path.getsize(self.path):
+            # Drop the incomplete line so new entries start on a fresh line
+            os.truncate(self.path, valid_size)
+        return completed
+
+    def _write(self, entry: dict) -> None:
+        self._file.write(json.dumps(entry) + "\n")
+        self._file.flush()
+
+    def record(self, idx: int, result: "Result") -> None:
+        """Append a finished interview's position and Result to the journal."""
+        self._write({"idx": idx, "result": result.to_dict(add_edsl_version=False)})
+
+    def completed_results(self) -> list:
+        """Return the recorded Results, each with its `order` restored."""
+        from ..results import Result
+
+        results = []
+        for idx, d in self.completed.items():
+            result = Result.from_dict(d)
+            result.order = idx
+            results.append(result)
+        return results
+
+    def close(self) -> None:
+        """Sync the journal to disk and close it."""
+        if not self._file.closed:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+
+    def __enter__(self) -> "JobCheckpoint":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+
+if __name__ == "__main__":
+    import doctest
+
+    doctest.testmod(optionflags=doctest.ELLIPSIS)
@@ -17,6 +17,7 @@ if TYPE_CHECKING:
     from ..buckets import BucketCollection
 
 VisibilityType = Literal["private", "public", "unlisted"]
+SchedulerType = Literal["chunked", "sliding_window", "per_model"]
 
 @dataclass
 class RunEnvironment:
@@ -32,11 +33,20 @@ class RunEnvironment:
         bucket_collection (BucketCollection, optional): Collection of token rate limit buckets
         key_lookup (KeyLookup, optional): Manager for API keys across models
         jobs_runner_status (JobsRunnerStatus, optional): Tracker for job execution progress
+        rate_controller (AdaptiveRateController, optional): Adjusts bucket refill rates
+            and interview concurrency from observed model call outcomes
+        model_call_batcher (ModelCallBatcher, optional): Collects cache-missing model
+            calls and sends them to provider batch APIs
+        cancel_event (threading.Event, optional): Once set, the running job stops starting
+            new model calls and returns the interviews completed so far (see JobHandle)
     """
     cache: Optional[Cache] = None
     bucket_collection: Optional[Any] = None  # Using Any to avoid circular import of BucketCollection
     key_lookup: Optional[KeyLookup] = None
     jobs_runner_status: Optional["JobsRunnerStatus"] = None
+    rate_controller: Optional[Any] = None  # Using Any to avoid circular import of AdaptiveRateController
+    model_call_batcher: Optional[Any] = None
+    cancel_event: Optional[Any] = None  # threading.Event set to cancel the running job
 
 
 @dataclass
@@ -66,6 +76,28 @@ class RunParameters(Base):
         disable_remote_inference (bool): Whether to disable remote inference, default is False
         job_uuid (str, optional): UUID for the job, used for tracking
         fresh (bool): If True, ignore cache and generate new results, default is False
+        scheduler (str): How interviews are admitted for execution. "chunked" runs
+            interviews in fixed-size chunks; "sliding_window" keeps a constant number
+            in flight and starts a new one as soon as any finishes; "per_model" also keeps
+            a ready queue per model and admits interviews only while that model's
+            rate-limit buckets can serve them (default: "chunked")
+        workers (int, optional): Number of worker processes; if greater than 1 the
+            interviews are sharded across processes by Jobs.run, default is None
+        adaptive_concurrency (bool): Whether to adjust bucket refill rates and the number
+            of interviews in flight from observed latency, timeouts and rate-limit
+            errors, default is False
+        batch_mode (bool): Whether to send cache-missing model calls to the services'
+            batch APIs, in dependency waves, default is False
+        checkpoint (str, optional): Path of a progress journal. Finished interviews are
+            recorded there, and a rerun of the same job skips them, default is None
+        sink (str, optional): Path of a .jsonl, .db/.sqlite or .parquet file. Each Result is
+            written there as soon as it finishes, and the returned Results read them back
+            from the file when accessed, default is None
+        priority (int): Jobs with a higher priority get tokens first from rate-limit buckets
+            they share with other jobs, default is 0
+        deadline (float, optional): Seconds after which the job is cancelled: model calls
+            in progress finish, and the interviews completed so far are returned,
+            default is None
     """
     n: int = 1
     progress_bar: bool = False
@@ -84,6 +116,14 @@ class RunParameters(Base):
     job_uuid: Optional[str] = None
     fresh: bool = False  # if True, will not use cache and will save new results to cache
     memory_threshold: Optional[int] = None  # Threshold in bytes for Results SQLList memory management
+    scheduler: SchedulerType = "chunked"
+    workers: Optional[int] = None
+    adaptive_concurrency: bool = False
+    batch_mode: bool = False
+    checkpoint: Optional[str] = None
+    sink: Optional[str] = None
+    priority: int = 0
+    deadline: Optional[float] = None
 
     def to_dict(self, add_edsl_version=False) -> dict:
         d = asdict(self)
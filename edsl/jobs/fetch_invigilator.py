@@ -5,6 +5,8 @@ if TYPE_CHECKING:
     from ..questions import QuestionBase
     from ..agents import InvigilatorBase
     from ..key_management import KeyLookup
+    from ..buckets import AdaptiveRateController
+    from .model_call_batcher import ModelCallBatcher
     from ..interviews import Interview
 
 
@@ -14,6 +16,8 @@ class FetchInvigilator:
         interview: "Interview",
         current_answers: Optional[Dict[str, Any]] = None,
         key_lookup: Optional["KeyLookup"] = None,
+        rate_controller: Optional["AdaptiveRateController"] = None,
+        model_call_batcher: Optional["ModelCallBatcher"] = None,
     ):
         # Store a weak reference to the interview instead of a strong reference
         self._interview_ref = weakref.ref(interview)
@@ -21,6 +25,8 @@ class FetchInvigilator:
         # Store external parameters that don't create reference cycles
         self._current_answers = current_answers
         self.key_lookup = key_lookup
+        self.rate_controller = rate_controller
+        self.model_call_batcher = model_call_batcher
 
     @property
     def interview(self):
@@ -83,6 +89,8 @@ class FetchInvigilator:
             raise_validation_errors=self._raise_validation_errors,
             key_lookup=self.key_lookup,
         )
+        invigilator.rate_controller = self.rate_controller
+        invigilator.model_call_batcher = self.model_call_batcher
         return invigilator
 
     def __call__(self, question):
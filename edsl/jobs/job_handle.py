@@ -0,0 +1,104 @@
+"""
+Handles for jobs running in the background.
+
+``Jobs.start()`` runs a job in a background thread and returns a JobHandle. Several
+jobs can run side by side in one process, sharing a BucketCollection, with
+``priority`` deciding which of them gets rate-limit capacity first:
+
+    bulk = bulk_job.start(bucket_collection=bc, priority=0)
+    interactive = interactive_job.start(bucket_collection=bc, priority=10)
+    results = interactive.result()
+    partial = bulk.cancel()
+
+``JobHandle.cancel()`` stops the job without losing work: no new interviews or
+model calls are started, the model calls already in progress are allowed to finish
+(so their responses end up in the cache), the cache is flushed, and the Results of
+the interviews that completed are returned.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Any, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ..results import Results
+    from .jobs import Jobs
+
+
+class JobHandle:
+    """
+    A job running in a background thread.
+
+    Args:
+        jobs: The job to run.
+        **run_kwargs: Parameters passed on to `Jobs.run()`.
+
+    >>> from edsl.jobs import Jobs
+    >>> from edsl.caching import Cache
+    >>> handle = JobHandle(Jobs.example(), cache=Cache(), disable_remote_inference=True, disable_remote_cache=True)
+    >>> len(handle.result())
+    4
+    >>> handle.done(), handle.cancelled
+    (True, False)
+    """
+
+    def __init__(self, jobs: "Jobs", **run_kwargs: Any):
+        self.jobs = jobs
+        self._cancel_event = run_kwargs.pop("cancel_event", None) or threading.Event()
+        self._results: Optional["Results"] = None
+        self._exception: Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._run, kwargs=run_kwargs, daemon=True)
+        self._thread.start()
+
+    def __repr__(self) -> str:
+        state = "done" if self.done() else "running"
+        if self.cancelled:
+            state += ", cancelled"
+        return f"JobHandle({state})"
+
+    def _run(self, **run_kwargs: Any) -> None:
+        try:
+            self._results = self.jobs.run(cancel_event=self._cancel_event, **run_kwargs)
+        except BaseException as e:
+            self._exception = e
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether the job has been asked to cancel."""
+        return self._cancel_event.is_set()
+
+    def done(self) -> bool:
+        """Whether the job has finished (or stopped after a cancellation)."""
+        return not self._thread.is_alive()
+
+    def result(self, timeout: Optional[float] = None) -> "Results":
+        """Wait for the job to finish and return its Results.
+
+        Raises:
+            TimeoutError: If the job is still running after `timeout` seconds.
+        """
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            raise TimeoutError(f"The job did not finish within {timeout} seconds.")
+        if self._exception is not None:
+            raise self._exception
+        return self._results
+
+    def cancel(self, timeout: Optional[float] = None) -> "Results":
+        """Cancel the job and return the Results of the interviews it completed.
+
+        Waits for the model calls in progress to finish, then flushes the cache.
+        """
+        self._cancel_event.set()
+        results = self.result(timeout)
+        cache = self.jobs.run_config.environment.cache
+        if cache is not None:
+            cache.flush()
+        return results
+
+
+if __name__ == "__main__":
+    import doctest
+
+    doctest.testmod(optionflags=doctest.ELLIPSIS)
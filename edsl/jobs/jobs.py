@@ -72,6 +72,7 @@ if TYPE_CHECKING:
     from ..language_models import ModelList
     from ..caching import Cache
     from ..key_management import KeyLookup
+    from .job_handle import JobHandle
 
 VisibilityType = Literal["private", "public", "unlisted"]
 
@@ -152,6 +153,7 @@ class Jobs(Base):
         self.models: ModelList = models
 
         self._where_clauses = []
+        self._shard = None  # (shard_index, num_shards) when run as a worker shard
 
         try:
             assert self.survey.question_names_valid()
@@ -426,7 +428,7 @@ class Jobs(Base):
 
         self.replace_missing_objects()
         yield from InterviewsConstructor(
-            self, cache=self.run_config.environment.cache
+            self, cache=self.run_config.environment.cache, shard=self._shard
         ).create_interviews()
 
     def show_flow(self, filename: Optional[str] = None) -> None:
@@ -616,6 +618,7 @@ class Jobs(Base):
         import gc
         import weakref
         import asyncio
+        import threading
         from ..caching import Cache
         from ..results import Results, Result
         from ..tasks import TaskHistory
@@ -628,6 +631,16 @@ class Jobs(Base):
 
         assert isinstance(self.run_config.environment.cache, Cache)
 
+        # Split the interviews across worker processes. Workers never use the
+        # remote cache, which stays the parent's to deal with, here
+        workers = self.run_config.parameters.workers
+        if workers is not None and workers > 1:
+            from .sharded_runner import ShardedJobsRunner
+
+            return await asyncio.to_thread(
+                ShardedJobsRunner(self, num_shards=workers).run
+            )
+
         # Create the RunConfig for the job
         run_config = RunConfig(
             parameters=self.run_config.parameters,
@@ -640,6 +653,27 @@ class Jobs(Base):
                 self, n=self.run_config.parameters.n
             )
 
+        # Setup the adaptive rate controller if requested
+        if (
+            self.run_config.parameters.adaptive_concurrency
+            and self.run_config.environment.rate_controller is None
+        ):
+            from ..buckets import AdaptiveRateController
+
+            self.run_config.environment.rate_controller = AdaptiveRateController(
+                bucket_collection=self.run_config.environment.bucket_collection,
+                max_concurrent=AsyncInterviewRunner.MAX_CONCURRENT,
+            )
+
+        # Setup the model call batcher if running in batch mode
+        if (
+            self.run_config.parameters.batch_mode
+            and self.run_config.environment.model_call_batcher is None
+        ):
+            from .model_call_batcher import ModelCallBatcher
+
+            self.run_config.environment.model_call_batcher = ModelCallBatcher()
+
         # Create a shared function to process interview results
         async def process_interviews(interview_runner, results_obj):
             prev_interview_ref = None
@@ -651,7 +685,12 @@ class Jobs(Base):
                 # results_obj.append(result)
                 # key = results_obj.shelve_result(result)
                 results_obj.add_task_history_entry(interview)
-                results_obj.insert_sorted(result)
+                if sink is not None:
+                    sink.write(result)
+                else:
+                    results_obj.insert_sorted(result)
+                if checkpoint is not None:
+                    checkpoint.record(idx, result)
 
                 # Memory management: Set up reference for next iteration and clear old references
                 prev_interview_ref = weakref.ref(interview)
@@ -664,47 +703,110 @@ class Jobs(Base):
 
             # Finalize results object with cache and bucket collection
             # results_obj.insert_from_shelf()
-            results_obj.cache = results_obj.relevant_cache(
-                self.run_config.environment.cache
-            )
+            if sink is not None:
+                # Read the Results back lazily once the sink is closed (in the
+                # finally below); the cache keys were kept while writing
+                results_obj.data = sink.results_data()
+                results_obj._data_class = results_obj.data.__class__
+                results_obj.cache = self.run_config.environment.cache.subset(
+                    sink.cache_keys
+                )
+            else:
+                results_obj.cache = results_obj.relevant_cache(
+                    self.run_config.environment.cache
+                )
             results_obj.bucket_collection = (
                 self.run_config.environment.bucket_collection
             )
             return results_obj
 
+        # Open the progress journal, if any; recorded interviews are not rerun
+        checkpoint = None
+        if self.run_config.parameters.checkpoint is not None:
+            from .checkpoint import JobCheckpoint
+
+            checkpoint = JobCheckpoint(self.run_config.parameters.checkpoint, self)
+
+        # Cancel the job once its deadline has passed
+        deadline_timer = None
+        if self.run_config.parameters.deadline is not None:
+            if self.run_config.environment.cancel_event is None:
+                self.run_config.environment.cancel_event = threading.Event()
+            deadline_timer = threading.Timer(
+                self.run_config.parameters.deadline,
+                self.run_config.environment.cancel_event.set,
+            )
+            deadline_timer.daemon = True
+            deadline_timer.start()
+
+        # Open the result sink, if any; Results are written there as they finish
+        sink = None
+        if self.run_config.parameters.sink is not None:
+            from ..results.result_sink import ResultSink
+
+            sink = ResultSink.for_path(self.run_config.parameters.sink)
+
         # Core execution logic
-        interview_runner = AsyncInterviewRunner(self, run_config)
+        interview_runner = AsyncInterviewRunner(
+            self,
+            run_config,
+            skip_indices=checkpoint.completed if checkpoint is not None else None,
+        )
 
         # Create an initial Results object with appropriate traceback settings
         results = Results(
             survey=self.survey,
             data=[],
             task_history=TaskHistory(
-                include_traceback=not self.run_config.parameters.progress_bar
+                include_traceback=not self.run_config.parameters.progress_bar,
+                # With a sink, keep only the interviews needed for exception reports
+                interviews_with_exceptions_only=sink is not None,
             ),
         )
+        if checkpoint is not None:
+            for result in checkpoint.completed_results():
+                if sink is not None:
+                    sink.write(result)
+                else:
+                    results.insert_sorted(result)
 
-        if run_job_async:
-            # For async execution mode (simplified path without progress bar)
-            await process_interviews(interview_runner, results)
-        else:
-            # For synchronous execution mode (with progress bar)
-            with ProgressBarManager(
-                self, run_config, self.run_config.parameters
-            ) as stop_event:
-                try:
-                    await process_interviews(interview_runner, results)
-                except KeyboardInterrupt:
-                    print("Keyboard interrupt received. Stopping gracefully...")
-                    results = Results(
-                        survey=self.survey, data=[], task_history=TaskHistory()
-                    )
-                except Exception as e:
-                    if self.run_config.parameters.stop_on_exception:
-                        raise
-                    results = Results(
-                        survey=self.survey, data=[], task_history=TaskHistory()
-                    )
+        try:
+            if run_job_async:
+                # For async execution mode (simplified path without progress bar)
+                await process_interviews(interview_runner, results)
+            else:
+                # For synchronous execution mode (with progress bar)
+                with ProgressBarManager(
+                    self, run_config, self.run_config.parameters
+                ) as stop_event:
+                    try:
+                        await process_interviews(interview_runner, results)
+                    except KeyboardInterrupt:
+                        print("Keyboard interrupt received. Stopping gracefully...")
+                        results = Results(
+                            survey=self.survey, data=[], task_history=TaskHistory()
+                        )
+                    except Exception as e:
+                        if self.run_config.parameters.stop_on_exception:
+                            raise
+                        results = Results(
+                            survey=self.survey, data=[], task_history=TaskHistory()
+                        )
+        finally:
+            if deadline_timer is not None:
+                deadline_timer.cancel()
+            if checkpoint is not None:
+                checkpoint.close()
+            if sink is not None:
+                sink.close()
+            # Return leased tokens and close the sessions of remote buckets
+            bucket_collection = self.run_config.environment.bucket_collection
+            if bucket_collection is not None:
+                await bucket_collection.aclose()
+            # Write the entries the cache's background writer still holds
+            cache_data = getattr(self.run_config.environment.cache, "data", None)
+            if hasattr(cache_data, "flush"):
+                cache_data.flush()
 
         # Process any exceptions in the results
         if results:
@@ -742,6 +844,8 @@ class Jobs(Base):
             "jobs_runner_status",
             "bucket_collection",
             "key_lookup",
+            "rate_controller",
+            "model_call_batcher",
         ]:
             if getattr(config.environment, attr_name) is not None:
                 setattr(
@@ -749,6 +853,8 @@ class Jobs(Base):
                     attr_name,
                     getattr(config.environment, attr_name),
                 )
+        # A cancellation only applies to the run it was passed to
+        self.run_config.environment.cancel_event = config.environment.cancel_event
 
         # Replace parameters with the ones from the config
         self.run_config.parameters = config.parameters
@@ -829,6 +935,27 @@ class Jobs(Base):
             key_lookup (KeyLookup, optional): Object to manage API keys
             memory_threshold (int, optional): Memory threshold in bytes for the Results object's SQLList,
                 controlling when data is offloaded to SQLite storage
+            scheduler (str): "chunked" (default) runs interviews in chunks of EDSL_MAX_CONCURRENT_TASKS;
+                "sliding_window" keeps that many in flight and starts a new one as soon as any finishes
+                "per_model" additionally admits interviews per model, based on its rate-limit buckets
+            workers (int, optional): If greater than 1, split the interviews into this many shards
+                and run each shard in its own process (see ShardedJobsRunner)
+            adaptive_concurrency (bool): Whether to adjust bucket refill rates and the number of
+                interviews in flight at runtime from latency, timeouts and rate-limit errors (default: False)
+            rate_controller (AdaptiveRateController, optional): A preconfigured controller to use
+                instead of the default one created by adaptive_concurrency
+            batch_mode (bool): Whether to send cache-missing model calls to the services' batch APIs
+                instead of their regular endpoints; dependent questions go out in later waves (default: False)
+            checkpoint (str, optional): Path of a progress journal; finished interviews are recorded
+                as they complete, and rerunning the job with the same path skips them
+            sink (str, optional): Path of a .jsonl, .db/.sqlite or .parquet file that each Result is
+                written to as it completes; the returned Results are read back from it lazily
+            priority (int): Jobs with a higher priority get tokens first from rate-limit buckets
+                shared with other jobs (default: 0)
+            deadline (float, optional): Seconds after which the job is cancelled; model calls in
+                progress finish and the interviews completed so far are returned
+            cancel_event (threading.Event, optional): Event that cancels the job when set
+                (see `start()` and JobHandle)
 
         Returns:
             Results: A Results object containing all responses and metadata
@@ -889,6 +1016,25 @@ class Jobs(Base):
             key_lookup (KeyLookup, optional): Object to manage API keys
             memory_threshold (int, optional): Memory threshold in bytes for the Results object's SQLList,
                 controlling when data is offloaded to SQLite storage
+            scheduler (str): "chunked" (default) runs interviews in chunks of EDSL_MAX_CONCURRENT_TASKS;
+                "sliding_window" keeps that many in flight and starts a new one as soon as any finishes
+                "per_model" additionally admits interviews per model, based on its rate-limit buckets
+            adaptive_concurrency (bool): Whether to adjust bucket refill rates and the number of
+                interviews in flight at runtime from latency, timeouts and rate-limit errors (default: False)
+            rate_controller (AdaptiveRateController, optional): A preconfigured controller to use
+                instead of the default one created by adaptive_concurrency
+            batch_mode (bool): Whether to send cache-missing model calls to the services' batch APIs
+                instead of their regular endpoints; dependent questions go out in later waves (default: False)
+            checkpoint (str, optional): Path of a progress journal; finished interviews are recorded
+                as they complete, and rerunning the job with the same path skips them
+            sink (str, optional): Path of a .jsonl, .db/.sqlite or .parquet file that each Result is
+                written to as it completes; the returned Results are read back from it lazily
+            priority (int): Jobs with a higher priority get tokens first from rate-limit buckets
+                shared with other jobs (default: 0)
+            deadline (float, optional): Seconds after which the job is cancelled; model calls in
+                progress finish and the interviews completed so far are returned
+            cancel_event (threading.Event, optional): Event that cancels the job when set
+                (see `start()` and JobHandle)
 
         Returns:
             Results: A Results object containing all responses and metadata
@@ -912,6 +1058,25 @@ class Jobs(Base):
 
         return await self._execute_with_remote_cache(run_job_async=True)
 
+    def start(self, **kwargs) -> "JobHandle":
+        """
+        Starts running the job in a background thread and returns a handle to it.
+
+        Takes the same parameters as `run()`. Use the handle's `result()` to wait for
+        the Results, or `cancel()` to stop the job early and get the Results of the
+        interviews completed so far.
+
+        Example:
+            >>> from edsl.jobs import Jobs
+            >>> from edsl.caching import Cache
+            >>> handle = Jobs.example().start(cache=Cache(), disable_remote_inference=True)
+            >>> len(handle.result())
+            4
+        """
+        from .job_handle import JobHandle
+
+        return JobHandle(self, **kwargs)
+
     def __repr__(self) -> str:
         """Return an eval-able string representation of the Jobs instance."""
         return f"Jobs(survey={repr(self.survey)}, agents={repr(self.agents)}, models={repr(self.models)}, scenarios={repr(self.scenarios)})"
@@ -1,4 +1,4 @@
-from typing import Generator, TYPE_CHECKING
+from typing import Generator, Optional, Tuple, TYPE_CHECKING
 from itertools import product
 
 if TYPE_CHECKING:
@@ -7,9 +7,17 @@ if TYPE_CHECKING:
     from ..caching import Cache
 
 class InterviewsConstructor:
-    def __init__(self, jobs: "Jobs", cache: "Cache"):
+    def __init__(
+        self, jobs: "Jobs", cache: "Cache", shard: Optional[Tuple[int, int]] = None
+    ):
+        """
+        :param shard: Optional (shard_index, num_shards). When given, only every
+            num_shards-th agent x scenario x model combination, starting at
+            shard_index, is generated.
+        """
         self.jobs = jobs
         self.cache = cache
+        self.shard = shard
 
     def create_interviews(self) -> Generator["Interview", None, None]:
         """
@@ -22,35 +30,53 @@ class InterviewsConstructor:
         """
         from ..interviews import Interview
 
-        agent_index = {
-            hash(agent): index for index, agent in enumerate(self.jobs.agents)
-        }
-        model_index = {
-            hash(model): index for index, model in enumerate(self.jobs.models)
-        }
-        scenario_index = {
-            hash(scenario): index for index, scenario in enumerate(self.jobs.scenarios)
-        }
-
-        for agent, scenario, model in product(
-            self.jobs.agents, self.jobs.scenarios, self.jobs.models
+        # Everything that is the same for many interviews is computed once here:
+        # content hashes of each agent, scenario and model, and of the survey.
+        # Interviews then share the survey, and draw() copies only the
+        # questions it randomizes.
+        survey = self.jobs.survey
+        survey_hash = hash(survey)
+        parameters = self.jobs.run_config.parameters
+
+        def hashed(objects):
+            hashes = [hash(obj) for obj in objects]
+            index = {h: i for i, h in enumerate(hashes)}
+            return [(obj, h, index[h]) for obj, h in zip(objects, hashes)]
+
+        for position, (
+            (agent, agent_hash, agent_index),
+            (scenario, scenario_hash, scenario_index),
+            (model, model_hash, model_index),
+        ) in enumerate(
+            product(
+                hashed(self.jobs.agents),
+                hashed(self.jobs.scenarios),
+                hashed(self.jobs.models),
+            )
         ):
+            if self.shard is not None and position % self.shard[1] != self.shard[0]:
+                continue
             yield Interview(
-                survey=self.jobs.survey.draw(), # this draw is to support shuffling of question options
+                survey=survey.draw(), # this draw is to support shuffling of question options
                 agent=agent,
                 scenario=scenario,
                 model=model,
                 cache=self.cache,
-                skip_retry=self.jobs.run_config.parameters.skip_retry,
-                raise_validation_errors=self.jobs.run_config.parameters.raise_validation_errors,
+                skip_retry=parameters.skip_retry,
+                raise_validation_errors=parameters.raise_validation_errors,
                 indices={
-                    "agent": agent_index[hash(agent)],
-                    "model": model_index[hash(model)],
-                    "scenario": scenario_index[hash(scenario)],
+                    "agent": agent_index,
+                    "model": model_index,
+                    "scenario": scenario_index,
+                },
+                component_hashes={
+                    "agent": agent_hash,
+                    "survey": survey_hash,
+                    "scenario": scenario_hash,
+                    "model": model_hash,
                 },
             )
 
-
 if __name__ == "__main__":
     #test_gc()
     import doctest
@@ -0,0 +1,130 @@
+"""
+Collects model calls and sends them to provider batch APIs.
+
+With ``Jobs.run(batch_mode=True)``, interviews run as usual, but a model call that
+misses the cache does not go to the service's regular endpoint. Instead it is
+handed to a ModelCallBatcher, and the calling coroutine waits. Once no new calls
+have arrived for a short while, every interview in flight is blocked on the
+batcher, and the collected calls are submitted to the service's batch endpoint
+(see ``InferenceServiceABC.async_submit_batch``). When the batch is done, each
+waiting call gets its response and continues through the normal path: the
+response is stored in the cache and the answer is validated.
+
+Questions that depend on earlier answers (through piping, memory or skip rules)
+only make their calls once those answers exist, so they go out in a later batch.
+Each flush is therefore one dependency wave.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Dict, List, Optional, Set, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ..inference_services import InferenceServiceABC
+    from ..language_models import LanguageModel
+
+
+class ModelCallBatcher:
+    """
+    Collects cache-missing model calls and submits them in batches.
+
+    Args:
+        idle_interval: Seconds without a new call after which collected calls are
+            submitted.
+        max_batch_size: Number of collected calls that triggers a submission
+            without waiting. It is also the number of interviews kept in flight.
+
+    >>> batcher = ModelCallBatcher()
+    >>> from edsl.language_models import Model
+    >>> batcher.supports(Model("test"))
+    True
+    >>> batcher.waves
+    0
+    """
+
+    def __init__(self, idle_interval: float = 0.05, max_batch_size: int = 50_000):
+        self.idle_interval = idle_interval
+        self.max_batch_size = max_batch_size
+        self.waves = 0
+        self.batches_submitted = 0
+        self._pending: List[Tuple["LanguageModel", dict, asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._batch_tasks: Set[asyncio.Task] = set()
+        self._services: Dict[str, Optional["InferenceServiceABC"]] = {}
+
+    def __repr__(self) -> str:
+        return f"ModelCallBatcher(waves={self.waves}, batches_submitted={self.batches_submitted})"
+
+    def _service(self, model: "LanguageModel") -> Optional["InferenceServiceABC"]:
+        name = model._inference_service_
+        if name not in self._services:
+            from ..inference_services import default
+
+            self._services[name] = default.service_names_to_classes().get(name)
+        return self._services[name]
+
+    def supports(self, model: "LanguageModel") -> bool:
+        """Return True if the model's service has a batch API."""
+        service = self._service(model)
+        return service is not None and service.supports_batch
+
+    async def execute_model_call(self, model: "LanguageModel", **params: Any) -> Any:
+        """Queue a model call for the next batch and wait for its raw response."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((model, params, future))
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        else:
+            self._flush_handle = loop.call_later(self.idle_interval, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        self._flush_handle = None
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+        self.waves += 1
+
+        by_model: Dict[int, List[Tuple["LanguageModel", dict, asyncio.Future]]] = {}
+        for call in pending:
+            by_model.setdefault(id(call[0]), []).append(call)
+        for calls in by_model.values():
+            task = asyncio.ensure_future(self._run_batch(calls))
+            self._batch_tasks.add(task)
+            task.add_done_callback(self._batch_tasks.discard)
+
+    async def _run_batch(
+        self, calls: List[Tuple["LanguageModel", dict, asyncio.Future]]
+    ) -> None:
+        model = calls[0][0]
+        service = self._service(model)
+        try:
+            batch_id = await service.async_submit_batch(
+                model, [params for _, params, _ in calls]
+            )
+            self.batches_submitted += 1
+            while (responses := await service.async_poll_batch(model, batch_id)) is None:
+                await asyncio.sleep(service.batch_poll_interval)
+        except Exception as e:
+            for _, _, future in calls:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, _, future), response in zip(calls, responses):
+            if future.done():
+                continue
+            if isinstance(response, BaseException):
+                future.set_exception(response)
+            else:
+                future.set_result(response)
+
+
+if __name__ == "__main__":
+    import doctest
+
+    doctest.testmod(optionflags=doctest.ELLIPSIS)
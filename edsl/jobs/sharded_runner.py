@@ -0,0 +1,287 @@
+"""
+Multi-process execution of a job by splitting its interviews into shards.
+
+A single event loop in a single process eventually becomes CPU-bound on prompt
+rendering, answer validation, result construction and hashing. ShardedJobsRunner
+splits the agent x scenario x model product into shards, runs each shard in a
+separate worker process with its own event loop, and merges the per-shard Results
+back into the original interview order.
+
+Rate limits and the cache stay consistent across shards:
+
+- Each worker receives an equal share of every bucket's capacity and refill rate,
+  so the aggregate request and token rates never exceed the configured limits.
+  If a remote token bucket server or a shared token bucket file is configured,
+  workers share it instead.
+- Workers read from the parent's cache (the same SQLite file, or a snapshot of an
+  in-memory cache) and send back only the entries they created, which the parent
+  then stores.
+- The sharded run happens inside the parent's `Jobs._execute_with_remote_cache`,
+  so the remote cache is dealt with once, by the parent; workers never use it.
+
+Workers are started with the "spawn" start method, so scripts that call
+``Jobs.run(workers=N)`` need the usual ``if __name__ == "__main__":`` guard.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Dict, List, Optional, TYPE_CHECKING
+
+from .exceptions import JobsValueError
+
+if TYPE_CHECKING:
+    from ..buckets import BucketCollection
+    from ..caching import Cache
+    from ..results import Results
+    from .jobs import Jobs
+
+
+def _bucket_limits(
+    bucket_collection: "BucketCollection", num_shards: int
+) -> Dict[str, Dict[str, List[float]]]:
+    """Return each service's (capacity, refill_rate) pairs divided by num_shards.
+
+    >>> from edsl.buckets import BucketCollection
+    >>> from edsl.language_models import Model
+    >>> bc = BucketCollection.from_models([Model("test", rpm=120, tpm=600)])
+    >>> _bucket_limits(bc, 2)
+    {'test': {'requests': [1.0, 1.0], 'tokens': [5.0, 5.0]}}
+    """
+    limits = {}
+    for service, model_buckets in bucket_collection.services_to_buckets.items():
+        limits[service] = {
+            bucket_type: [
+                bucket.capacity / num_shards,
+                bucket.refill_rate / num_shards,
+            ]
+            for bucket_type, bucket in (
+                ("requests", model_buckets.requests_bucket),
+                ("tokens", model_buckets.tokens_bucket),
+            )
+        }
+    return limits
+
+
+def _apply_bucket_limits(
+    bucket_collection: "BucketCollection", limits: Dict[str, Dict[str, List[float]]]
+) -> None:
+    """Replace the buckets of every known service with ones using the given limits."""
+    from ..buckets import TokenBucket
+
+    for service, model_buckets in bucket_collection.services_to_buckets.items():
+        if service not in limits:
+            continue
+        for bucket_type in ("requests", "tokens"):
+            capacity, refill_rate = limits[service][bucket_type]
+            setattr(
+                model_buckets,
+                f"{bucket_type}_bucket",
+                TokenBucket(
+                    bucket_name=service,
+                    bucket_type=bucket_type,
+                    capacity=capacity,
+                    refill_rate=refill_rate,
+                    remote_url=bucket_collection.remote_url,
+                    shared_path=bucket_collection.shared_path,
+                ),
+            )
+
+
+def _run_shard(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Run one shard of a job in a worker process.
+
+    This is the process-pool entry point, so it only takes and returns plain,
+    picklable dictionaries.
+    """
+    from ..caching import Cache, CacheEntry
+    from ..caching.sql_dict import SQLiteDict
+    from ..key_management import KeyLookup
+    from .data_structures import RunConfig, RunEnvironment, RunParameters
+    from .jobs import Jobs
+
+    shard_index, num_shards = payload["shard_index"], payload["num_shards"]
+
+    jobs = Jobs.from_dict(payload["jobs"])
+    jobs._shard = (shard_index, num_shards)
+
+    if payload["cache_db_path"] is not None:
+        data = SQLiteDict(payload["cache_db_path"])
+    else:
+        data = {k: CacheEntry.from_dict(v) for k, v in payload["cache_data"].items()}
+    # New entries are held back and returned to the parent, which does the writing
+    cache = Cache(data=data, immediate_write=False)
+
+    key_lookup = (
+        KeyLookup.from_dict(payload["key_lookup"])
+        if payload["key_lookup"] is not None
+        else None
+    )
+    jobs.run_config = RunConfig(
+        environment=RunEnvironment(cache=cache, key_lookup=key_lookup),
+        parameters=RunParameters(**payload["parameters"]),
+    )
+    bucket_collection = jobs.create_bucket_collection()
+    if payload["bucket_limits"] is not None:
+        _apply_bucket_limits(bucket_collection, payload["bucket_limits"])
+    jobs.run_config.add_bucket_collection(bucket_collection)
+
+    results = asyncio.run(jobs._execute_with_remote_cache(run_job_async=True))
+
+    n = jobs.run_config.parameters.n
+    result_dicts = []
+    for result in results:
+        # Map the shard-local position back to the position in the full job
+        local_position, iteration = divmod(result.order, n)
+        result.order = (local_position * num_shards + shard_index) * n + iteration
+        result_dicts.append(result.to_dict())
+
+    return {
+        "results": result_dicts,
+        "task_history": results.task_history.to_dict(add_edsl_version=False),
+        "new_entries": {k: v.to_dict() for k, v in cache.new_entries.items()},
+    }
+
+
+class ShardedJobsRunner:
+    """
+    Runs a job's interviews across several worker processes.
+
+    Interviews are assigned to shards round-robin over the agent x scenario x model
+    product, so every shard gets a similar mix of agents, scenarios and models.
+
+    >>> from edsl.jobs import Jobs
+    >>> runner = ShardedJobsRunner(Jobs.example(), num_shards=2)
+    >>> runner.num_shards
+    2
+    """
+
+    def __init__(self, jobs: "Jobs", num_shards: int):
+        self.jobs = jobs
+        self.num_shards = num_shards
+
+    def _check_shardable(self) -> None:
+        if self.jobs.run_config.parameters.checkpoint is not None:
+            raise JobsValueError(
+                "A checkpoint cannot be used together with `workers`."
+            )
+        if self.jobs.run_config.parameters.sink is not None:
+            raise JobsValueError("A result sink cannot be used together with `workers`.")
+        if self.jobs.run_config.environment.cancel_event is not None:
+            raise JobsValueError("A job running with `workers` cannot be cancelled.")
+        for agent in self.jobs.agents:
+            if hasattr(agent, "answer_question_directly"):
+                raise JobsValueError(
+                    "Agents with direct question answering methods cannot be sent to "
+                    "worker processes. Run this job without `workers`."
+                )
+
+    def _cache_payload(self, cache: "Cache") -> Dict[str, Any]:
+        """Return what workers need to read the parent's cache.
+
+        Workers see the entries the parent holds back (see `immediate_write`) too:
+        a database file gets them written first, along with the entries its
+        background writer still holds, and a snapshot includes them.
+        """
+        from ..caching.sql_dict import SQLiteDict
+
+        if isinstance(cache.data, SQLiteDict) and ":memory:" not in cache.data.db_path:
+            for key, entry in cache.new_entries_to_write_later.items():
+                cache.data[key] = entry
+            cache.new_entries_to_write_later = {}
+            cache.data.flush()
+            return {"cache_db_path": cache.data.db_path, "cache_data": None}
+        entries = {**dict(cache.data.items()), **cache.new_entries_to_write_later}
+        return {
+            "cache_db_path": None,
+            "cache_data": {k: v.to_dict() for k, v in entries.items()},
+        }
+
+    def _payloads(self) -> List[Dict[str, Any]]:
+        environment = self.jobs.run_config.environment
+        parameters = self.jobs.run_config.parameters.to_dict()
+        parameters.update(
+            workers=None,
+            progress_bar=False,
+            print_exceptions=False,
+            disable_remote_cache=True,
+            disable_remote_inference=True,
+        )
+        bucket_collection = environment.bucket_collection
+        if (
+            bucket_collection is None
+            or bucket_collection.remote_url is not None
+            or bucket_collection.shared_path is not None
+        ):
+            bucket_limits = None
+        else:
+            bucket_limits = _bucket_limits(bucket_collection, self.num_shards)
+
+        shared = {
+            "jobs": self.jobs.to_dict(),
+            "num_shards": self.num_shards,
+            "parameters": parameters,
+            "bucket_limits": bucket_limits,
+            "key_lookup": (
+                environment.key_lookup.to_dict()
+                if environment.key_lookup is not None
+                else None
+            ),
+            **self._cache_payload(environment.cache),
+        }
+        return [
+            {**shared, "shard_index": shard_index}
+            for shard_index in range(self.num_shards)
+        ]
+
+    def _merge(self, shard_outputs: List[Dict[str, Any]]) -> "Results":
+        from ..caching import CacheEntry
+        from ..results import Results, Result
+        from ..tasks import TaskHistory
+
+        cache = self.jobs.run_config.environment.cache
+        parameters = self.jobs.run_config.parameters
+
+        new_entries = {}
+        data = []
+        task_history = TaskHistory(include_traceback=not parameters.progress_bar)
+        for output in shard_outputs:
+            for key, entry in output["new_entries"].items():
+                if key not in cache.data:
+                    new_entries[key] = CacheEntry.from_dict(entry)
+            data.extend(Result.from_dict(d) for d in output["results"])
+            task_history.extend(TaskHistory.from_dict(output["task_history"]))
+        cache.add_from_dict(new_entries, write_now=cache.immediate_write)
+
+        data.sort(key=lambda result: result.order)
+        results = Results(survey=self.jobs.survey, data=data, task_history=task_history)
+        results.cache = results.relevant_cache(cache)
+        results.bucket_collection = self.jobs.run_config.environment.bucket_collection
+        return results
+
+    def run(self) -> "Results":
+        """Run all shards to completion and return the merged Results."""
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        from .results_exceptions_handler import ResultsExceptionsHandler
+
+        self._check_shardable()
+        payloads = self._payloads()
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(
+            max_workers=self.num_shards, mp_context=context
+        ) as executor:
+            shard_outputs = list(executor.map(_run_shard, payloads))
+
+        results = self._merge(shard_outputs)
+        if results:
+            ResultsExceptionsHandler(
+                results, self.jobs.run_config.parameters
+            ).handle_exceptions()
+        return results
+
+
+if __name__ == "__main__":
+    import doctest
+
+    doctest.testmod(optionflags=doctest.ELLIPSIS)
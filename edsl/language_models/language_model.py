@@ -50,6 +50,7 @@ from ..data_transfer_models import (
 
 if TYPE_CHECKING:
     from .price_manager import ResponseCost
+    from ..caching.cache_entry import CacheParameters
     from ..caching import Cache
     from ..scenarios import FileStore
     from ..questions import QuestionBase
@@ -689,6 +690,78 @@ class LanguageModel(
         """
         return cls.response_handler.parse_response(raw_response)
 
+    def _cache_parameters(self) -> "CacheParameters":
+        """Return the parameters that go into cache keys, with their canonical JSON.
+
+        The result is reused until the model's parameters change, so the parameters
+        are not serialized again for every cache lookup.
+
+        >>> m = LanguageModel.example(test_model=True)
+        >>> m._cache_parameters() is m._cache_parameters()
+        True
+        """
+        from ..caching.cache_entry import CacheParameters
+
+        memo = self.__dict__.get("_cache_parameters_memo")
+        if memo is not None and memo[0] == self.parameters:
+            return memo[1]
+        cache_parameters = self.parameters.copy()
+        if self.model == "test":
+            cache_parameters.pop("canned_response", None)
+        cache_parameters = CacheParameters(cache_parameters)
+        self._cache_parameters_memo = (self.parameters.copy(), cache_parameters)
+        return cache_parameters
+
+    def _cache_call_params(
+        self,
+        user_prompt: str,
+        system_prompt: str,
+        iteration: int = 0,
+        files_list: Optional[List["FileStore"]] = None,
+    ) -> dict:
+        """Return the inputs of the cache key for a call with these prompts."""
+        # Add file hashes to the prompt if files are provided
+        if files_list:
+            files_hash = "+".join([str(hash(file)) for file in files_list])
+            user_prompt_with_hashes = user_prompt + f" {files_hash}"
+        else:
+            user_prompt_with_hashes = user_prompt
+
+        return {
+            "model": str(self.model),
+            "parameters": self._cache_parameters(),
+            "system_prompt": system_prompt,
+            "user_prompt": user_prompt_with_hashes,
+            "iteration": iteration,
+        }
+
+    async def async_is_cached(
+        self,
+        user_prompt: str,
+        system_prompt: str,
+        cache: "Cache",
+        iteration: int = 0,
+        files_list: Optional[List["FileStore"]] = None,
+    ) -> bool:
+        """Check whether the response to a call with these prompts is in the cache.
+
+        The cache is probed without recording a hit, so that a task can find out
+        whether it needs rate-limit capacity before making the call.
+
+        >>> import asyncio
+        >>> from edsl import Cache
+        >>> m = LanguageModel.example(test_model=True)
+        >>> c = Cache()
+        >>> asyncio.run(m.async_is_cached("Hello", "hello", c))
+        False
+        >>> _ = m._get_intended_model_call_outcome(user_prompt="Hello", system_prompt="hello", cache=c)
+        >>> asyncio.run(m.async_is_cached("Hello", "hello", c))
+        True
+        """
+        return await cache.acontains(
+            **self._cache_call_params(user_prompt, system_prompt, iteration, files_list)
+        )
+
     async def _async_get_intended_model_call_outcome(
         self,
         user_prompt: str,
@@ -715,7 +788,9 @@ class LanguageModel(
             cache: The cache object to use for storing/retrieving responses
             iteration: The iteration number, used for the cache key
             files_list: Optional list of files to include in the prompt
-            invigilator: Optional invigilator object, not used in caching
+            invigilator: Optional invigilator object, not used in caching. If it
+                carries a rate_controller, the call outcome is reported to it. If
+                it carries a model_call_batcher, cache misses go to a batch API
 
         Returns:
             ModelResponse: Response object with the model output and metadata
@@ -726,97 +801,112 @@ class LanguageModel(
             >>> m._get_intended_model_call_outcome(user_prompt="Hello", system_prompt="hello", cache=Cache())
             ModelResponse(...)
         """
-        # Add file hashes to the prompt if files are provided
-        if files_list:
-            files_hash = "+".join([str(hash(file)) for file in files_list])
-            user_prompt_with_hashes = user_prompt + f" {files_hash}"
-        else:
-            user_prompt_with_hashes = user_prompt
-
-        # Prepare parameters for cache lookup
-        cache_parameters = self.parameters.copy()
-        if self.model == "test":
-            cache_parameters.pop("canned_response", None)
-        cache_call_params = {
-            "model": str(self.model),
-            "parameters": cache_parameters,
-            "system_prompt": system_prompt,
-            "user_prompt": user_prompt_with_hashes,
-            "iteration": iteration,
-        }
+        cache_call_params = self._cache_call_params(
+            user_prompt, system_prompt, iteration, files_list
+        )
 
-        # Try to fetch from cache
-        cached_response, cache_key = cache.fetch(**cache_call_params)
+        # Try to fetch from cache, off the event loop for database-backed caches
+        cached_response, cache_key = await cache.afetch(**cache_call_params)
+        if cached_response is None:
+            # Another interview may be making the same call: share its response
+            cached_response = await cache.await_in_flight(cache_key)
         if cache_used := cached_response is not None:
             # Cache hit - use the cached response
             response = json.loads(cached_response)
         else:
-            # Cache miss - make a new API call
-            # Determine whether to use remote or local execution
-            f = (
-                self.remote_async_execute_model_call
-                if hasattr(self, "remote") and self.remote
-                else self.async_execute_model_call
-            )
-
-            # Prepare parameters for the model call
-            params = {
-                "user_prompt": user_prompt,
-                "system_prompt": system_prompt,
-                "files_list": files_list,
-            }
-            # Add question_name parameter for test models
-            if self.model == "test" and invigilator:
-                params["question_name"] = invigilator.question.question_name
-            # Get timeout from configuration
-            from ..config import CONFIG
-            import logging
-
-            logger = logging.getLogger(__name__)
-            base_timeout = float(CONFIG.get("EDSL_API_TIMEOUT"))
-
-            # Adjust timeout if files are present
-            import time
-
-            start = time.time()
-            if files_list:
-                # Calculate total size of attached files in MB
-                file_sizes = []
-                for file in files_list:
-                    # Try different attributes that might contain the file content
-                    if hasattr(file, "base64_string") and file.base64_string:
-                        file_sizes.append(len(file.base64_string) / (1024 * 1024))
-                    elif hasattr(file, "content") and file.content:
-                        file_sizes.append(len(file.content) / (1024 * 1024))
-                    elif hasattr(file, "data") and file.data:
-                        file_sizes.append(len(file.data) / (1024 * 1024))
-                    else:
-                        # Default minimum size if we can't determine actual size
-                        file_sizes.append(1)  # Assume at least 1MB
-                total_size_mb = sum(file_sizes)
-
-                # Increase timeout proportionally to file size
-                # For each MB of file size, add 10 seconds to the timeout (adjust as needed)
-                size_adjustment = total_size_mb * 10
-
-                # Cap the maximum timeout adjustment at 5 minutes (300 seconds)
-                size_adjustment = min(size_adjustment, 300)
-
-                TIMEOUT = base_timeout + size_adjustment
-
-                logger.info(
-                    f"Adjusted timeout for API call with {len(files_list)} files (total size: {total_size_mb:.2f}MB). Base timeout: {base_timeout}s, New timeout: {TIMEOUT}s"
+            # Register the call so identical concurrent calls wait for it
+            flight = cache.start_flight(cache_key)
+            output = None
+            try:
+                # Cache miss - make a new API call
+                # Determine whether to use remote or local execution
+                f = (
+                    self.remote_async_execute_model_call
+                    if hasattr(self, "remote") and self.remote
+                    else self.async_execute_model_call
                 )
-            else:
-                TIMEOUT = base_timeout
 
-            # Execute the model call with timeout
-            response = await asyncio.wait_for(f(**params), timeout=TIMEOUT)
-            # Store the response in the cache
-            new_cache_key = cache.store(
-                **cache_call_params, response=response, service=self._inference_service_
-            )
-            assert new_cache_key == cache_key  # Verify cache key integrity
+                # Prepare parameters for the model call
+                params = {
+                    "user_prompt": user_prompt,
+                    "system_prompt": system_prompt,
+                    "files_list": files_list,
+                }
+                # Add question_name parameter for test models
+                if self.model == "test" and invigilator:
+                    params["question_name"] = invigilator.question.question_name
+                # Get timeout from configuration
+                from ..config import CONFIG
+                import logging
+
+                logger = logging.getLogger(__name__)
+                base_timeout = float(CONFIG.get("EDSL_API_TIMEOUT"))
+
+                # Adjust timeout if files are present
+                import time
+
+                start = time.time()
+                if files_list:
+                    # Calculate total size of attached files in MB
+                    file_sizes = []
+                    for file in files_list:
+                        # Try different attributes that might contain the file content
+                        if hasattr(file, "base64_string") and file.base64_string:
+                            file_sizes.append(len(file.base64_string) / (1024 * 1024))
+                        elif hasattr(file, "content") and file.content:
+                            file_sizes.append(len(file.content) / (1024 * 1024))
+                        elif hasattr(file, "data") and file.data:
+                            file_sizes.append(len(file.data) / (1024 * 1024))
+                        else:
+                            # Default minimum size if we can't determine actual size
+                            file_sizes.append(1)  # Assume at least 1MB
+                    total_size_mb = sum(file_sizes)
+
+                    # Increase timeout proportionally to file size
+                    # For each MB of file size, add 10 seconds to the timeout (adjust as needed)
+                    size_adjustment = total_size_mb * 10
+
+                    # Cap the maximum timeout adjustment at 5 minutes (300 seconds)
+                    size_adjustment = min(size_adjustment, 300)
+
+                    TIMEOUT = base_timeout + size_adjustment
+
+                    logger.info(
+                        f"Adjusted timeout for API call with {len(files_list)} files (total size: {total_size_mb:.2f}MB). Base timeout: {base_timeout}s, New timeout: {TIMEOUT}s"
+                    )
+                else:
+                    TIMEOUT = base_timeout
+
+                model_call_batcher = getattr(invigilator, "model_call_batcher", None)
+                rate_controller = getattr(invigilator, "rate_controller", None)
+                if model_call_batcher is not None and model_call_batcher.supports(self):
+                    # Batch mode: wait for the call to come back from the service's
+                    # batch API, which can take far longer than the API timeout
+                    response = await model_call_batcher.execute_model_call(self, **params)
+                else:
+                    # Execute the model call with timeout, reporting the outcome to the
+                    # adaptive rate controller if the job runs with one
+                    call_start = time.monotonic()
+                    try:
+                        response = await asyncio.wait_for(f(**params), timeout=TIMEOUT)
+                    except asyncio.TimeoutError:
+                        if rate_controller is not None:
+                            rate_controller.record_timeout(self)
+                        raise
+                    except Exception as e:
+                        if rate_controller is not None and rate_controller.is_rate_limit_error(e):
+                            rate_controller.record_rate_limited(self)
+                        raise
+                    if rate_controller is not None:
+                        rate_controller.record_success(self, time.monotonic() - call_start)
+                # Store the response in the cache
+                new_cache_key = await cache.astore(
+                    **cache_call_params, response=response, service=self._inference_service_
+                )
+                assert new_cache_key == cache_key  # Verify cache key integrity
+                output = json.dumps(response)
+            finally:
+                cache.end_flight(cache_key, flight, output)
 
         # Calculate cost for the response
         cost = self.cost(response)
@@ -1154,26 +1244,15 @@ class LanguageModel(
         """
         from copy import deepcopy
         from types import MethodType
-        from ..caching import Cache
 
         # Create a deep copy of this model instance
         new_instance = deepcopy(self)
         print("Cache entries", len(cache))
 
-        # Filter the cache to only include entries for this model
-        new_instance.cache = Cache(
-            data={k: v for k, v in cache.items() if v.model == self.model}
-        )
+        # A read-only view of the entries for this model; nothing is copied
+        new_instance.cache = cache.for_model(self.model)
         print("Cache entries with same model", len(new_instance.cache))
 
-        # Store prompt lists for reference
-        new_instance.user_prompts = [
-            ce.user_prompt for ce in new_instance.cache.values()
-        ]
-        new_instance.system_prompts = [
-            ce.system_prompt for ce in new_instance.cache.values()
-        ]
-
         # Define a new async_execute_model_call that only reads from cache
         async def async_execute_model_call(
             self,
@@ -0,0 +1,359 @@
+"""
+Streaming output for job results.
+
+With ``Jobs.run(sink="results.jsonl")``, each Result is written to the sink file as
+soon as its interview finishes, instead of being kept in memory until the job ends.
+Only a small record per Result (its position in the job and where it is stored in
+the file) stays in memory. The Results object returned by the job is backed by a
+SinkResultList, which reads each Result back from the file when it is accessed.
+
+The format is chosen from the file extension:
+
+- ``.jsonl``: one serialized Result per line (see JSONLResultSink)
+- ``.db``, ``.sqlite``, ``.sqlite3``: one row per Result (see SQLiteResultSink)
+- ``.parquet``: one row per Result, requires pyarrow (see ParquetResultSink)
+
+The sink file is overwritten when a job starts writing to it.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+from abc import ABC, abstractmethod
+from collections.abc import MutableSequence
+from typing import Any, Dict, Iterable, List, Optional, Tuple, TYPE_CHECKING
+
+from .exceptions import ResultsError
+
+if TYPE_CHECKING:
+    from .result import Result
+
+
+class _Stored:
+    """Where a Result lives in a sink, in place of the Result itself."""
+
+    __slots__ = ("location", "order")
+
+    def __init__(self, location: Any, order: Any):
+        self.location = location
+        self.order = order
+
+
+class ResultSink(ABC):
+    """
+    Writes Results to a file as they complete and reads them back on demand.
+
+    Subclasses implement ``_append`` (store one Result and return its location in the
+    file) and ``read`` (load the Result at a location). Reads go through one handle
+    per sink, opened by ``_open_reader`` on the first read.
+
+    >>> import os, tempfile
+    >>> from edsl.results import Result
+    >>> path = os.path.join(tempfile.mkdtemp(), "results.jsonl")
+    >>> sink = ResultSink.for_path(path)
+    >>> sink
+    JSONLResultSink('...results.jsonl', written=0)
+    >>> for order in [1, 0]:
+    ...     r = Result.example()
+    ...     r.order = order
+    ...     sink.write(r)
+    >>> sink.close()
+    >>> data = sink.results_data()
+    >>> [r.order for r in data]
+    [0, 1]
+    >>> data[0] == Result.example()
+    True
+    """
+
+    suffixes: Tuple[str, ...] = ()
+
+    def __init__(self, path: str):
+        self.path = str(path)
+        self._stored: List[_Stored] = []
+        self.cache_keys: List[str] = []
+        # Opened on the first read and shared by every later one
+        self._read_handle: Any = None
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.path!r}, written={len(self._stored)})"
+
+    @classmethod
+    def for_path(cls, path: str) -> "ResultSink":
+        """Return a sink for the format that matches the extension of `path`."""
+        suffix = os.path.splitext(str(path))[1].lower()
+        for sink_class in (JSONLResultSink, SQLiteResultSink, ParquetResultSink):
+            if suffix in sink_class.suffixes:
+                return sink_class(path)
+        known = [s for c in ResultSink.__subclasses__() for s in c.suffixes]
+        raise ResultsError(
+            f"Cannot tell the sink format of '{path}'. Use one of these extensions: "
+            f"{', '.join(known)}."
+        )
+
+    def write(self, result: "Result") -> None:
+        """Store a finished Result, keeping only its location and order in memory."""
+        location = self._append(result)
+        self._stored.append(_Stored(location, getattr(result, "order", None)))
+        for cache_key in result["cache_keys"].values():
+            if cache_key is not None:
+                self.cache_keys.append(cache_key)
+
+    def results_data(self) -> "SinkResultList":
+        """Return the written Results, sorted by their order, as a lazy list."""
+        stored = sorted(
+            self._stored,
+            key=lambda s: (0, s.order) if s.order is not None else (1, 0),
+        )
+        return SinkResultList(stored, sink=self)
+
+    @abstractmethod
+    def _append(self, result: "Result") -> Any:
+        """Store a Result and return its location in the file."""
+        pass
+
+    @abstractmethod
+    def read(self, location: Any) -> "Result":
+        """Load the Result stored at `location`."""
+        pass
+
+    def close(self) -> None:
+        """Finish writing. The written Results can still be read afterwards."""
+        pass
+
+    def _reader(self) -> Any:
+        """Return the handle Results are read through, opening it on first use."""
+        if self._read_handle is None:
+            self._read_handle = self._open_reader()
+        return self._read_handle
+
+    def _open_reader(self) -> Any:
+        """Open a handle to read Results from the file."""
+        raise NotImplementedError
+
+    def __del__(self) -> None:
+        handle = getattr(self, "_read_handle", None)
+        if handle is not None:
+            handle.close()
+
+    def __enter__(self) -> "ResultSink":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+
+class JSONLResultSink(ResultSink):
+    """
+    Stores one serialized Result per line; the location is the byte offset.
+
+    Every line is flushed when it is written.
+    """
+
+    suffixes = (".jsonl",)
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        self._file = open(self.path, "ab")
+
+    def _append(self, result: "Result") -> int:
+        offset = self._file.tell()
+        self._file.write(json.dumps(result.to_dict()).encode("utf-8") + b"\n")
+        self._file.flush()
+        return offset
+
+    def read(self, location: int) -> "Result":
+        from .result import Result
+
+        f = self._reader()
+        f.seek(location)
+        return Result.from_dict(json.loads(f.readline()))
+
+    def _open_reader(self):
+        return open(self.path, "rb")
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self._file.close()
+
+
+class SQLiteResultSink(ResultSink):
+    """
+    Stores one serialized Result per row of a ``results`` table; the location is the
+    row id.
+
+    Every row is committed when it is written.
+    """
+
+    suffixes = (".db", ".sqlite", ".sqlite3")
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                'CREATE TABLE results (id INTEGER PRIMARY KEY, "order" INTEGER, value TEXT)'
+            )
+
+    def _append(self, result: "Result") -> int:
+        with self._conn:
+            cursor = self._conn.execute(
+                'INSERT INTO results ("order", value) VALUES (?, ?)',
+                (getattr(result, "order", None), json.dumps(result.to_dict())),
+            )
+        return cursor.lastrowid
+
+    def read(self, location: int) -> "Result":
+        from .result import Result
+
+        (value,) = (
+            self._reader()
+            .execute("SELECT value FROM results WHERE id = ?", (location,))
+            .fetchone()
+        )
+        return Result.from_dict(json.loads(value))
+
+    def _open_reader(self):
+        # Results may be read from other threads than the one that ran the job
+        return sqlite3.connect(self.path, check_same_thread=False)
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+class ParquetResultSink(ResultSink):
+    """
+    Stores one serialized Result per row of a Parquet file; the location is the row
+    group and the row within it.
+
+    Parquet files are written a row group at a time, so Results are buffered until
+    `row_group_size` of them have finished. The file can be read once the sink is
+    closed. Requires pyarrow.
+    """
+
+    suffixes = (".parquet",)
+
+    def __init__(self, path: str, row_group_size: int = 100):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("pyarrow is required to write results to Parquet")
+
+        super().__init__(path)
+        self.row_group_size = row_group_size
+        self._schema = pa.schema([("order", pa.int64()), ("value", pa.string())])
+        self._writer = pq.ParquetWriter(self.path, self._schema)
+        self._buffer: List[Tuple[Optional[int], str]] = []
+        self._row_groups_written = 0
+        self._cached_row_group: Tuple[Optional[int], list] = (None, [])
+
+    def _append(self, result: "Result") -> Tuple[int, int]:
+        location = (self._row_groups_written, len(self._buffer))
+        self._buffer.append(
+            (getattr(result, "order", None), json.dumps(result.to_dict()))
+        )
+        if len(self._buffer) >= self.row_group_size:
+            self._flush()
+        return location
+
+    def _flush(self) -> None:
+        import pyarrow as pa
+
+        if not self._buffer:
+            return
+        orders, values = zip(*self._buffer)
+        table = pa.table(
+            {"order": list(orders), "value": list(values)}, schema=self._schema
+        )
+        self._writer.write_table(table, row_group_size=len(self._buffer))
+        self._buffer = []
+        self._row_groups_written += 1
+
+    def read(self, location: Tuple[int, int]) -> "Result":
+        from .result import Result
+
+        row_group, row = location
+        # Results are usually read in order, so keep the last row group decoded
+        if self._cached_row_group[0] != row_group:
+            values = (
+                self._reader()
+                .read_row_group(row_group, columns=["value"])
+                .column("value")
+                .to_pylist()
+            )
+            self._cached_row_group = (row_group, values)
+        return Result.from_dict(json.loads(self._cached_row_group[1][row]))
+
+    def _open_reader(self):
+        import pyarrow.parquet as pq
+
+        return pq.ParquetFile(self.path)
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._flush()
+            self._writer.close()
+            self._writer = None
+
+
+class SinkResultList(MutableSequence):
+    """
+    A list of Results, some of which may be stored in a ResultSink.
+
+    Stored Results are read from the sink each time they are accessed. Results that
+    are added to the list afterwards are kept in memory. Slices and copies share the
+    sink, so they stay lazy too.
+    """
+
+    def __init__(self, data: Optional[Iterable] = None, sink: Optional[ResultSink] = None):
+        if isinstance(data, SinkResultList):
+            self._items: list = list(data._items)
+            self._sink = data._sink
+        else:
+            self._items = list(data) if data is not None else []
+            self._sink = sink
+
+    def _load(self, item: Any) -> "Result":
+        if isinstance(item, _Stored):
+            result = self._sink.read(item.location)
+            if item.order is not None:
+                result.order = item.order
+            return result
+        return item
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return SinkResultList(self._items[index], sink=self._sink)
+        return self._load(self._items[index])
+
+    def __setitem__(self, index, value) -> None:
+        self._items[index] = value
+
+    def __delitem__(self, index) -> None:
+        del self._items[index]
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self):
+        for item in self._items:
+            yield self._load(item)
+
+    def insert(self, index: int, value: "Result") -> None:
+        self._items.insert(index, value)
+
+    def __eq__(self, other) -> bool:
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    def __repr__(self) -> str:
+        return f"SinkResultList({len(self)} results, sink={self._sink!r})"
+
+
+if __name__ == "__main__":
+    import doctest
+
+    doctest.testmod(optionflags=doctest.ELLIPSIS)
@@ -10,6 +10,7 @@ branching surveys with conditional logic.
 """
 
 from __future__ import annotations
+import copy
 import re
 import random
 from collections import UserDict
@@ -261,16 +262,84 @@ class Survey(Base):
         if len(self.questions_to_randomize) == 0:
             return self
 
-        new_questions = []
-        for question in self.questions:
-            if question.question_name in self.questions_to_randomize:
-                new_questions.append(question.draw())
-            else:
-                new_questions.append(question.duplicate())
+        return self._shallow_copy(
+            {
+                question.question_name: question.draw()
+                for question in self.questions
+                if question.question_name in self.questions_to_randomize
+            }
+        )
+
+    def _questions_changed_while_answering(self) -> frozenset:
+        """Return the names of questions that an interview modifies.
+
+        Invigilators fill in question options that are templates (e.g., piped from
+        a scenario or an earlier answer) by writing them onto the question, so each
+        interview needs its own copy of these questions. The result is cached for
+        as long as the survey holds the same question objects.
+
+        >>> s = Survey.example()
+        >>> s._questions_changed_while_answering()
+        frozenset()
+        """
+        key = tuple(map(id, self.questions))
+        cached = self.__dict__.get("_changed_while_answering")
+        if cached is None or cached[0] != key:
+            names = frozenset(
+                question.question_name
+                for question in self.questions
+                if "question_options" in question.data and question.parameters
+            )
+            self._changed_while_answering = (key, names)
+        return self._changed_while_answering[1]
+
+    def _copy_for_interview(self) -> "Survey":
+        """Return a survey an interview can modify without affecting this one.
+
+        Only the questions listed by `_questions_changed_while_answering` are copied;
+        everything else is shared with this survey.
+
+        >>> s = Survey.example()
+        >>> s._copy_for_interview() is s
+        True
+        """
+        changed = self._questions_changed_while_answering()
+        if not changed:
+            return self
+        return self._shallow_copy(
+            {
+                question.question_name: copy.deepcopy(question)
+                for question in self.questions
+                if question.question_name in changed
+            }
+        )
+
+    def _shallow_copy(self, replacements: dict) -> "Survey":
+        """Return a copy sharing everything except the replaced questions.
 
-        d = self.to_dict()
-        d["questions"] = [q.to_dict() for q in new_questions]
-        return Survey.from_dict(d)
+        Rules, memory plan, instructions and the remaining questions are shared with
+        this survey, which is much cheaper than a `to_dict`/`from_dict` round trip.
+
+        >>> s = Survey.example()
+        >>> q0 = s.questions[0].duplicate()
+        >>> s2 = s._shallow_copy({"q0": q0})
+        >>> s2.questions[0] is q0, s2.questions[1] is s.questions[1]
+        (True, True)
+        >>> s2 == s
+        True
+        """
+        changed = self._questions_changed_while_answering()
+        new_survey = copy.copy(self)
+        new_survey.__dict__["_questions"] = [
+            replacements.get(question.question_name, question)
+            for question in self.questions
+        ]
+        new_survey._exporter = SurveyExport(new_survey)
+        new_survey._changed_while_answering = (
+            tuple(map(id, new_survey.questions)),
+            changed,
+        )
+        return new_survey
 
     def _process_raw_questions(self, questions: Optional[List["QuestionType"]]) -> list:
         """Process the raw questions passed to the survey."""
@@ -19,6 +19,8 @@ from .task_status_enum import TaskStatus, TaskStatusDescriptor
 from .task_status_log import TaskStatusLog
 
 if TYPE_CHECKING:
+    import threading
+
     from ..questions import QuestionBase
     from ..buckets import ModelBuckets
 
@@ -82,6 +84,9 @@ class QuestionTaskCreator(UserList):
         model_buckets: "ModelBuckets",
         token_estimator: Optional[Callable] = None,
         iteration: int = 0,
+        priority: int = 0,
+        cancel_event: Optional["threading.Event"] = None,
+        cache_probe: Optional[Callable] = None,
     ):
         """
         Initialize a QuestionTaskCreator for a specific question.
@@ -92,6 +97,11 @@ class QuestionTaskCreator(UserList):
             model_buckets: Container for rate limiting buckets (requests and tokens)
             token_estimator: Function to estimate token usage for the question (for quota management)
             iteration: The iteration number of this question (for repeated questions)
+            priority: Priority of the job when waiting for bucket capacity
+            cancel_event: Once set, the task is cancelled instead of making its call
+            cache_probe: Async function of the question returning whether its answer is
+                in the cache. If given, it is called before any bucket capacity is
+                taken, and answers in the cache skip rate limiting entirely
             
         Notes:
             - The QuestionTaskCreator starts in the NOT_STARTED state
@@ -103,6 +113,9 @@ class QuestionTaskCreator(UserList):
         self.answer_question_func = answer_question_func
         self.question = question
         self.iteration = iteration
+        self.priority = priority
+        self.cancel_event = cancel_event
+        self.cache_probe = cache_probe
 
         self.model_buckets = model_buckets
 
@@ -169,20 +182,45 @@ class QuestionTaskCreator(UserList):
         'This is an example answer'
         """
 
+        self._check_cancelled()
+        if self.cache_probe is not None:
+            return await self._run_cache_first()
+
+        requested_tokens = await self._acquire_capacity()
+        results = await self._answer()
+
+        if results.cache_used:
+            self.model_buckets.tokens_bucket.add_tokens(requested_tokens)
+            self.model_buckets.requests_bucket.add_tokens(1)
+            self.from_cache = True
+            # Turbo mode means that we don't wait for tokens or requests.
+            self.model_buckets.tokens_bucket.turbo_mode_on()
+            self.model_buckets.requests_bucket.turbo_mode_on()
+        else:
+            self.model_buckets.tokens_bucket.turbo_mode_off()
+            self.model_buckets.requests_bucket.turbo_mode_off()
+
+        return results
+
+    async def _acquire_capacity(self) -> int:
+        """Wait for token and request capacity for the call, and return the tokens taken."""
         requested_tokens = self.estimated_tokens()
         if (self.tokens_bucket.wait_time(requested_tokens)) > 0:
             self.task_status = TaskStatus.WAITING_FOR_TOKEN_CAPACITY
 
-        await self.tokens_bucket.get_tokens(requested_tokens)
+        await self.tokens_bucket.get_tokens(requested_tokens, priority=self.priority)
 
         if self.model_buckets.requests_bucket.wait_time(1) > 0:
             self.waiting = True  #  do we need this?
             self.task_status = TaskStatus.WAITING_FOR_REQUEST_CAPACITY
 
         await self.model_buckets.requests_bucket.get_tokens(
-            1, cheat_bucket_capacity=True
+            1, cheat_bucket_capacity=True, priority=self.priority
         )
+        return requested_tokens
 
+    async def _answer(self) -> Answers:
+        self._check_cancelled()
         self.task_status = TaskStatus.API_CALL_IN_PROGRESS
         try:
             results = await self.answer_question_func(
@@ -192,20 +230,57 @@ class QuestionTaskCreator(UserList):
         except Exception as e:
             self.task_status = TaskStatus.FAILED
             raise e
+        return results
+
+    def _rate_limited(self) -> bool:
+        unlimited = float("inf")
+        return not (
+            getattr(self.tokens_bucket, "capacity", None) == unlimited
+            and getattr(self.requests_bucket, "capacity", None) == unlimited
+        )
 
+    async def _run_cache_first(self) -> Answers:
+        """Run the focal task, probing the cache before taking any bucket capacity.
+
+        Answers found in the cache neither wait for nor take capacity, and leave
+        the buckets as they are (turbo mode is not used). If the answer turns out
+        to be cached only after capacity was taken, for instance because an
+        identical call finished meanwhile, the capacity is returned.
+
+        >>> qt = QuestionTaskCreator.example()
+        >>> async def cached(question):
+        ...     return True
+        >>> qt.cache_probe = cached
+        >>> qt.tokens_bucket = qt.requests_bucket = None  # never touched
+        >>> asyncio.run(qt._run_focal_task()).answer
+        'This is an example answer'
+        """
+        cached = self._rate_limited() and await self.cache_probe(self.question)
+        requested_tokens = None if cached else await self._acquire_capacity()
+        results = await self._answer()
         if results.cache_used:
-            self.model_buckets.tokens_bucket.add_tokens(requested_tokens)
-            self.model_buckets.requests_bucket.add_tokens(1)
             self.from_cache = True
-            # Turbo mode means that we don't wait for tokens or requests.
-            self.model_buckets.tokens_bucket.turbo_mode_on()
-            self.model_buckets.requests_bucket.turbo_mode_on()
-        else:
-            self.model_buckets.tokens_bucket.turbo_mode_off()
-            self.model_buckets.requests_bucket.turbo_mode_off()
-
+            if requested_tokens is not None:
+                self.tokens_bucket.add_tokens(requested_tokens)
+                self.requests_bucket.add_tokens(1)
         return results
 
+    def _check_cancelled(self) -> None:
+        """Cancel the task if its job is being cancelled, before it makes a new call.
+
+        >>> import threading
+        >>> qt = QuestionTaskCreator.example()
+        >>> qt.cancel_event = threading.Event()
+        >>> qt.cancel_event.set()
+        >>> asyncio.run(qt._run_focal_task())
+        Traceback (most recent call last):
+        ...
+        asyncio.exceptions.CancelledError
+        """
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            self.task_status = TaskStatus.CANCELLED
+            raise asyncio.CancelledError()
+
     @classmethod
     def example(cls):
         """Return an example instance of the class."""
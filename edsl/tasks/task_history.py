@@ -146,6 +146,18 @@ class TaskHistory(RepresentationMixin):
         self.total_interviews.append(interview_ref)
         self._interviews[len(self._interviews)] = interview_ref
 
+    def extend(self, other: "TaskHistory") -> None:
+        """Append the interviews recorded in another TaskHistory to this one.
+
+        >>> th = TaskHistory()
+        >>> th.extend(TaskHistory.example())
+        >>> len(th.total_interviews)
+        4
+        """
+        for interview_ref in other.total_interviews:
+            self.total_interviews.append(interview_ref)
+            self._interviews[len(self._interviews)] = interview_ref
+
     @classmethod
     def example(cls):
         """ """
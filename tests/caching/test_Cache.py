@@ -168,3 +168,58 @@ def test_caching():
     print(results2)
     assert results1 == results2
     # assert results.select("raw_model_response.how_are_you_raw_model_response").first()
+
+
+def test_afetch_and_astore_run_off_the_event_loop(tmp_path, monkeypatch):
+    import asyncio
+    import threading
+    from edsl.caching.sql_dict import SQLiteDict
+
+    cache = Cache(data=SQLiteDict(str(tmp_path / "cache.db")))
+    threads = []
+    original = SQLiteDict.__setitem__
+
+    def recording_setitem(self, key, value):
+        threads.append(threading.current_thread())
+        original(self, key, value)
+
+    monkeypatch.setattr(SQLiteDict, "__setitem__", recording_setitem)
+    call = dict(model="gpt-4o", parameters={}, system_prompt="s", user_prompt="u", iteration=1)
+
+    async def main():
+        key = await cache.astore(**call, response={"answer": 1}, service="openai")
+        return key, await cache.afetch(**call)
+
+    key, (output, fetched_key) = asyncio.run(main())
+    assert fetched_key == key and output == '{"answer": 1}'
+    assert threads and threads[0] is not threading.main_thread()
+
+    in_memory = Cache()
+    asyncio.run(in_memory.astore(**call, response={"answer": 1}, service="openai"))
+    assert in_memory.fetch(**call)[0] == '{"answer": 1}'
+
+
+def test_waiters_take_over_when_an_in_flight_call_fails():
+    import asyncio
+
+    cache = Cache()
+
+    async def call():
+        output = await cache.await_in_flight("key")
+        if output is not None:
+            return "waited"
+        flight = cache.start_flight("key")
+        await asyncio.sleep(0.01)
+        cache.end_flight("key", flight, '"output"')
+        return "called"
+
+    async def main():
+        failing = cache.start_flight("key")
+        callers = asyncio.gather(call(), call())
+        await asyncio.sleep(0)
+        cache.end_flight("key", failing, None)
+        return await callers
+
+    # after the first call fails, one caller makes the call and the other waits for it
+    assert sorted(asyncio.run(main())) == ["called", "waited"]
+    assert cache._in_flight == {}
@@ -82,3 +82,50 @@ def test_CacheEntry_repr():
     entry = CacheEntry.example()
     expected_repr = f"CacheEntry(model={repr(entry.model)}, parameters={entry.parameters}, system_prompt={repr(entry.system_prompt)}, user_prompt={repr(entry.user_prompt)}, output={repr(entry.output)}, iteration={entry.iteration}, timestamp={entry.timestamp}, service={repr(entry.service)}, validated={entry.validated})"
     assert repr(entry) == expected_repr
+
+
+def test_CacheEntry_gen_key_versions():
+    import hashlib
+    import json
+    from edsl.caching.cache_entry import CacheParameters
+
+    fields = dict(
+        model="gpt-4o",
+        parameters={"temperature": 0.5, "max_tokens": 100},
+        system_prompt="Système 🤖 " * 1000,
+        user_prompt="What's your 'name'?",
+        iteration=3,
+    )
+    legacy = hashlib.md5(
+        f"{fields['model']}{json.dumps(fields['parameters'], sort_keys=True)}"
+        f"{fields['system_prompt']}{fields['user_prompt']}{fields['iteration']}".encode()
+    ).hexdigest()
+    # version 1 keys are unchanged, with or without precomputed parameters
+    assert CacheEntry.gen_key(**fields) == legacy
+    assert CacheEntry.gen_key(**{**fields, "parameters": CacheParameters(fields["parameters"])}) == legacy
+
+    # version 2 keys do not confuse where one field ends and the next begins
+    a = {**fields, "system_prompt": "ab", "user_prompt": "c"}
+    b = {**fields, "system_prompt": "a", "user_prompt": "bc"}
+    assert CacheEntry.gen_key(**a) == CacheEntry.gen_key(**b)
+    assert CacheEntry.gen_key(**a, key_version=2) != CacheEntry.gen_key(**b, key_version=2)
+    assert len(CacheEntry.gen_key(**a, key_version=2)) == 32
+
+
+def test_CacheEntry_migrated_cache_serves_a_rerun(tmp_path):
+    from edsl.caching import Cache
+    from edsl.caching.sql_dict import SQLiteDict
+    from edsl.language_models import Model
+    from edsl.questions import QuestionFreeText
+
+    path = f"sqlite:///{tmp_path / 'cache.db'}"
+    job = QuestionFreeText.example().by(Model("test", canned_response="Hi"))
+    options = dict(disable_remote_cache=True, disable_remote_inference=True)
+    job.run(cache=Cache(data=SQLiteDict(path)), **options)
+
+    assert Cache(data=SQLiteDict(path)).migrate_keys(2) == 1
+    cache = Cache(data=SQLiteDict(path))
+    assert cache.key_version == 2
+    results = job.run(cache=cache, **options)
+    assert results.select("cache_used.*").to_list() == [True]
+    assert len(SQLiteDict(path)) == 1
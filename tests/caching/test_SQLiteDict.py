@@ -107,3 +107,55 @@ def test_SQLiteDict_keys(sqlite_dict):
 @pytest.mark.linux_only
 def test_SQLiteDict_main(sqlite_dict):
     main()
+
+
+@pytest.mark.linux_only
+def test_SQLiteDict_opening_does_not_read_entries(tmp_path, monkeypatch):
+    from edsl.caching import Cache
+    from edsl.caching.sql_dict import SQLiteDict
+
+    path = f"sqlite:///{tmp_path / 'cache.db'}"
+    SQLiteDict(path).update({f"key{i}": CacheEntry.example() for i in range(20)})
+
+    decoded = []
+    original = CacheEntry.from_dict.__func__
+    monkeypatch.setattr(
+        CacheEntry,
+        "from_dict",
+        classmethod(lambda cls, d: decoded.append(d) or original(cls, d)),
+    )
+    cache = Cache(data=SQLiteDict(path))
+    assert decoded == []
+    assert cache.data["key0"] == CacheEntry.example()
+    assert len(decoded) == 1
+
+
+@pytest.mark.linux_only
+def test_SQLiteDict_invalid_entry_is_reported_when_read(tmp_path):
+    import sqlite3
+    from edsl.caching import Cache
+    from edsl.caching.exceptions import CacheValueError
+    from edsl.caching.sql_dict import SQLiteDict
+
+    db = tmp_path / "cache.db"
+    SQLiteDict(f"sqlite:///{db}")
+    with sqlite3.connect(db) as conn:
+        conn.execute("INSERT INTO data (key, value) VALUES ('bad', '{\"model\": 1}')")
+
+    cache = Cache(data=SQLiteDict(f"sqlite:///{db}"))
+    with pytest.raises(CacheValueError, match="bad"):
+        cache.data["bad"]
+
+
+@pytest.mark.linux_only
+def test_SQLiteDict_newer_schema_is_rejected(tmp_path):
+    import sqlite3
+    from edsl.caching.exceptions import CacheError
+    from edsl.caching.sql_dict import SQLiteDict
+
+    db = tmp_path / "cache.db"
+    assert SQLiteDict(f"sqlite:///{db}").schema_version == SQLiteDict.SCHEMA_VERSION
+    with sqlite3.connect(db) as conn:
+        conn.execute("UPDATE meta SET value = '99' WHERE key = 'schema_version'")
+    with pytest.raises(CacheError, match="schema version 99"):
+        SQLiteDict(f"sqlite:///{db}")
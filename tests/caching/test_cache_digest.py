@@ -0,0 +1,39 @@
+from edsl.caching import Cache, CacheEntry
+from edsl.caching.cache_digest import KeyDigestIndex, LocalCacheSyncServer, digest_difference
+from edsl.caching.remote_cache_sync import RemoteCacheSync
+
+
+def _entries(n):
+    return {e.key: e for e in (CacheEntry.example(randomize=True) for _ in range(n))}
+
+
+def test_equal_caches_sync_with_one_request():
+    shared = _entries(2000)
+    server = LocalCacheSyncServer(Cache(data=dict(shared)))
+    diff = digest_difference(KeyDigestIndex(shared), server)
+    assert diff == {"client_missing_cacheentries": [], "server_missing_cacheentry_keys": []}
+    assert server.requests == 1 and server.keys_received == 0
+
+
+def test_sync_cost_scales_with_the_difference():
+    shared, local_only, remote_only = _entries(2000), _entries(3), _entries(4)
+    server = LocalCacheSyncServer(Cache(data={**shared, **remote_only}))
+    local = Cache(data={**shared, **local_only})
+
+    with RemoteCacheSync(None, local, print, sync_server=server):
+        assert all(key in local.data for key in remote_only)
+        new = CacheEntry.example(randomize=True)
+        local.data[new.key] = new
+
+    assert len(server.cache) == len(shared) + len(local_only) + len(remote_only) + 1
+    assert local.data.keys() == server.cache.data.keys()
+    # only the keys near the differing ones were sent, not the 2000 shared keys
+    assert server.keys_received < 500
+
+
+def test_keys_equal_to_a_prefix_are_compared():
+    entry = CacheEntry.example()
+    server = LocalCacheSyncServer(Cache(data={"ab": entry, "abc": entry}))
+    diff = digest_difference(KeyDigestIndex(["a", "abc"]), server, leaf_size=0)
+    assert [e for e in diff["client_missing_cacheentries"]] == [entry]
+    assert diff["server_missing_cacheentry_keys"] == ["a"]
@@ -0,0 +1,55 @@
+import json
+
+import pytest
+
+from edsl.caching import Cache, CacheEntry
+from edsl.caching.exceptions import CacheError
+from edsl.caching.sql_dict import SQLiteDict
+
+
+def _entries(n):
+    return {e.key: e for e in (CacheEntry.example(randomize=True) for _ in range(n))}
+
+
+@pytest.fixture
+def sqlite_cache(tmp_path):
+    return Cache(data=SQLiteDict(f"sqlite:///{tmp_path / 'cache.db'}"))
+
+
+def test_export_and_import_in_batches(sqlite_cache, tmp_path):
+    entries = _entries(25)
+    sqlite_cache.data.insert_many(entries.items())
+    path = str(tmp_path / "cache.jsonl")
+
+    exported = []
+    assert sqlite_cache.write_jsonl(path, batch_size=10, progress=exported.append) == 25
+    assert exported == [10, 20, 25]
+
+    target = Cache(data=SQLiteDict(f"sqlite:///{tmp_path / 'copy.db'}"))
+    imported = []
+    target.add_from_jsonl(path, batch_size=10, progress=imported.append, track_new_entries=False)
+    assert imported == [10, 20, 25]
+    assert target.new_entries == {}
+    assert target.data.to_dict() == entries
+
+
+def test_jsonl_format_is_unchanged(tmp_path):
+    entry = CacheEntry.example()
+    path = str(tmp_path / "cache.jsonl")
+    Cache(data={entry.key: entry}).write_jsonl(path)
+    with open(path) as f:
+        assert f.read() == json.dumps({entry.key: entry.to_dict()}) + "\n"
+    cache = Cache.from_jsonl(path)
+    assert cache.data == {entry.key: entry} and cache.new_entries == {entry.key: entry}
+
+
+def test_import_rejects_conflicting_entries(sqlite_cache, tmp_path):
+    entry = CacheEntry.example()
+    sqlite_cache.data[entry.key] = entry
+    conflicting = CacheEntry.example()
+    conflicting.output = "something else"
+    path = tmp_path / "cache.jsonl"
+    path.write_text(json.dumps({entry.key: conflicting.to_dict()}) + "\n")
+    with pytest.raises(CacheError):
+        sqlite_cache.add_from_jsonl(str(path))
+    assert sqlite_cache.data[entry.key] == entry
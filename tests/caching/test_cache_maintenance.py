@@ -0,0 +1,91 @@
+import json
+import time
+
+import pytest
+
+from edsl.caching import Cache, CacheEntry
+from edsl.caching.sql_dict import SQLiteDict
+
+
+def _entry(model="gpt-4o", age=0, size=0):
+    entry = CacheEntry.example(randomize=True)
+    entry.model = model
+    entry.timestamp = int(time.time()) - age
+    entry.output = "x" * size
+    return entry
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return Cache(data=SQLiteDict(f"sqlite:///{tmp_path / 'cache.db'}", memory_entries=100))
+
+
+def test_purge_by_age_and_model(cache):
+    old, retired, fresh = _entry(age=7200), _entry(model="gpt-3"), _entry()
+    for entry in (old, retired, fresh):
+        cache.data[entry.key] = entry
+    assert cache.purge(older_than=3600) == 1
+    assert cache.purge(models=["gpt-3"]) == 1
+    assert list(cache.data.keys()) == [fresh.key]
+    # deleted entries are gone from the memory tier too
+    assert cache.data.get(old.key) is None
+
+
+def test_evict_keeps_the_newest_entries_within_bounds(cache):
+    entries = [_entry(age=100 - i, size=1000) for i in range(10)]
+    for entry in entries:
+        cache.data[entry.key] = entry
+    assert cache.evict(max_entries=8) == 2
+    size = sum(size for *_, size in cache.data.entry_metadata())
+    assert cache.evict(max_bytes=size // 2) == 4
+    assert sorted(cache.data.keys()) == sorted(e.key for e in entries[6:])
+
+
+@pytest.mark.parametrize("in_memory", [False, True])
+def test_evict_by_size_deletes_everything_older_than_the_first_overflow(cache, in_memory):
+    if in_memory:
+        cache = Cache()
+    # From oldest to newest: two small entries, a large one, then a small one
+    entries = [_entry(age=4 - i, size=size) for i, size in enumerate([10, 10, 5000, 10])]
+    for entry in entries:
+        cache.data[entry.key] = entry
+    newest_size = dict((k, s) for k, _, _, s in cache._entry_metadata())[entries[3].key]
+    # The large entry does not fit, so the small entries older than it go too
+    assert cache.evict(max_bytes=newest_size * 3) == 3
+    assert list(cache.data.keys()) == [entries[3].key]
+
+
+def test_evict_reads_the_entries_of_an_old_database_by_age(tmp_path):
+    import sqlite3
+
+    path = tmp_path / "old.db"
+    old, new = _entry(age=10), _entry()
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE data (key VARCHAR PRIMARY KEY, value VARCHAR)")
+        conn.executemany(
+            "INSERT INTO data VALUES (?, ?)",
+            [(e.key, json.dumps(e.to_dict())) for e in (new, old)],
+        )
+    cache = Cache(data=SQLiteDict(f"sqlite:///{path}"))
+    assert cache.evict(max_entries=1) == 1
+    assert list(cache.data.keys()) == [new.key]
+
+
+def test_vacuum_shrinks_the_file(cache):
+    for _ in range(200):
+        entry = _entry(size=5000)
+        cache.data[entry.key] = entry
+    cache.evict(max_entries=0)
+    before, after = cache.vacuum()
+    assert after < before
+    assert Cache().vacuum() is None
+
+
+def test_cli_size_and_duration_parsing():
+    from edsl.cli import _parse_duration, _parse_size
+
+    assert _parse_duration("30d") == 30 * 86400
+    assert _parse_duration("90") == 90
+    assert _parse_size("2GB") == 2 * 1024**3
+    assert _parse_size("1.5kb") == 1536
+    assert _parse_size("100") == 100
@@ -0,0 +1,101 @@
+import json
+import sqlite3
+
+import pytest
+
+from edsl.caching import Cache, CacheEntry
+from edsl.caching.exceptions import CacheError
+from edsl.caching.sql_dict import SQLiteDict
+
+
+def _entries(n, model):
+    entries = {}
+    for _ in range(n):
+        entry = CacheEntry.example(randomize=True)
+        entry.model = model
+        entries[entry.key] = entry
+    return entries
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return tmp_path / "cache.db"
+
+
+def test_view_reads_only_the_entries_of_its_model(db_path, monkeypatch):
+    gpt4, others = _entries(10, "gpt-4"), _entries(50, "gpt-3.5-turbo")
+    cache = Cache(data=SQLiteDict(f"sqlite:///{db_path}"))
+    cache.data.insert_many({**gpt4, **others}.items())
+
+    decoded = []
+    original = CacheEntry.from_dict.__func__
+    monkeypatch.setattr(
+        CacheEntry,
+        "from_dict",
+        classmethod(lambda cls, d: decoded.append(d) or original(cls, d)),
+    )
+    view = cache.for_model("gpt-4")
+    assert len(view) == 10
+    assert dict(view.items()) == gpt4
+    assert len(decoded) == 10
+
+    with pytest.raises(CacheError):
+        view.data["foo"] = CacheEntry.example()
+
+
+def test_legacy_database_is_upgraded_and_indexed(db_path):
+    entries = {**_entries(3, "gpt-4"), **_entries(2, "claude")}
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("CREATE TABLE data (key VARCHAR PRIMARY KEY, value VARCHAR)")
+        conn.executemany(
+            "INSERT INTO data (key, value) VALUES (?, ?)",
+            [(key, json.dumps(entry.to_dict())) for key, entry in entries.items()],
+        )
+
+    d = SQLiteDict(f"sqlite:///{db_path}")
+    assert d.schema_version == SQLiteDict.SCHEMA_VERSION
+    assert d.count("claude") == 2
+    assert sorted(d.keys_for_model("gpt-4")) == sorted(
+        key for key, entry in entries.items() if entry.model == "gpt-4"
+    )
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM data WHERE model IS NULL").fetchone() == (0,)
+
+
+def test_subset_and_replay_model_use_views(db_path):
+    from edsl.language_models import Model
+
+    entries = _entries(5, "test")
+    cache = Cache(data=SQLiteDict(f"sqlite:///{db_path}", max_unwritten_entries=10))
+    for key, entry in entries.items():
+        cache.data[key] = entry
+
+    keys = list(entries)[:2]
+    assert cache.subset(keys + ["missing"]).data == {k: entries[k] for k in keys}
+
+    replay = Model("test").from_cache(cache)
+    assert len(replay.cache) == 5
+
+
+def test_view_of_migrated_cache_uses_its_key_version(db_path):
+    from edsl.language_models import Model
+
+    cache = Cache(data=SQLiteDict(f"sqlite:///{db_path}"))
+    call = dict(
+        model="test",
+        parameters={"temperature": 0.5},
+        system_prompt="Be brief.",
+        user_prompt="What is 1 + 1?",
+        iteration=1,
+    )
+    cache.store(**call, response={"answer": 2}, service="test")
+    cache.migrate_keys(2)
+
+    view = cache.for_model("test")
+    assert view.key_version == cache.key_version == 2
+    assert view.fetch(**call)[0] is not None
+
+    # Replaying from the migrated cache reads the view with version 2 keys
+    replay = Model("test").from_cache(cache)
+    assert replay.cache.key_version == 2
+    assert replay.cache.contains(**call)
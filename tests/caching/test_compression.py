@@ -0,0 +1,108 @@
+import sqlite3
+
+import pytest
+
+from edsl.caching import Cache, CacheEntry
+from edsl.caching.compression import EntryCodec, train_dictionary
+from edsl.caching.exceptions import CacheValueError
+from edsl.caching.sql_dict import SQLiteDict
+
+
+def _entries(n):
+    entries = []
+    for i in range(n):
+        entry = CacheEntry.example(randomize=True)
+        entry.system_prompt = "You are answering questions as if you were a human. " * 20 + entry.system_prompt
+        entry.output = f'{{"answer": "{i}"}}'
+        entries.append(entry)
+    return entries
+
+
+@pytest.fixture
+def db_url(tmp_path):
+    return f"sqlite:///{tmp_path / 'cache.db'}"
+
+
+def test_compressed_and_plain_entries_are_both_readable(db_url):
+    d = SQLiteDict(db_url)
+    plain, compressed = _entries(2)
+    d[plain.key] = plain
+    d.compress("zlib")
+    d[compressed.key] = compressed
+    assert d[plain.key] == plain and d[compressed.key] == compressed
+
+    path = db_url[len("sqlite:///"):]
+    with sqlite3.connect(path) as conn:
+        types = {t for (t,) in conn.execute("SELECT typeof(value) FROM data")}
+    assert types == {"blob"}
+
+
+def test_dictionary_shrinks_the_file_and_persists(db_url):
+    d = SQLiteDict(db_url)
+    entries = _entries(300)
+    d.update({e.key: e for e in entries})
+    before, plain = d.compress("zlib")
+    _, with_dictionary = d.compress("zlib", dictionary=True)
+    assert with_dictionary < plain < before
+
+    reopened = SQLiteDict(db_url)
+    assert reopened.compression == "zlib"
+    new = _entries(1)[0]
+    reopened[new.key] = new
+    assert all(reopened[e.key] == e for e in entries + [new])
+
+    reopened.compress(None)
+    assert reopened.compression is None and reopened[new.key] == new
+
+
+def test_writer_and_memory_tier_store_compressed_entries(db_url):
+    SQLiteDict(db_url).compress("zlib")
+    d = SQLiteDict(db_url, max_unwritten_entries=100, memory_entries=10)
+    entries = _entries(20)
+    for entry in entries:
+        d[entry.key] = entry
+    d.close()
+    assert all(SQLiteDict(db_url)[e.key] == e for e in entries)
+
+
+def test_only_sqlite_caches_can_be_compressed(db_url):
+    from edsl.caching.exceptions import CacheError
+
+    with pytest.raises(CacheError):
+        Cache().compress()
+    assert Cache(data=SQLiteDict(db_url)).compress()[1] > 0
+
+
+def test_missing_dictionary_is_reported():
+    dictionary = train_dictionary(["{\"a\": \"shared\"}"] * 3)
+    value = EntryCodec("zlib", dictionary).encode('{"a": "shared"}')
+    with pytest.raises(CacheValueError):
+        EntryCodec("zlib").decode(value)
+
+
+def test_zstd_round_trip(db_url):
+    pytest.importorskip("zstandard")
+    d = SQLiteDict(db_url)
+    entries = _entries(50)
+    d.update({e.key: e for e in entries})
+    d.compress("zstd", dictionary=True)
+    assert all(SQLiteDict(db_url)[e.key] == e for e in entries)
+
+
+def test_dict_opened_before_compression_reads_the_new_settings(db_url):
+    d = SQLiteDict(db_url)
+    other = SQLiteDict(db_url)
+    entries = _entries(20)
+    d.update({e.key: e for e in entries})
+    d.compress("zlib", dictionary=True)
+
+    assert other.compression is None
+    assert all(other[e.key] == e for e in entries)
+    assert other.compression == "zlib"
+
+
+def test_corrupt_zstd_entry_is_reported():
+    pytest.importorskip("zstandard")
+    value = EntryCodec("zstd").encode('{"a": "shared"}')
+    with pytest.raises(CacheValueError):
+        EntryCodec("zstd").decode(value[:-4])
@@ -0,0 +1,59 @@
+from edsl.caching import Cache, CacheEntry
+from edsl.caching.lru import LRUEntryCache
+from edsl.caching.sql_dict import SQLiteDict
+from edsl.language_models import Model
+from edsl.questions import QuestionFreeText
+from edsl.scenarios import Scenario, ScenarioList
+
+
+def test_byte_bound_evicts_least_recently_used():
+    lru = LRUEntryCache(max_bytes=250)
+    for key in "abc":
+        lru.put(key, CacheEntry.example(), 100)
+    assert "a" not in lru and len(lru) == 2 and lru.bytes == 200
+    lru.get("b")
+    lru.put("d", CacheEntry.example(), 100)
+    assert "b" in lru and "c" not in lru
+    assert lru.evictions == 2
+    lru.put("huge", CacheEntry.example(), 1000)
+    assert "huge" not in lru and lru.bytes == 200
+
+
+def test_deleted_and_updated_entries_leave_memory(tmp_path):
+    d = SQLiteDict(f"sqlite:///{tmp_path / 'cache.db'}", memory_entries=10)
+    d["foo"] = CacheEntry.example()
+    del d["foo"]
+    assert "foo" not in d and d.get("foo") is None
+
+    d["foo"] = CacheEntry.example()
+    replacement = CacheEntry.example()
+    replacement.output = "new output"
+    d.update({"foo": replacement}, overwrite=True)
+    assert d["foo"].output == "new output"
+
+
+def test_rerun_is_served_from_memory(tmp_path):
+    q = QuestionFreeText(question_name="name", question_text="Name a {{ thing }}.")
+    scenarios = ScenarioList([Scenario({"thing": t}) for t in ["color", "fruit", "car"]])
+    job = q.by(scenarios).by(Model("test", canned_response="SPAM!"))
+    cache = Cache(data=SQLiteDict(f"sqlite:///{tmp_path / 'cache.db'}", memory_entries=100))
+    options = dict(cache=cache, disable_remote_cache=True, disable_remote_inference=True)
+
+    job.run(**options)
+    before = cache.data.memory.stats()
+    job.run(**options)
+    after = cache.data.memory.stats()
+    # every lookup of the rerun was answered from memory
+    assert after["hits"] - before["hits"] >= 3
+    assert after["misses"] == before["misses"]
+
+
+def test_default_cache_caps_the_bytes_held_in_memory(monkeypatch):
+    from edsl.caching import CacheHandler
+    from edsl.config import CONFIG
+
+    cache = CacheHandler().gen_cache()
+    assert cache.data.memory.max_bytes == int(CONFIG.get("EDSL_CACHE_MEMORY_BYTES")) > 0
+
+    monkeypatch.setattr(CONFIG, "EDSL_CACHE_MEMORY_ENTRIES", "0")
+    assert CacheHandler().gen_cache().data.memory is None
@@ -0,0 +1,107 @@
+import sqlite3
+import threading
+
+import pytest
+
+from edsl.caching import Cache, CacheEntry
+from edsl.caching.sql_dict import SQLiteDict
+from edsl.caching.write_behind import WriteBehindWriter
+
+
+def _rows(path):
+    with sqlite3.connect(path) as conn:
+        return conn.execute("SELECT COUNT(*) FROM data").fetchone()[0]
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "cache.db")
+
+
+def test_entries_are_written_in_batches(db_path):
+    d = SQLiteDict(f"sqlite:///{db_path}", max_unwritten_entries=50)
+    for i in range(200):
+        d[f"key{i}"] = CacheEntry.example()
+    d.flush()
+    assert _rows(db_path) == 200
+    assert d._writer.batches_written < 200
+    d.close()
+
+
+def test_unwritten_entries_are_readable(db_path):
+    d = SQLiteDict(f"sqlite:///{db_path}", max_unwritten_entries=1000)
+    entry = CacheEntry.example()
+    d["foo"] = entry
+    assert "foo" in d
+    assert d["foo"] == entry
+    assert len(d) == 1 and list(d.keys()) == ["foo"]
+    d.close()
+
+
+def test_at_most_max_pending_entries_are_unwritten(db_path):
+    SQLiteDict(f"sqlite:///{db_path}").close()
+    writer = WriteBehindWriter(db_path, max_pending=5, flush_interval=10)
+    largest = 0
+
+    def put_many():
+        for i in range(50):
+            writer.put(f"key{i}", "value")
+
+    thread = threading.Thread(target=put_many)
+    thread.start()
+    while thread.is_alive():
+        with writer._cond:
+            largest = max(largest, len(writer._pending) + len(writer._writing))
+    thread.join()
+    writer.close()
+    assert largest <= 5
+    assert _rows(db_path) == 50
+
+
+def test_cache_context_manager_flushes(db_path):
+    with Cache(data=SQLiteDict(f"sqlite:///{db_path}", max_unwritten_entries=1000)) as c:
+        c.data["foo"] = CacheEntry.example()
+    assert _rows(db_path) == 1
+
+
+def test_in_memory_database_writes_directly():
+    d = SQLiteDict("sqlite:///:memory:", max_unwritten_entries=1000)
+    assert d._writer is None
+
+
+@pytest.mark.parametrize("failing", ["connect", "pragma"])
+def test_startup_failure_is_raised_instead_of_blocking(db_path, monkeypatch, failing):
+    import edsl.caching.write_behind as write_behind
+    from edsl.caching.exceptions import CacheError
+
+    connect = sqlite3.connect
+
+    class LockedConnection:
+        def __init__(self, path):
+            self._conn = connect(path)
+
+        def execute(self, sql, *args):
+            if sql.startswith("PRAGMA"):
+                raise sqlite3.OperationalError("database is locked")
+            return self._conn.execute(sql, *args)
+
+        def close(self):
+            self._conn.close()
+
+    def locked(path, *args, **kwargs):
+        if failing == "connect":
+            raise sqlite3.OperationalError("database is locked")
+        return LockedConnection(path)
+
+    monkeypatch.setattr(write_behind.sqlite3, "connect", locked)
+    writer = WriteBehindWriter(db_path, max_pending=2)
+    writer._thread.join(timeout=5)
+
+    with pytest.raises(CacheError, match="database is locked"):
+        writer.put("a", "1")
+    # Once the error is reported, later writes still fail rather than block
+    for key in ("b", "c", "d"):
+        with pytest.raises(CacheError):
+            writer.put(key, "1")
+    with pytest.raises(CacheError):
+        writer.flush()
@@ -0,0 +1,150 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from edsl.inference_services.exceptions import InferenceServiceError
+from edsl.inference_services.services import anthropic_service
+from edsl.inference_services.services.anthropic_service import AnthropicService
+from edsl.inference_services.services.open_ai_service import OpenAIService
+
+
+class FakeOpenAIClient:
+    """Batch and file endpoints of AsyncOpenAI, answering every request with its prompt."""
+
+    def __init__(self, status="completed", fail=()):
+        self.status = status
+        self.fail = set(fail)
+        self.files = SimpleNamespace(create=self._create_file, content=self._content)
+        self.batches = SimpleNamespace(create=self._create_batch, retrieve=self._retrieve)
+        self.uploads = {}
+
+    async def _create_file(self, file, purpose):
+        assert purpose == "batch"
+        self.uploads["input"] = [json.loads(line) for line in file[1].decode().splitlines()]
+        return SimpleNamespace(id="input")
+
+    async def _create_batch(self, input_file_id, endpoint, completion_window):
+        assert (input_file_id, endpoint) == ("input", "/v1/chat/completions")
+        self.requests = self.uploads[input_file_id]
+        output, errors = [], []
+        # Output files are not in request order
+        for request in reversed(self.requests):
+            if request["custom_id"] in self.fail:
+                errors.append({"custom_id": request["custom_id"], "response": {"status_code": 400, "body": {"error": {"message": "bad"}}}, "error": None})
+            else:
+                body = {"choices": [{"message": {"content": request["body"]["messages"][-1]["content"]}}]}
+                output.append({"custom_id": request["custom_id"], "response": {"status_code": 200, "body": body}, "error": None})
+        self.uploads["output"] = output
+        self.uploads["errors"] = errors
+        return SimpleNamespace(id="batch_1")
+
+    async def _retrieve(self, batch_id):
+        return SimpleNamespace(
+            status=self.status,
+            output_file_id="output",
+            error_file_id="errors" if self.fail else None,
+            request_counts=SimpleNamespace(total=len(self.requests)),
+        )
+
+    async def _content(self, file_id):
+        return SimpleNamespace(text="\n".join(json.dumps(row) for row in self.uploads[file_id]))
+
+
+class FakeAnthropicClient:
+    """Message Batches endpoints of AsyncAnthropic, answering every request with its prompt."""
+
+    batches = {}
+
+    def __init__(self, api_key=None):
+        self.messages = SimpleNamespace(
+            batches=SimpleNamespace(create=self._create, retrieve=self._retrieve, results=self._results)
+        )
+
+    async def _create(self, requests):
+        self.batches["batch_1"] = requests
+        return SimpleNamespace(id="batch_1")
+
+    async def _retrieve(self, batch_id):
+        requests = self.batches[batch_id]
+        return SimpleNamespace(
+            processing_status="ended",
+            request_counts=SimpleNamespace(succeeded=len(requests) - 1, errored=1, canceled=0, expired=0, processing=0),
+        )
+
+    async def _results(self, batch_id):
+        async def entries():
+            for request in reversed(self.batches[batch_id]):
+                if request["custom_id"] == "0":
+                    result = SimpleNamespace(type="errored", error={"message": "bad"})
+                else:
+                    text = request["params"]["messages"][0]["content"][0]["text"]
+                    message = SimpleNamespace(model_dump=lambda text=text: {"content": [{"text": text}]})
+                    result = SimpleNamespace(type="succeeded", message=message)
+                yield SimpleNamespace(custom_id=request["custom_id"], result=result)
+
+        return entries()
+
+
+def requests(n):
+    return [{"user_prompt": f"prompt {i}", "system_prompt": "", "files_list": None} for i in range(n)]
+
+
+def openai_model(client):
+    model = OpenAIService.create_model("gpt-4o-mini")(skip_api_key_check=True)
+    model.async_client = lambda: client
+    return model
+
+
+def test_only_services_with_a_batch_api_support_it():
+    from edsl.inference_services.services.deep_infra_service import DeepInfraService
+
+    assert OpenAIService.supports_batch
+    assert AnthropicService.supports_batch
+    assert not DeepInfraService.supports_batch
+
+
+def test_openai_batch_returns_responses_in_request_order():
+    client = FakeOpenAIClient(fail={"1"})
+    model = openai_model(client)
+
+    async def run():
+        batch_id = await OpenAIService.async_submit_batch(model, requests(3))
+        return await OpenAIService.async_poll_batch(model, batch_id)
+
+    responses = asyncio.run(run())
+    # The batch requests are the parameters of the live API calls
+    assert client.requests[0]["body"] == model._request_params(**requests(1)[0])
+    assert responses[0]["choices"][0]["message"]["content"] == "prompt 0"
+    assert isinstance(responses[1], InferenceServiceError)
+    assert responses[2]["choices"][0]["message"]["content"] == "prompt 2"
+
+
+@pytest.mark.parametrize("status, expected", [("in_progress", None), ("failed", InferenceServiceError)])
+def test_openai_batch_poll_while_running_or_failed(status, expected):
+    client = FakeOpenAIClient(status=status)
+    model = openai_model(client)
+
+    async def run():
+        batch_id = await OpenAIService.async_submit_batch(model, requests(2))
+        return await OpenAIService.async_poll_batch(model, batch_id)
+
+    if expected is None:
+        assert asyncio.run(run()) is None
+    else:
+        with pytest.raises(expected):
+            asyncio.run(run())
+
+
+def test_anthropic_batch_returns_responses_in_request_order(monkeypatch):
+    monkeypatch.setattr(anthropic_service, "AsyncAnthropic", FakeAnthropicClient)
+    model = AnthropicService.create_model("claude-3-5-sonnet-20240620")(skip_api_key_check=True)
+
+    async def run():
+        batch_id = await AnthropicService.async_submit_batch(model, requests(3))
+        return await AnthropicService.async_poll_batch(model, batch_id)
+
+    responses = asyncio.run(run())
+    assert isinstance(responses[0], InferenceServiceError)
+    assert [r["content"][0]["text"] for r in responses[1:]] == ["prompt 1", "prompt 2"]
@@ -61,6 +61,33 @@ class TestQuestionTaskCreator(unittest.IsolatedAsyncioTestCase):
         asyncio.run(self.task_creator._run_focal_task())
         self.assertEqual(self.task_creator.task_status, TaskStatus.SUCCESS)
 
+    async def test_cached_answer_skips_the_buckets(self):
+        cached_answer = answer._replace(cache_used=True)
+        self.task_creator.answer_question_func = AsyncMock(return_value=cached_answer)
+        self.task_creator.cache_probe = AsyncMock(return_value=True)
+
+        results = await self.task_creator._run_focal_task()
+
+        self.assertTrue(results.cache_used and self.task_creator.from_cache)
+        self.task_creator.cache_probe.assert_awaited_once_with(self.question)
+        for bucket in (self.model_buckets.tokens_bucket, self.model_buckets.requests_bucket):
+            bucket.get_tokens.assert_not_awaited()
+            bucket.turbo_mode_on.assert_not_called()
+
+    async def test_capacity_is_returned_when_the_probe_misses_a_cached_answer(self):
+        self.model_buckets.requests_bucket.add_tokens = Mock()
+        self.task_creator.answer_question_func = AsyncMock(
+            return_value=answer._replace(cache_used=True)
+        )
+        self.task_creator.cache_probe = AsyncMock(return_value=False)
+
+        await self.task_creator._run_focal_task()
+
+        self.model_buckets.tokens_bucket.get_tokens.assert_awaited_once()
+        self.model_buckets.tokens_bucket.add_tokens.assert_called_once_with(1)
+        self.model_buckets.requests_bucket.add_tokens.assert_called_once_with(1)
+        self.model_buckets.tokens_bucket.turbo_mode_on.assert_not_called()
+
     async def test_dependency_failure_handling(self):
         # Set up a failing task
         async def fail_task():
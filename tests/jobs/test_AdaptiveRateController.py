@@ -0,0 +1,121 @@
+import pytest
+
+from edsl.buckets import AdaptiveRateController, BucketCollection
+from edsl.caching import Cache
+from edsl.language_models import Model
+from edsl.questions import QuestionFreeText
+from edsl.scenarios import Scenario, ScenarioList
+
+
+class RateLimitError(Exception):
+    status_code = 429
+
+
+def _job():
+    q = QuestionFreeText(question_name="color", question_text="Favorite {{ thing }}?")
+    scenarios = ScenarioList([Scenario({"thing": t}) for t in ["color", "fruit"]])
+    return q.by(scenarios).by(Model("test", canned_response="SPAM!"))
+
+
+@pytest.fixture
+def model():
+    return Model("test", rpm=60, tpm=6000)
+
+
+def test_decrease_and_recover(model):
+    bc = BucketCollection.from_models([model])
+    controller = AdaptiveRateController(bc, max_concurrent=8, cooldown=0)
+    requests_bucket = bc[model].requests_bucket
+
+    controller.record_rate_limited(model)
+    controller.record_timeout(model)
+    assert controller.concurrency == 2
+    assert controller.rate_factor(model) == 0.25
+    assert requests_bucket.refill_rate == 0.25
+
+    for _ in range(100):
+        controller.record_success(model, latency=1.0)
+    # configured limits are ceilings
+    assert controller.concurrency == 8
+    assert controller.rate_factor(model) == 1.0
+    assert requests_bucket.refill_rate == 1.0
+
+
+def test_increase_is_one_step_per_window(model):
+    controller = AdaptiveRateController(
+        BucketCollection.from_models([model]), max_concurrent=64, cooldown=0
+    )
+    controller.record_rate_limited(model)
+    assert controller.concurrency == 32
+    # A full window of successes, as one round trip with 32 calls in flight
+    for _ in range(32):
+        controller.record_success(model, latency=1.0)
+    assert controller.concurrency == 33
+    assert controller.rate_factor(model) == pytest.approx(0.55, abs=1e-3)
+
+
+def test_cooldown_counts_a_burst_once(model):
+    controller = AdaptiveRateController(
+        BucketCollection.from_models([model]), max_concurrent=8, cooldown=60
+    )
+    for _ in range(5):
+        controller.record_rate_limited(model)
+    assert controller.concurrency == 4
+    assert controller.rate_factor(model) == 0.5
+
+
+def test_latency_inflation_holds_increases(model):
+    controller = AdaptiveRateController(
+        BucketCollection.from_models([model]), max_concurrent=8, cooldown=0
+    )
+    controller.record_rate_limited(model)
+    controller.record_success(model, latency=1.0)
+    factor = controller.rate_factor(model)
+    for _ in range(10):
+        controller.record_success(model, latency=10.0)
+    assert controller.rate_factor(model) == factor
+
+
+def test_turbo_mode_is_respected(model):
+    bc = BucketCollection.from_models([model])
+    controller = AdaptiveRateController(bc, max_concurrent=8, cooldown=0)
+    bucket = bc[model].requests_bucket
+    bucket.turbo_mode_on()
+    controller.record_rate_limited(model)
+    assert bucket.refill_rate == float("inf")
+    bucket.turbo_mode_off()
+    assert bucket.refill_rate == 0.5
+
+
+def test_rate_limit_detection():
+    assert AdaptiveRateController.is_rate_limit_error(RateLimitError())
+    assert not AdaptiveRateController.is_rate_limit_error(KeyError("answer"))
+    for message in ["Error code: 429 - {'error': ...}", "HTTP status 429", "429 Too Many Requests"]:
+        assert AdaptiveRateController.is_rate_limit_error(Exception(message))
+    for message in ["Expected 429 tokens", "request id req_4291", "max_tokens=14290"]:
+        assert not AdaptiveRateController.is_rate_limit_error(Exception(message))
+
+
+def test_model_calls_are_reported():
+    controller = AdaptiveRateController(max_concurrent=10)
+    _job().run(
+        cache=Cache(),
+        disable_remote_cache=True,
+        disable_remote_inference=True,
+        rate_controller=controller,
+    )
+    assert controller._states
+    assert controller.concurrency == 10
+
+
+def test_adaptive_concurrency_creates_controller():
+    job = _job()
+    results = job.run(
+        cache=Cache(),
+        disable_remote_cache=True,
+        disable_remote_inference=True,
+        adaptive_concurrency=True,
+        scheduler="sliding_window",
+    )
+    assert len(results) == 2
+    assert isinstance(job.run_config.environment.rate_controller, AdaptiveRateController)
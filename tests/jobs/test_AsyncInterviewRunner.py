@@ -0,0 +1,208 @@
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+
+from edsl.caching import Cache
+from edsl.jobs import Jobs, JobsValueError
+from edsl.jobs.async_interview_runner import AsyncInterviewRunner
+from edsl.language_models import Model
+
+
+def _runner(num_interviews, scheduler, max_concurrent):
+    jobs = MagicMock()
+    jobs.generate_interviews.return_value = [MagicMock() for _ in range(num_interviews)]
+    run_config = MagicMock()
+    run_config.parameters.n = 1
+    run_config.parameters.scheduler = scheduler
+    run_config.parameters.stop_on_exception = False
+    run_config.environment.rate_controller = None
+    run_config.environment.model_call_batcher = None
+    run_config.environment.cancel_event = None
+    runner = AsyncInterviewRunner(jobs, run_config)
+    runner.MAX_CONCURRENT = max_concurrent
+    return runner
+
+
+def test_sliding_window_refills_slots():
+    """A slow interview must not hold back the rest of the window."""
+    runner = _runner(5, "sliding_window", max_concurrent=2)
+    in_flight = []
+    peak = []
+
+    async def fake_run(interview, idx):
+        in_flight.append(idx)
+        peak.append(len(in_flight))
+        await asyncio.sleep(0.2 if idx == 0 else 0.01)
+        in_flight.remove(idx)
+        return ("result", interview, idx)
+
+    runner._run_single_interview = fake_run
+
+    async def collect():
+        return [idx async for _, _, idx in runner.run()]
+
+    order = asyncio.run(collect())
+    assert sorted(order) == [0, 1, 2, 3, 4]
+    # interview 0 is slow, so every other interview finishes before it
+    assert order[-1] == 0
+    assert max(peak) == 2
+
+
+def test_unknown_scheduler():
+    runner = _runner(1, "bogus", max_concurrent=2)
+
+    async def collect():
+        return [r async for r in runner.run()]
+
+    with pytest.raises(JobsValueError):
+        asyncio.run(collect())
+
+
+@pytest.mark.parametrize("scheduler", ["sliding_window", "per_model"])
+def test_scheduler_results_match_chunked(scheduler):
+    job = Jobs.example().by(Model("test", canned_response="SPAM!"))
+    chunked = job.run(cache=Cache(), disable_remote_inference=True, n=2)
+    other = job.run(
+        cache=Cache(), disable_remote_inference=True, n=2, scheduler=scheduler
+    )
+    assert len(other) == len(chunked) == 8
+    assert [r.order for r in other] == [r.order for r in chunked]
+    assert other.select("answer.*").to_list() == chunked.select("answer.*").to_list()
+
+
+def test_per_model_scheduler_keeps_fast_model_busy():
+    """A slow, rate-limited model must not take over the window."""
+    from edsl.buckets import ModelBuckets, TokenBucket
+
+    slow_model, fast_model = MagicMock(name="slow"), MagicMock(name="fast")
+    slow_buckets = ModelBuckets(
+        TokenBucket(bucket_name="slow", bucket_type="requests", capacity=0.1, refill_rate=0.1),
+        TokenBucket(bucket_name="slow", bucket_type="tokens", capacity=1e6, refill_rate=1e6),
+    )
+    fast_buckets = ModelBuckets.infinity_bucket("fast")
+
+    interviews = []
+    for i in range(20):
+        interview = MagicMock()
+        interview.model = slow_model if i % 2 == 0 else fast_model
+        del interview.agent.answer_question_directly
+        interviews.append(interview)
+
+    runner = _runner(0, "per_model", max_concurrent=6)
+    runner.jobs.generate_interviews.return_value = interviews
+    runner.run_config.environment.bucket_collection.get.side_effect = (
+        lambda model: slow_buckets if model is slow_model else fast_buckets
+    )
+    assert runner._admission_cap(slow_buckets) == 3
+
+    slow_in_flight = []
+    peak_slow = []
+
+    async def fake_run(interview, idx):
+        is_slow = interview.model is slow_model
+        if is_slow:
+            slow_in_flight.append(idx)
+            peak_slow.append(len(slow_in_flight))
+        await asyncio.sleep(0.05 if is_slow else 0.001)
+        if is_slow:
+            slow_in_flight.remove(idx)
+        return ("result", interview, idx)
+
+    runner._run_single_interview = fake_run
+
+    async def collect():
+        return [idx async for _, _, idx in runner.run()]
+
+    order = asyncio.run(collect())
+    assert sorted(order) == list(range(20))
+    assert max(peak_slow) <= 3
+    # every fast interview finishes before the slow queue drains
+    fast_positions = [order.index(i) for i in range(1, 20, 2)]
+    assert max(fast_positions) < order.index(18)
+
+
+@pytest.mark.parametrize("scheduler", ["chunked", "sliding_window", "per_model"])
+def test_batch_limit_only_applies_to_batched_interviews(scheduler):
+    """Only interviews of models with a batch API are admitted past MAX_CONCURRENT."""
+    batch_model, live_model = MagicMock(name="batch"), MagicMock(name="live")
+    interviews = []
+    for i in range(30):
+        interview = MagicMock()
+        interview.model = batch_model if i % 3 else live_model
+        del interview.agent.answer_question_directly
+        interviews.append(interview)
+
+    runner = _runner(0, scheduler, max_concurrent=2)
+    runner.jobs.generate_interviews.return_value = interviews
+    runner.run_config.environment.bucket_collection = None
+    batcher = runner.run_config.environment.model_call_batcher = MagicMock()
+    batcher.max_batch_size = 100
+    batcher.supports.side_effect = lambda model: model is batch_model
+
+    in_flight = {batch_model: 0, live_model: 0}
+    peak = {batch_model: 0, live_model: 0}
+
+    async def fake_run(interview, idx):
+        in_flight[interview.model] += 1
+        peak[interview.model] = max(peak[interview.model], in_flight[interview.model])
+        await asyncio.sleep(0.01)
+        in_flight[interview.model] -= 1
+        return ("result", interview, idx)
+
+    runner._run_single_interview = fake_run
+
+    async def collect():
+        return [idx async for _, _, idx in runner.run()]
+
+    assert sorted(asyncio.run(collect())) == list(range(30))
+    assert peak[live_model] <= 2
+    assert peak[batch_model] > 2
+
+
+
+def test_per_model_scheduler_reads_past_blocked_models():
+    """Interviews queued for blocked models must not keep others from being read."""
+    from edsl.buckets import ModelBuckets, TokenBucket
+
+    def slow_buckets(name):
+        return ModelBuckets(
+            TokenBucket(bucket_name=name, bucket_type="requests", capacity=0.1, refill_rate=0.1),
+            TokenBucket(bucket_name=name, bucket_type="tokens", capacity=1e6, refill_rate=1e6),
+        )
+
+    models = {name: MagicMock(name=name) for name in ["a", "b", "fast"]}
+    buckets = {
+        models["a"]: slow_buckets("a"),
+        models["b"]: slow_buckets("b"),
+        models["fast"]: ModelBuckets.infinity_bucket("fast"),
+    }
+    # Both slow models come first, with more interviews than they may run at once
+    interviews = []
+    for name, count in [("a", 8), ("b", 8), ("fast", 10)]:
+        for _ in range(count):
+            interview = MagicMock()
+            interview.model = models[name]
+            del interview.agent.answer_question_directly
+            interviews.append(interview)
+
+    runner = _runner(0, "per_model", max_concurrent=8)
+    runner.jobs.generate_interviews.return_value = interviews
+    runner.run_config.environment.bucket_collection.get.side_effect = buckets.get
+    assert runner._admission_cap(buckets[models["a"]]) == 3
+    started = []
+
+    async def fake_run(interview, idx):
+        started.append(idx)
+        await asyncio.sleep(0.001 if interview.model is models["fast"] else 0.1)
+        return ("result", interview, idx)
+
+    runner._run_single_interview = fake_run
+
+    async def collect():
+        return [idx async for _, _, idx in runner.run()]
+
+    order = asyncio.run(collect())
+    assert sorted(order) == list(range(26))
+    # every fast interview starts while the first slow interviews are in flight
+    assert max(started.index(i) for i in range(16, 26)) < started.index(3)
@@ -0,0 +1,78 @@
+from edsl.caching import Cache
+from edsl.language_models import Model
+from edsl.questions import QuestionFreeText, QuestionMultipleChoice
+from edsl.scenarios import Scenario, ScenarioList
+from edsl.surveys import Survey
+
+
+def _survey():
+    fixed = QuestionFreeText(question_name="fixed", question_text="Name a {{ thing }}.")
+    shuffled = QuestionMultipleChoice(
+        question_name="shuffled",
+        question_text="Pick one.",
+        question_options=["a", "b", "c"],
+    )
+    piped = QuestionMultipleChoice(
+        question_name="piped",
+        question_text="Pick one.",
+        question_options="{{ scenario.options }}",
+    )
+    return Survey([fixed, shuffled, piped], questions_to_randomize=["shuffled"])
+
+
+def _jobs():
+    scenarios = ScenarioList(
+        [Scenario({"thing": t, "options": [t, "other"]}) for t in ["color", "fruit"]]
+    )
+    return _survey().by(scenarios).by(Model("test", canned_response="other"))
+
+
+def test_interviews_share_unchanged_questions():
+    jobs = _jobs()
+    survey = jobs.survey
+    first, second = jobs.interviews()
+
+    assert first.survey.questions[0] is survey.questions[0]
+    assert second.survey.questions[0] is survey.questions[0]
+    # randomized questions and questions with piped options get their own copy
+    for name in ["shuffled", "piped"]:
+        assert first.survey.get(name) is not survey.get(name)
+        assert first.survey.get(name) is not second.survey.get(name)
+    assert first.survey.rule_collection is survey.rule_collection
+
+
+def test_initial_hash_uses_precomputed_hashes():
+    first, second = _jobs().interviews()
+    assert first.initial_hash != second.initial_hash
+    assert first.component_hashes["survey"] == second.component_hashes["survey"]
+    assert first.duplicate(1, None).initial_hash != first.initial_hash
+
+
+def test_initial_hash_is_built_from_the_component_hashes():
+    from edsl.utilities.utilities import dict_hash
+
+    jobs = _jobs()
+    interview = jobs.interviews()[0]
+    # Result.interview_hash is this value, not hash(interview)
+    assert interview.initial_hash == dict_hash(
+        {
+            "agent": hash(interview.agent),
+            "survey": hash(jobs.survey),
+            "scenario": hash(interview.scenario),
+            "model": hash(interview.model),
+            "iteration": 0,
+            "indices": {"agent": 0, "model": 0, "scenario": 0},
+        }
+    )
+
+
+def test_piped_options_do_not_leak_between_interviews():
+    jobs = _jobs()
+    results = jobs.run(
+        cache=Cache(), disable_remote_cache=True, disable_remote_inference=True
+    )
+    assert results.select("question_options.piped").to_list() == [
+        ["color", "other"],
+        ["fruit", "other"],
+    ]
+    assert jobs.survey.get("piped").question_options == "{{ scenario.options }}"
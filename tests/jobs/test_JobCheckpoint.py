@@ -0,0 +1,73 @@
+import json
+
+import pytest
+
+from edsl.caching import Cache
+from edsl.jobs import JobsValueError
+from edsl.jobs.async_interview_runner import AsyncInterviewRunner
+from edsl.language_models import Model
+from edsl.questions import QuestionFreeText
+from edsl.scenarios import Scenario, ScenarioList
+
+
+def _job(canned_response="SPAM!"):
+    q = QuestionFreeText(question_name="name", question_text="Name a {{ thing }}.")
+    scenarios = ScenarioList(
+        [Scenario({"thing": t}) for t in ["color", "fruit", "car", "city"]]
+    )
+    return q.by(scenarios).by(Model("test", canned_response=canned_response))
+
+
+def _run(job, path, **kwargs):
+    return job.run(
+        cache=Cache(),
+        n=2,
+        disable_remote_cache=True,
+        disable_remote_inference=True,
+        checkpoint=str(path),
+        **kwargs,
+    )
+
+
+@pytest.fixture
+def run_counter(monkeypatch):
+    ran = []
+    original = AsyncInterviewRunner._run_single_interview
+
+    async def counting(self, interview, idx):
+        ran.append(idx)
+        return await original(self, interview, idx)
+
+    monkeypatch.setattr(AsyncInterviewRunner, "_run_single_interview", counting)
+    return ran
+
+
+def test_resume_skips_recorded_interviews(tmp_path, run_counter):
+    path = tmp_path / "job.ckpt"
+    full = _run(_job(), path)
+    assert sorted(run_counter) == list(range(8))
+
+    # Simulate a crash: keep the header and three entries, then a torn write
+    lines = path.read_text().splitlines(keepends=True)
+    path.write_text("".join(lines[:4]) + lines[4][:20])
+    recorded = {json.loads(line)["idx"] for line in lines[1:4]}
+
+    run_counter.clear()
+    resumed = _run(_job(), path)
+    assert sorted(run_counter) == sorted(set(range(8)) - recorded)
+    assert [r.order for r in resumed] == [r.order for r in full]
+    assert resumed.select("scenario.thing", "iteration").to_list() == full.select(
+        "scenario.thing", "iteration"
+    ).to_list()
+
+    # Everything is recorded now, so a third run does no work
+    run_counter.clear()
+    assert len(_run(_job(), path)) == 8
+    assert run_counter == []
+
+
+def test_checkpoint_of_other_job_is_rejected(tmp_path):
+    path = tmp_path / "job.ckpt"
+    _run(_job(), path)
+    with pytest.raises(JobsValueError):
+        _run(_job(canned_response="other"), path)
@@ -0,0 +1,68 @@
+import time
+
+import pytest
+
+from edsl.buckets import BucketCollection
+from edsl.caching import Cache
+from edsl.jobs import JobHandle
+from edsl.language_models import Model
+from edsl.questions import QuestionFreeText
+from edsl.scenarios import Scenario, ScenarioList
+
+
+def _slow_job():
+    """A job whose model is limited to one request per second."""
+    q = QuestionFreeText(question_name="name", question_text="Name a {{ thing }}.")
+    scenarios = ScenarioList([Scenario({"thing": t}) for t in range(8)])
+    model = Model("test", canned_response="SPAM!")
+    model.rpm = 60
+    bucket_collection = BucketCollection()
+    bucket_collection.add_model(model)
+    return q.by(scenarios).by(model), bucket_collection
+
+
+def _options(bucket_collection, cache, scheduler="sliding_window"):
+    return dict(
+        cache=cache,
+        bucket_collection=bucket_collection,
+        disable_remote_cache=True,
+        disable_remote_inference=True,
+        scheduler=scheduler,
+    )
+
+
+def test_cancel_returns_completed_interviews():
+    job, bucket_collection = _slow_job()
+    cache = Cache()
+    handle = job.start(**_options(bucket_collection, cache))
+    assert isinstance(handle, JobHandle)
+    time.sleep(1.5)
+
+    start = time.monotonic()
+    partial = handle.cancel(timeout=10)
+    assert time.monotonic() - start < 2
+    assert handle.done() and handle.cancelled
+    assert 1 <= len(partial) < 8
+    assert partial.select("answer.name").to_list() == ["SPAM!"] * len(partial)
+    # every call that was made is in the cache
+    assert len(cache) >= len(partial)
+
+
+@pytest.mark.parametrize("scheduler", ["chunked", "sliding_window", "per_model"])
+def test_deadline_stops_the_job(scheduler):
+    job, bucket_collection = _slow_job()
+    start = time.monotonic()
+    results = job.run(
+        deadline=1.5, **_options(bucket_collection, Cache(), scheduler=scheduler)
+    )
+    assert time.monotonic() - start < 4
+    assert 1 <= len(results) < 8
+
+
+def test_a_later_run_is_not_cancelled():
+    job, bucket_collection = _slow_job()
+    job.run(deadline=0.5, **_options(bucket_collection, Cache()))
+
+    unlimited = BucketCollection(infinity_buckets=True)
+    results = job.start(**_options(unlimited, Cache())).result(timeout=10)
+    assert len(results) == 8
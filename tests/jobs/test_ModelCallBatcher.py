@@ -0,0 +1,60 @@
+from edsl.caching import Cache
+from edsl.jobs.model_call_batcher import ModelCallBatcher
+from edsl.language_models import Model
+from edsl.questions import QuestionFreeText
+from edsl.scenarios import Scenario, ScenarioList
+from edsl.surveys import Survey
+
+
+def _job():
+    q1 = QuestionFreeText(question_name="q1", question_text="Name a {{ thing }}.")
+    q2 = QuestionFreeText(
+        question_name="q2", question_text="Why did you say {{ q1.answer }}?"
+    )
+    q3 = QuestionFreeText(question_name="q3", question_text="Describe a {{ thing }}.")
+    scenarios = ScenarioList([Scenario({"thing": t}) for t in ["color", "fruit", "car"]])
+    return (
+        Survey([q1, q2, q3])
+        .by(scenarios)
+        .by(Model("test", canned_response="SPAM!"))
+    )
+
+
+def _run(job, cache, batcher=None):
+    return job.run(
+        cache=cache,
+        disable_remote_cache=True,
+        disable_remote_inference=True,
+        batch_mode=True,
+        model_call_batcher=batcher,
+    )
+
+
+def test_batch_mode_runs_in_dependency_waves():
+    cache = Cache()
+    batcher = ModelCallBatcher()
+    results = _run(_job(), cache, batcher)
+
+    assert len(results) == 3
+    assert results.select("answer.*").to_list() == [("SPAM!",) * 3] * 3
+    # q1 and q3 go out together; q2 has to wait for q1's answer
+    assert batcher.waves == 2
+    assert batcher.batches_submitted == 2
+    # the q2 prompt is the same in every scenario
+    assert len(cache) == 7
+
+
+def test_batch_mode_matches_regular_run():
+    batched = _run(_job(), Cache())
+    regular = _job().run(
+        cache=Cache(), disable_remote_cache=True, disable_remote_inference=True
+    )
+    assert batched.select("answer.*").to_list() == regular.select("answer.*").to_list()
+
+
+def test_cached_calls_are_not_batched():
+    cache = Cache()
+    _run(_job(), cache)
+    batcher = ModelCallBatcher()
+    _run(_job(), cache, batcher)
+    assert batcher.waves == 0
@@ -0,0 +1,77 @@
+import pytest
+
+from edsl.agents import Agent
+from edsl.buckets import BucketCollection
+from edsl.caching import Cache
+from edsl.jobs import Jobs, JobsValueError
+from edsl.jobs.sharded_runner import ShardedJobsRunner, _apply_bucket_limits, _bucket_limits
+from edsl.language_models import Model
+from edsl.questions import QuestionFreeText
+from edsl.scenarios import Scenario, ScenarioList
+
+
+@pytest.fixture
+def job():
+    q = QuestionFreeText(question_name="color", question_text="Favorite {{ thing }}?")
+    scenarios = ScenarioList([Scenario({"thing": t}) for t in ["color", "food", "song"]])
+    return q.by(scenarios).by(Model("test", canned_response="blue"))
+
+
+def test_sharded_run_matches_single_process(job):
+    single = job.run(cache=Cache(), disable_remote_inference=True, n=2)
+
+    cache = Cache()
+    sharded = job.run(cache=cache, disable_remote_inference=True, n=2, workers=2)
+
+    assert len(sharded) == len(single) == 6
+    assert [r.order for r in sharded] == list(range(6))
+    assert (
+        sharded.select("scenario.thing", "answer.color").to_list()
+        == single.select("scenario.thing", "answer.color").to_list()
+    )
+    # entries created in the workers end up in the parent's cache
+    assert len(cache) == 6
+    assert set(sharded._cache_keys()) == set(cache.keys())
+
+
+def test_bucket_limits_are_split_across_shards():
+    model = Model("test", rpm=600, tpm=6000)
+    bc = BucketCollection.from_models([model])
+    limits = _bucket_limits(bc, 4)
+    worker_bc = BucketCollection.from_models([model])
+    _apply_bucket_limits(worker_bc, limits)
+    buckets = worker_bc[model]
+    assert buckets.requests_bucket.refill_rate == pytest.approx(600 / 60 / 4)
+    assert buckets.tokens_bucket.capacity == pytest.approx(6000 / 60 / 4)
+
+
+def test_direct_answering_agents_are_rejected():
+    agent = Agent(traits={})
+    agent.add_direct_question_answering_method(lambda self, question, scenario: "yes")
+    job = QuestionFreeText.example().by(agent)
+    job.replace_missing_objects()
+    with pytest.raises(JobsValueError):
+        ShardedJobsRunner(job, num_shards=2).run()
+
+
+def test_workers_see_entries_the_parent_has_not_written_yet(tmp_path, job):
+    from edsl.caching import CacheEntry
+    from edsl.caching.sql_dict import SQLiteDict
+
+    runner = ShardedJobsRunner(job, num_shards=2)
+    held_back, in_writer = CacheEntry.example(), CacheEntry.example(randomize=True)
+
+    db = SQLiteDict(str(tmp_path / "cache.db"), max_unwritten_entries=100)
+    cache = Cache(data=db, immediate_write=False)
+    db["in_writer"] = in_writer
+    cache.new_entries_to_write_later["held_back"] = held_back
+    payload = runner._cache_payload(cache)
+    # A worker opens the database file on its own
+    worker_view = SQLiteDict(payload["cache_db_path"])
+    assert set(worker_view.keys()) == {"in_writer", "held_back"}
+    worker_view.close()
+    db.close()
+
+    cache = Cache(immediate_write=False)
+    cache.new_entries_to_write_later["held_back"] = held_back
+    assert set(runner._cache_payload(cache)["cache_data"]) == {"held_back"}
@@ -0,0 +1,87 @@
+import asyncio
+import multiprocessing
+import time
+
+import pytest
+
+from edsl.buckets import BucketCollection, SharedTokenBucket, TokenBucket
+
+
+def _bucket(path, capacity=10, refill_rate=1):
+    return TokenBucket(
+        bucket_name="test",
+        bucket_type="requests",
+        capacity=capacity,
+        refill_rate=refill_rate,
+        shared_path=str(path),
+    )
+
+
+def _take_tokens(path, amount, times):
+    bucket = _bucket(path, capacity=5, refill_rate=20)
+    for _ in range(times):
+        asyncio.run(bucket.get_tokens(amount))
+
+
+def test_shared_path_selects_shared_bucket(tmp_path):
+    bucket = _bucket(tmp_path / "buckets.db")
+    assert isinstance(bucket, SharedTokenBucket)
+    assert bucket.tokens == 10
+    assert not isinstance(
+        TokenBucket(bucket_name="test", bucket_type="requests", capacity=1, refill_rate=1),
+        SharedTokenBucket,
+    )
+
+
+def test_buckets_with_the_same_path_share_tokens(tmp_path):
+    first, second = _bucket(tmp_path / "buckets.db"), _bucket(tmp_path / "buckets.db")
+    asyncio.run(first.get_tokens(8))
+    second.refill()
+    assert second.tokens < 3
+    second.add_tokens(5)
+    first.refill()
+    assert 7 <= first.tokens < 8
+    # Other buckets in the file are independent
+    other = TokenBucket(
+        bucket_name="test",
+        bucket_type="tokens",
+        capacity=10,
+        refill_rate=1,
+        shared_path=str(tmp_path / "buckets.db"),
+    )
+    assert other.tokens == 10
+
+
+def test_refill_rate_changes_are_shared(tmp_path):
+    first, second = _bucket(tmp_path / "buckets.db"), _bucket(tmp_path / "buckets.db")
+    first.set_refill_rate(4)
+    second.refill()
+    assert second.refill_rate == 4
+
+
+def test_processes_share_the_rate_limit(tmp_path):
+    path = tmp_path / "buckets.db"
+    _bucket(path, capacity=5, refill_rate=20)
+    context = multiprocessing.get_context("fork")
+    workers = [
+        context.Process(target=_take_tokens, args=(path, 1, 15)) for _ in range(2)
+    ]
+    start = time.monotonic()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(timeout=30)
+    elapsed = time.monotonic() - start
+    assert all(worker.exitcode == 0 for worker in workers)
+    # 30 tokens from a bucket holding 5 and refilling 20 a second take at least 1.25 s
+    assert elapsed >= 1.2
+
+
+def test_bucket_collection_uses_shared_path(tmp_path, monkeypatch):
+    from edsl.language_models import Model
+
+    monkeypatch.setenv("EDSL_SHARED_TOKEN_BUCKET_PATH", str(tmp_path / "buckets.db"))
+    collection = BucketCollection.from_models([Model("test", rpm=60, tpm=600)])
+    buckets = collection.services_to_buckets["test"]
+    assert isinstance(buckets.requests_bucket, SharedTokenBucket)
+    assert isinstance(buckets.tokens_bucket, SharedTokenBucket)
@@ -1,3 +1,4 @@
+import asyncio
 import pytest
 import time
 from edsl.buckets import TokenBucket
@@ -63,3 +64,82 @@ async def test_no_overflow():
     bucket.last_refill = time.monotonic() - 1000
     bucket.refill()
     assert bucket.tokens == 5, "Token count should not exceed capacity"
+
+
+@pytest.mark.asyncio
+async def test_waiters_are_served_in_arrival_order():
+    bucket = TokenBucket(
+        bucket_name="test", bucket_type="requests", capacity=10, refill_rate=100
+    )
+    bucket.tokens = 0
+    order = []
+
+    async def take(name, amount):
+        await bucket.get_tokens(amount)
+        order.append(name)
+
+    # The large request is not overtaken by the small ones arriving after it
+    await asyncio.gather(take("large", 8), *(take(i, 1) for i in range(5)))
+    assert order == ["large", 0, 1, 2, 3, 4]
+
+
+@pytest.mark.asyncio
+async def test_only_the_first_waiter_polls_the_bucket():
+    bucket = TokenBucket(
+        bucket_name="test", bucket_type="requests", capacity=1, refill_rate=200
+    )
+    bucket.tokens = 0
+    checks = 0
+    take_or_wait = bucket._take_or_wait
+
+    def counting(waiter):
+        nonlocal checks
+        checks += 1
+        return take_or_wait(waiter)
+
+    bucket._take_or_wait = counting
+    await asyncio.gather(*(bucket.get_tokens(1) for _ in range(50)))
+    # Each waiter checks the bucket a bounded number of times, not once per
+    # sleep while the others are served
+    assert checks <= 50 * 4
+    assert not bucket._waiters
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_block_the_queue():
+    bucket = TokenBucket(
+        bucket_name="test", bucket_type="requests", capacity=1, refill_rate=20
+    )
+    bucket.tokens = 0
+    first = asyncio.create_task(bucket.get_tokens(1))
+    second = asyncio.create_task(bucket.get_tokens(1))
+    await asyncio.sleep(0.01)
+    first.cancel()
+    await asyncio.wait_for(second, timeout=1)
+    assert not bucket._waiters
+
+
+@pytest.mark.asyncio
+async def test_add_tokens_wakes_the_first_waiter():
+    bucket = TokenBucket(
+        bucket_name="test", bucket_type="requests", capacity=5, refill_rate=0.01
+    )
+    bucket.tokens = 0
+    task = asyncio.create_task(bucket.get_tokens(2))
+    await asyncio.sleep(0.01)
+    bucket.add_tokens(5)
+    await asyncio.wait_for(task, timeout=1)
+
+
+def test_log_memory_is_bounded():
+    bucket = TokenBucket(
+        bucket_name="test", bucket_type="requests", capacity=5, refill_rate=1
+    )
+    # A long run: many samples a second, for longer than the log keeps
+    for i in range(100_000):
+        bucket.log.append((i * 0.05, i % 7))
+    log = bucket.get_log()
+    assert len(log) <= bucket.log.max_slots * 4
+    assert log[-1] == (99_999 * 0.05, 99_999 % 7)
+    # Each second keeps its lowest and highest levels
+    assert {tokens for _, tokens in log[-4:]} >= {0, 6}
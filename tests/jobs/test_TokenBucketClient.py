@@ -0,0 +1,163 @@
+import asyncio
+import socket
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("fastapi")
+uvicorn = pytest.importorskip("uvicorn")
+
+from edsl.buckets import TokenBucketClient
+from edsl.buckets import token_bucket_api
+
+
+@pytest.fixture(scope="module")
+def server_url():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    config = uvicorn.Config(
+        token_bucket_api.app, host="127.0.0.1", port=port, log_level="warning"
+    )
+    server = uvicorn.Server(config)
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    deadline = time.time() + 10
+    while not server.started and time.time() < deadline:
+        time.sleep(0.01)
+    yield f"http://127.0.0.1:{port}"
+    server.should_exit = True
+    thread.join(timeout=5)
+
+
+def _client(server_url, name, **kwargs):
+    return TokenBucketClient(
+        bucket_name=name,
+        bucket_type="tokens",
+        capacity=1000,
+        refill_rate=1,
+        api_base_url=server_url,
+        **kwargs,
+    )
+
+
+def test_leased_tokens_serve_requests_without_the_server(server_url):
+    client = _client(server_url, "lease")
+
+    async def run():
+        for _ in range(100):
+            await client.get_tokens(1)
+        await client.aclose()
+
+    client.requests_sent = 0
+    asyncio.run(run())
+    # One lease of 100 tokens (10% of the capacity), then its return
+    assert client.requests_sent <= 3
+    server_bucket = token_bucket_api.buckets["lease_tokens"]
+    assert server_bucket.num_released == 100
+    assert 900 <= server_bucket.tokens < 901
+
+
+def test_without_leases_every_request_goes_to_the_server(server_url):
+    client = _client(server_url, "no-lease", lease_size=0)
+    client.requests_sent = 0
+
+    async def run():
+        for _ in range(10):
+            await client.get_tokens(1)
+        await client.aclose()
+
+    asyncio.run(run())
+    assert client.requests_sent == 10
+
+
+def test_expired_lease_is_returned(server_url):
+    client = _client(server_url, "expiry", lease_seconds=0.05)
+
+    async def run():
+        await client.get_tokens(1)
+        assert client._leased == 99
+        await asyncio.sleep(0.2)
+        assert client._leased == 0
+
+    asyncio.run(run())
+    assert token_bucket_api.buckets["expiry_tokens"].tokens_returned == 99
+
+
+def test_lease_does_not_overtake_waiting_clients(server_url):
+    client = _client(server_url, "scarce")
+    server_bucket = token_bucket_api.buckets["scarce_tokens"]
+    server_bucket.tokens = 0
+    start = time.monotonic()
+
+    async def run():
+        await client.get_tokens(1)
+        await client.aclose()
+
+    asyncio.run(run())
+    # The request waited for its token, and nothing was left to lease
+    assert time.monotonic() - start >= 0.9
+    assert client._leased == 0
+
+
+def test_close_waits_for_an_expiring_lease(server_url):
+    client = _client(server_url, "closing", lease_seconds=0.05)
+
+    async def run():
+        await client.get_tokens(1)
+        # Let the lease expire and its return start, without waiting for it
+        await asyncio.sleep(0.06)
+        assert client._lease_return is not None
+        await client.aclose()
+
+    asyncio.run(run())
+    assert token_bucket_api.buckets["closing_tokens"].tokens_returned == 99
+    assert client._lease_return is None and len(client._sessions) == 0
+
+
+def test_job_run_closes_remote_buckets(server_url, monkeypatch):
+    from edsl.buckets import BucketCollection
+    from edsl.caching import Cache
+    from edsl.language_models import Model
+    from edsl.questions import QuestionFreeText
+
+    monkeypatch.setenv("EDSL_REMOTE_TOKEN_BUCKET_URL", server_url)
+    bucket_collection = BucketCollection()
+    q = QuestionFreeText(question_name="name", question_text="Name a color.")
+    q.by(Model("test", canned_response="SPAM!")).run(
+        cache=Cache(),
+        bucket_collection=bucket_collection,
+        disable_remote_cache=True,
+        disable_remote_inference=True,
+    )
+
+    clients = [
+        bucket
+        for buckets in bucket_collection.services_to_buckets.values()
+        for bucket in (buckets.requests_bucket, buckets.tokens_bucket)
+    ]
+    assert clients and all(isinstance(c, TokenBucketClient) for c in clients)
+    assert all(len(c._sessions) == 0 and c._leased == 0 for c in clients)
+
+
+def test_sync_calls_inside_a_running_loop_keep_the_lease_and_session(server_url):
+    import nest_asyncio
+
+    nest_asyncio.apply()
+    client = _client(server_url, "sync-calls")
+
+    async def run():
+        await client.get_tokens(1)
+        session = client._session()
+        # As QuestionTaskCreator does before each get_tokens
+        assert client.wait_time(2000) > 0
+        assert client.tokens >= 99
+        assert client._leased == 99 and client._session() is session
+        requests_sent = client.requests_sent
+        await client.get_tokens(1)
+        assert client.requests_sent == requests_sent
+        await client.aclose()
+
+    asyncio.run(run())
+    assert token_bucket_api.buckets["sync-calls_tokens"].tokens_returned == 98
@@ -0,0 +1,51 @@
+import time
+
+from edsl.caching import Cache
+from edsl.language_models import Model
+from edsl.questions import QuestionFreeText
+from edsl.scenarios import Scenario, ScenarioList
+
+
+def test_cached_rerun_is_not_rate_limited():
+    q = QuestionFreeText(question_name="name", question_text="Name a {{ thing }}.")
+    scenarios = ScenarioList([Scenario({"thing": t}) for t in ["color", "fruit", "car", "city"]])
+    cache = Cache()
+    options = dict(cache=cache, disable_remote_cache=True, disable_remote_inference=True)
+
+    q.by(scenarios).by(Model("test", canned_response="SPAM!")).run(**options)
+
+    # One request every 20 seconds: any call that waited for capacity would be slow
+    slow = Model("test", canned_response="SPAM!", rpm=3)
+    start = time.monotonic()
+    results = q.by(scenarios).by(slow).run(**options)
+    assert time.monotonic() - start < 10
+    assert all(cache_used for cache_used in results.select("cache_used.*").to_list())
+
+
+def test_probe_renders_prompts_once_and_skips_skipped_questions(monkeypatch):
+    from edsl.invigilators.prompt_constructor import PromptConstructor
+    from edsl.surveys import Survey
+
+    rendered = []
+    get_prompts = PromptConstructor.get_prompts
+
+    def counting_get_prompts(self):
+        rendered.append(self.question.question_name)
+        return get_prompts(self)
+
+    monkeypatch.setattr(PromptConstructor, "get_prompts", counting_get_prompts)
+
+    q1 = QuestionFreeText(question_name="q1", question_text="Name a {{ thing }}.")
+    q2 = QuestionFreeText(question_name="q2", question_text="Why {{ thing }}?")
+    q3 = QuestionFreeText(question_name="q3", question_text="Where {{ thing }}?")
+    survey = Survey([q1, q2, q3]).add_skip_rule("q3", "{{ q1.answer }} == 'SPAM!'")
+    scenarios = ScenarioList([Scenario({"thing": t}) for t in ["color", "fruit", "car"]])
+    # A finite rate limit, so that every question probes the cache first
+    model = Model("test", canned_response="SPAM!", rpm=10_000)
+
+    survey.by(scenarios).by(model).run(
+        cache=Cache(), disable_remote_cache=True, disable_remote_inference=True
+    )
+    # One rendering per question: q1 and q2 share it between the probe, the token
+    # estimate and the call, and q3 is only rendered for its "skipped" result
+    assert sorted(rendered) == ["q1"] * 3 + ["q2"] * 3 + ["q3"] * 3
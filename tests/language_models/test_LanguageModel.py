@@ -58,6 +58,38 @@ class TestLanguageModel(unittest.TestCase):
 
         self.assertEqual(len(example_cache), 1)
 
+    def test_identical_concurrent_calls_are_coalesced(self):
+        import asyncio
+        from edsl.caching import Cache
+
+        m = LanguageModel.example(test_model=True, canned_response="Hello, world!")
+        original = m.async_execute_model_call
+        calls = []
+
+        async def slow_call(*args, **kwargs):
+            calls.append(kwargs["user_prompt"])
+            await asyncio.sleep(0.05)
+            return await original(*args, **kwargs)
+
+        m.async_execute_model_call = slow_call
+        cache = Cache()
+
+        async def ask(user_prompt):
+            return await m._async_get_intended_model_call_outcome(
+                user_prompt=user_prompt, system_prompt="You are a helpful agent", cache=cache
+            )
+
+        async def main():
+            return await asyncio.gather(*[ask("Hello world") for _ in range(3)], ask("Goodbye"))
+
+        first, *others, goodbye = asyncio.run(main())
+        self.assertEqual(calls, ["Hello world", "Goodbye"])
+        self.assertFalse(first.cache_used)
+        self.assertEqual([o.cache_used for o in others], [True, True])
+        self.assertEqual(others[0].response, first.response)
+        self.assertFalse(goodbye.cache_used)
+        self.assertEqual(cache._in_flight, {})
+
     # def test_get_response(self):
     #     from edsl.caching.cache import Cache
 
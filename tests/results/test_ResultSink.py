@@ -0,0 +1,119 @@
+import json
+import sqlite3
+
+import pytest
+
+from edsl.caching import Cache
+from edsl.language_models import Model
+from edsl.questions import QuestionFreeText
+from edsl.results import Result
+from edsl.results.exceptions import ResultsError
+from edsl.results.result_sink import ResultSink, SinkResultList
+from edsl.scenarios import Scenario, ScenarioList
+
+
+def _job():
+    q = QuestionFreeText(question_name="name", question_text="Name a {{ thing }}.")
+    scenarios = ScenarioList(
+        [Scenario({"thing": t}) for t in ["color", "fruit", "car", "city"]]
+    )
+    return q.by(scenarios).by(Model("test", canned_response="SPAM!"))
+
+
+def _run(**kwargs):
+    return _job().run(
+        cache=Cache(),
+        n=2,
+        disable_remote_cache=True,
+        disable_remote_inference=True,
+        **kwargs,
+    )
+
+
+@pytest.mark.parametrize("filename", ["results.jsonl", "results.db"])
+def test_sink_results_match_in_memory_results(tmp_path, filename):
+    path = tmp_path / filename
+    expected = _run()
+    results = _run(sink=str(path))
+
+    assert isinstance(results.data, SinkResultList)
+    assert len(results) == 8
+    assert [r.order for r in results] == list(range(8))
+    assert results.select("scenario.thing", "iteration", "answer.name").to_list() == (
+        expected.select("scenario.thing", "iteration", "answer.name").to_list()
+    )
+    assert len(results.cache) == len(expected.cache) == 8
+    # derived Results stay usable
+    assert len(results.filter("scenario.thing == 'car'")) == 2
+    assert len(results[2:5]) == 3
+
+
+def test_sink_file_holds_every_result(tmp_path):
+    jsonl = tmp_path / "results.jsonl"
+    _run(sink=str(jsonl))
+    lines = jsonl.read_text().splitlines()
+    assert sorted(json.loads(line)["order"] for line in lines) == list(range(8))
+
+    db = tmp_path / "results.db"
+    _run(sink=str(db))
+    with sqlite3.connect(db) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM results").fetchone() == (8,)
+
+
+def test_sink_is_overwritten_by_a_new_run(tmp_path):
+    path = tmp_path / "results.jsonl"
+    _run(sink=str(path))
+    _run(sink=str(path))
+    assert len(path.read_text().splitlines()) == 8
+
+
+def test_sink_result_list_mixes_stored_and_new_results(tmp_path):
+    sink = ResultSink.for_path(tmp_path / "results.jsonl")
+    for order in [2, 0, 1]:
+        r = Result.example()
+        r.order = order
+        sink.write(r)
+    sink.close()
+
+    data = sink.results_data()
+    data.append(Result.example())
+    assert len(data) == 4
+    assert [r.order for r in data[:3]] == [0, 1, 2]
+    copy = SinkResultList(data)
+    del copy[0]
+    assert len(copy) == 3 and len(data) == 4
+
+
+def test_unknown_sink_extension_is_rejected(tmp_path):
+    with pytest.raises(ResultsError):
+        ResultSink.for_path(tmp_path / "results.csv")
+
+
+def test_parquet_sink_results_match_in_memory_results(tmp_path):
+    pytest.importorskip("pyarrow")
+    expected = _run()
+    results = _run(sink=str(tmp_path / "results.parquet"))
+
+    assert isinstance(results.data, SinkResultList)
+    assert [r.order for r in results] == list(range(8))
+    assert results.select("scenario.thing", "iteration", "answer.name").to_list() == (
+        expected.select("scenario.thing", "iteration", "answer.name").to_list()
+    )
+
+
+@pytest.mark.parametrize("filename", ["results.jsonl", "results.db"])
+def test_sink_reads_through_one_handle(tmp_path, filename):
+    sink = ResultSink.for_path(tmp_path / filename)
+    for order in range(3):
+        r = Result.example()
+        r.order = order
+        sink.write(r)
+    sink.close()
+
+    opened = []
+    open_reader = sink._open_reader
+    sink._open_reader = lambda: opened.append(1) or open_reader()
+    data = sink.results_data()
+    assert [r.order for r in data] == [0, 1, 2]
+    assert [r.order for r in data] == [0, 1, 2]
+    assert len(opened) == 1